@@ -0,0 +1,33 @@
+"""
+Audio sinks for the game logic.
+
+StrandsGame reports its sound effects to an AudioSink rather than
+calling pygame directly, so that the game logic can be imported and
+run headless (e.g. on servers without audio devices) with no pygame
+initialization at all. The GUI plugs in a sounds.SoundBank instead.
+"""
+from abc import ABC, abstractmethod
+
+
+class AudioSink(ABC):
+    """
+    Interface for anything that can play the game's sound effects.
+    Sounds are named by their file name in assets/ without the
+    extension, e.g. "error_008".
+    """
+
+    @abstractmethod
+    def play(self, name: str) -> None:
+        """
+        Play the named sound effect.
+        """
+        raise NotImplementedError
+
+
+class NullAudioSink(AudioSink):
+    """
+    Audio sink that ignores every sound, for headless games.
+    """
+
+    def play(self, name: str) -> None:
+        """See AudioSink"""
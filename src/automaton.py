@@ -0,0 +1,237 @@
+"""
+Array-backed prefix automaton (a trie) over a word list.
+
+The trie is stored flat: states are numbered breadth first from the
+root, state 0, and the transitions out of each state are a sorted run
+of (letter code, target state) pairs in two typed arrays, found
+through an offsets array. Final states are marked in a bitset. A
+search walks the board one letter at a time with step, so it never
+builds prefix strings to look up, and the whole automaton for
+web2.txt takes a few MB instead of a set of every prefix.
+
+An automaton can be saved with write and memory-mapped back with
+open, so every process using the same file shares its pages and
+nothing is rebuilt (see lexicon.load_trie).
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import Iterable, Sequence
+
+# saved automaton layout, all integers little-endian:
+#   header: magic, version, then the size and mtime_ns of the word
+#           list it was built from, and the state and edge counts
+#   then offsets, labels and targets as 32-bit arrays, then finals
+TRIE_MAGIC = b"STPA"
+TRIE_VERSION = 1
+TRIE_HEADER = struct.Struct("<4sHxxQQII")
+
+
+class PrefixAutomaton:
+    """
+    Deterministic automaton accepting exactly a set of words, with
+    a state for every prefix of those words.
+    """
+
+    # transitions of state s: labels and targets at indices
+    # offsets[s] to offsets[s + 1], sorted by label; these are
+    # arrays, or memoryviews into a mapped file
+    offsets: Sequence[int]
+    labels: Sequence[int]
+    targets: Sequence[int]
+    # bit s is set if state s ends a word
+    finals: Sequence[int]
+    # the mapped file, if opened from one
+    _mm: mmap.mmap | None
+
+    def __init__(self, offsets: Sequence[int], labels: Sequence[int],
+                 targets: Sequence[int], finals: Sequence[int]):
+        self.offsets = offsets
+        self.labels = labels
+        self.targets = targets
+        self.finals = finals
+        self._mm = None
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "PrefixAutomaton":
+        """
+        Build the automaton for a word list.
+
+        Inputs:
+            words (Iterable[str]): the words, in any order
+
+        Returns (PrefixAutomaton): the automaton
+        """
+        word_lst = sorted(set(words))
+        offsets = array("I", [0])
+        labels = array("I")
+        targets = array("I")
+        finals = bytearray()
+
+        # breadth first, each state is the range of words sharing
+        # its prefix, so the children of a state are contiguous
+        queue = deque([(0, len(word_lst), 0)])
+        num_states = 1
+        state = 0
+        while queue:
+            lo, hi, depth = queue.popleft()
+            if state >> 3 >= len(finals):
+                finals.append(0)
+            # the prefix itself sorts first in its range
+            if lo < hi and len(word_lst[lo]) == depth:
+                finals[state >> 3] |= 1 << (state & 7)
+                lo += 1
+
+            while lo < hi:
+                letter = word_lst[lo][depth]
+                end = lo + 1
+                while end < hi and word_lst[end][depth] == letter:
+                    end += 1
+                labels.append(ord(letter))
+                targets.append(num_states)
+                queue.append((lo, end, depth + 1))
+                num_states += 1
+                lo = end
+
+            offsets.append(len(labels))
+            state += 1
+
+        return cls(offsets, labels, targets, finals)
+
+    def __len__(self) -> int:
+        # number of states
+        return len(self.offsets) - 1
+
+    def step(self, state: int, letter: str) -> int:
+        """
+        Follow the transition on letter out of state.
+
+        Returns (int): the next state, or -1 if there is none
+        """
+        lo = self.offsets[state]
+        hi = self.offsets[state + 1]
+        code = ord(letter)
+        i = bisect_left(self.labels, code, lo, hi)
+        if i < hi and self.labels[i] == code:
+            return self.targets[i]
+
+        return -1
+
+    def walk(self, text: str, state: int = 0) -> int:
+        """
+        Follow the transitions on every letter of text.
+
+        Returns (int): the state reached, or -1 if text falls off
+        """
+        for letter in text:
+            state = self.step(state, letter)
+            if state < 0:
+                break
+
+        return state
+
+    def is_final(self, state: int) -> bool:
+        """
+        Decide whether a state ends a word.
+        """
+        return bool(self.finals[state >> 3] >> (state & 7) & 1)
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str):
+            return False
+        state = self.walk(word)
+
+        return state >= 0 and self.is_final(state)
+
+    def has_prefix(self, prefix: str) -> bool:
+        """
+        Decide whether any word starts with prefix.
+        """
+        return self.walk(prefix) >= 0
+
+    def nbytes(self) -> int:
+        """
+        Return the memory held by the automaton's arrays.
+        """
+        return 4 * (len(self.offsets) + 2 * len(self.labels)) + len(
+            self.finals)
+
+    def write(self, path: str, stamp: tuple[int, int] = (0, 0)) -> None:
+        """
+        Save the automaton for open. The file is written to a
+        temporary name and renamed into place.
+
+        Inputs:
+            path (str): destination
+            stamp (tuple[int, int]): size and mtime_ns of the word
+                list the automaton was built from, see saved_stamp
+        """
+        if sys.byteorder != "little":
+            raise ValueError("Saved automata require a little-endian host")
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(TRIE_HEADER.pack(TRIE_MAGIC, TRIE_VERSION, *stamp,
+                                     len(self), len(self.labels)))
+            for table in (self.offsets, self.labels, self.targets):
+                f.write(array("I", table).tobytes())
+            f.write(bytes(self.finals))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def open(cls, path: str) -> "PrefixAutomaton":
+        """
+        Memory-map an automaton saved by write. Its tables are views
+        of the file, so nothing is copied.
+
+        Raises ValueError if the file is not a saved automaton this
+        version can read.
+        """
+        if sys.byteorder != "little":
+            raise ValueError("Saved automata require a little-endian host")
+
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, _, _, num_states, num_edges = (
+                TRIE_HEADER.unpack_from(mm, 0))
+        except struct.error:
+            magic, version = b"", 0
+        if magic != TRIE_MAGIC or version != TRIE_VERSION:
+            mm.close()
+            raise ValueError(f"{path} is not a version {TRIE_VERSION} trie")
+
+        view = memoryview(mm)
+        pos = TRIE_HEADER.size
+        tables = []
+        for count in (num_states + 1, num_edges, num_edges):
+            tables.append(view[pos: pos + 4 * count].cast("I"))
+            pos += 4 * count
+        finals = view[pos: pos + (num_states + 7) // 8]
+
+        automaton = cls(tables[0], tables[1], tables[2], finals)
+        automaton._mm = mm
+
+        return automaton
+
+
+def saved_stamp(path: str) -> tuple[int, int] | None:
+    """
+    Return the word list stamp recorded in a saved automaton, or
+    None if path is not a saved automaton of this version.
+    """
+    try:
+        with open(path, "rb") as f:
+            magic, version, *stamp, _, _ = TRIE_HEADER.unpack(
+                f.read(TRIE_HEADER.size))
+    except (OSError, struct.error):
+        return None
+
+    if magic != TRIE_MAGIC or version != TRIE_VERSION:
+        return None
+    return stamp[0], stamp[1]
@@ -0,0 +1,275 @@
+"""
+Pre-parsed, pre-validated game boards.
+
+A BoardSpec is everything a game file says (theme, letters and answer
+strands) plus the answer cell bitmasks, parsed and validated once. The
+board files never change between sessions, so specs are cached
+process-wide by the SHA-1 hash of the file contents: a game built from
+a spec (see StrandsGame.from_spec) skips tokenizing and re-validating
+its answers.
+
+load_catalog parses every board in a directory once and hands out the
+specs by board name, e.g. "cs-142" for boards/cs-142.txt.
+"""
+import hashlib
+import os
+import threading
+from typing import Iterator, Mapping, NamedTuple, Sequence
+
+from base import Step
+from paths import pack_steps, decode_strands
+
+BOARDS_DIR = "boards"
+
+
+class BoardSpec(NamedTuple):
+    """
+    Immutable description of a valid game board.
+
+    Answers are (word, start row, start col, packed steps), with
+    0-indexed starts and steps packed as in paths.pack_steps. The
+    answer masks hold the cells of each answer, with the cell (r, c)
+    as bit r * cols + c.
+    """
+
+    digest: str
+    theme: str
+    letters: tuple[tuple[str, ...], ...]
+    answers: tuple[tuple[str, int, int, int], ...]
+    answer_masks: tuple[int, ...]
+
+    @property
+    def num_rows(self) -> int:
+        return len(self.letters)
+
+    @property
+    def num_cols(self) -> int:
+        return len(self.letters[0])
+
+
+def content_digest(text: str) -> str:
+    """
+    Hash the contents of a game file.
+    """
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def parse_board(text: str) -> BoardSpec:
+    """
+    Parse and validate the contents of a game file, with the same
+    rules as StrandsGame: a nonempty theme, a rectangular grid of
+    single letters after one line, answers after a blank line, every
+    answer at least three letters long and spelled by its strand,
+    and answers that fill the board.
+
+    Inputs:
+        text (str): the game file contents
+
+    Returns (BoardSpec): the parsed board
+
+    Raises ValueError if the file is not a valid game.
+    """
+    lines_lst = [line.strip() for line in text.splitlines()]
+
+    theme = lines_lst[0] if lines_lst else ""
+    # check if game theme exists:
+    if theme == "":
+        raise ValueError("missing theme")
+
+    letters: list[tuple[str, ...]] = []
+    board_stp = None
+    # assumes one space before grid in valid file
+    for ind, line in enumerate(lines_lst[2:]):
+        if line == "":
+            board_stp = ind + 3
+            break
+
+        letters.append(tuple(alph.lower() for alph in line.split()))
+
+    # check if no space between theme and board, or board and answers
+    if not letters or board_stp is None:
+        raise ValueError("missing board")
+
+    cols = len(letters[0])
+    if cols == 0:
+        raise ValueError("empty board row")
+    for row in letters:
+        if len(row) != cols:
+            raise ValueError("board is not rectangular")
+        for letter in row:
+            if (len(letter) != 1 or not letter.isalpha()
+                    or not letter.islower()):
+                raise ValueError(f"invalid letter {letter!r}")
+
+    raw_answers: list[tuple[str, int, int, list[Step]]] = []
+    for line in lines_lst[board_stp:]:
+        if line == "":
+            break
+
+        full = line.split()
+        word = full[0].lower()
+        if len(full) < 3:
+            raise ValueError(f"answer {word} has no start")
+
+        # adjusting to 0-indexing
+        steps = [Step(dirc.lower()) for dirc in full[3:]]
+        raw_answers.append((word, int(full[1]) - 1, int(full[2]) - 1, steps))
+
+    if not raw_answers:
+        raise ValueError("missing answers")
+
+    num_rows = len(letters)
+    flat_letters = "".join("".join(row) for row in letters)
+    rows, cols_arr, offsets = decode_strands(
+        [(r, c, steps) for _, r, c, steps in raw_answers], use_numpy=False)
+
+    answers = []
+    answer_masks = []
+    tot_ans_len = 0
+    for i, (word, r, c, steps) in enumerate(raw_answers):
+        # check answer longer than three letters
+        if len(word) < 3:
+            raise ValueError(f"answer {word} is too short")
+
+        # check answers start on board and strand actually gives word
+        mask = 0
+        spelled = []
+        for j in range(offsets[i], offsets[i + 1]):
+            if not (0 <= rows[j] < num_rows and 0 <= cols_arr[j] < cols):
+                raise ValueError(f"answer {word} leaves the board")
+            cell = rows[j] * cols + cols_arr[j]
+            spelled.append(flat_letters[cell])
+            mask |= 1 << cell
+        if "".join(spelled) != word:
+            raise ValueError(f"answer {word} does not match its strand")
+
+        answers.append((word, r, c, pack_steps(steps)))
+        answer_masks.append(mask)
+        tot_ans_len += len(word)
+
+    # make sure answers fill board
+    if tot_ans_len != num_rows * cols:
+        raise ValueError("answers do not fill board")
+
+    return BoardSpec(content_digest(text), theme, tuple(letters),
+                     tuple(answers), tuple(answer_masks))
+
+
+# digest -> spec, shared by every catalog and game in the process
+_SPECS: dict[str, BoardSpec] = {}
+_SPECS_LOCK = threading.Lock()
+
+
+def board_spec(text: str) -> BoardSpec:
+    """
+    Return the spec for the contents of a game file, parsing and
+    validating it only the first time these contents are seen.
+
+    Raises ValueError if the file is not a valid game.
+    """
+    digest = content_digest(text)
+    with _SPECS_LOCK:
+        spec = _SPECS.get(digest)
+    if spec is None:
+        spec = parse_board(text)
+        with _SPECS_LOCK:
+            spec = _SPECS.setdefault(digest, spec)
+
+    return spec
+
+
+def register_spec(spec: BoardSpec) -> BoardSpec:
+    """
+    Add a spec that was validated elsewhere, e.g. loaded from a
+    board catalog, to the shared specs.
+
+    Returns (BoardSpec): the shared spec with the same digest
+    """
+    with _SPECS_LOCK:
+        return _SPECS.setdefault(spec.digest, spec)
+
+
+def spec_by_digest(digest: str) -> BoardSpec:
+    """
+    Return a spec seen earlier in this process by its content hash.
+
+    Raises KeyError if no board with that hash was loaded.
+    """
+    with _SPECS_LOCK:
+        return _SPECS[digest]
+
+
+def read_board_spec(path: str) -> BoardSpec:
+    """
+    Return the spec for a game file, see board_spec.
+    """
+    with open(path, encoding="utf-8") as f:
+        return board_spec(f.read())
+
+
+def board_name(path: str) -> str:
+    """
+    Name a board after its file, e.g. "cs-142" for boards/cs-142.txt.
+    """
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+class BoardCatalog(Mapping[str, BoardSpec]):
+    """
+    Read-only mapping from board names to specs, for the valid
+    boards of a directory. Boards that failed validation are
+    listed in invalid, with the reason.
+    """
+
+    board_dir: str
+    _specs: dict[str, BoardSpec]
+    invalid: dict[str, str]
+
+    def __init__(self, board_dir: str, specs: dict[str, BoardSpec],
+                 invalid: dict[str, str]):
+        self.board_dir = board_dir
+        self._specs = specs
+        self.invalid = invalid
+
+    def __getitem__(self, name: str) -> BoardSpec:
+        return self._specs[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._specs)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def path(self, name: str) -> str:
+        """
+        Return the game file a board was loaded from.
+        """
+        return os.path.join(self.board_dir, name + ".txt")
+
+
+def load_catalog(board_dir: str = BOARDS_DIR,
+                 names: Sequence[str] | None = None) -> BoardCatalog:
+    """
+    Parse and validate every board in a directory, reusing the
+    specs of files whose contents were seen before.
+
+    Inputs:
+        board_dir (str): directory holding the .txt game files
+        names (Sequence[str] | None): only load these boards
+
+    Returns (BoardCatalog): the boards, in name order
+    """
+    if names is None:
+        names = [board_name(f) for f in os.listdir(board_dir)
+                 if f.endswith(".txt")]
+
+    specs: dict[str, BoardSpec] = {}
+    invalid: dict[str, str] = {}
+    for name in sorted(names):
+        try:
+            specs[name] = read_board_spec(
+                os.path.join(board_dir, name + ".txt"))
+        except (ValueError, IndexError) as e:
+            invalid[name] = str(e)
+
+    return BoardCatalog(board_dir, specs, invalid)
@@ -0,0 +1,374 @@
+"""
+Packed binary catalog of every game board.
+
+Launching the GUI or TUI used to list boards/, pick a file and parse
+its text. A catalog file (assets/boards.cat by default) holds every
+valid board of boards/ as a pre-parsed BoardSpec record, behind a
+name-sorted index of fixed-size entries. The file is memory-mapped,
+so loading one board, by name or at random, is a binary search over
+the index and a single read of its record.
+
+Every index entry records the SHA-1 hash of the board file contents
+and the file's size and mtime when the catalog was built. Loading
+falls back to the text file when its stamp has changed, and
+check_catalog hashes the files to list stale, new and removed boards.
+
+To rebuild assets/boards.cat, run <src/catalog.py>; pass --check to
+only report what is out of date.
+"""
+import mmap
+import os
+import random
+import struct
+from bisect import bisect_left
+from typing import Callable, Iterator, Mapping, Sequence
+
+import click
+
+from boardspec import (BoardSpec, BOARDS_DIR, board_name, load_catalog,
+                       read_board_spec, register_spec)
+
+CATALOG_PATH = "assets/boards.cat"
+
+# catalog layout, all integers little-endian:
+#   header: magic, version, board count
+#   index:  one entry per board, sorted by name: raw SHA-1 of the
+#           board file, its size and mtime_ns, then the absolute
+#           offset and length of the name and of the record
+#   names and records, see _encode_spec for the record layout
+CAT_MAGIC = b"STBC"
+CAT_VERSION = 1
+CAT_HEADER = struct.Struct("<4sHI")
+CAT_ENTRY = struct.Struct("<20sQQIIII")
+CAT_SHORT = struct.Struct("<H")
+
+
+def _pack_str(text: str) -> bytes:
+    data = text.encode("utf-8")
+    return CAT_SHORT.pack(len(data)) + data
+
+
+def _pack_int(value: int) -> bytes:
+    data = value.to_bytes((value.bit_length() + 7) // 8, "little")
+    return CAT_SHORT.pack(len(data)) + data
+
+
+def _encode_spec(spec: BoardSpec) -> bytes:
+    """
+    Encode a spec as theme, row count, flattened letters, answer
+    count, then word, start row, start col, packed steps and cell
+    mask of each answer. Strings are UTF-8 and integers of any size
+    little-endian, each behind a 2-byte length.
+    """
+    parts = [_pack_str(spec.theme), CAT_SHORT.pack(spec.num_rows),
+             _pack_str("".join("".join(row) for row in spec.letters)),
+             CAT_SHORT.pack(len(spec.answers))]
+    for (word, r, c, packed), mask in zip(spec.answers, spec.answer_masks):
+        parts += [_pack_str(word), CAT_SHORT.pack(r), CAT_SHORT.pack(c),
+                  _pack_int(packed), _pack_int(mask)]
+
+    return b"".join(parts)
+
+
+class _Reader:
+    """
+    Cursor over an encoded record.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def short(self) -> int:
+        (value,) = CAT_SHORT.unpack_from(self.data, self.pos)
+        self.pos += CAT_SHORT.size
+        return value
+
+    def raw(self) -> bytes:
+        size = self.short()
+        self.pos += size
+        return self.data[self.pos - size:self.pos]
+
+    def text(self) -> str:
+        return self.raw().decode("utf-8")
+
+    def number(self) -> int:
+        return int.from_bytes(self.raw(), "little")
+
+
+def _decode_spec(digest: str, data: bytes) -> BoardSpec:
+    """
+    Inverse of _encode_spec.
+    """
+    rd = _Reader(data)
+    theme = rd.text()
+    num_rows = rd.short()
+    flat = rd.text()
+    cols = len(flat) // num_rows
+    letters = tuple(tuple(flat[r * cols:(r + 1) * cols])
+                    for r in range(num_rows))
+
+    answers = []
+    masks = []
+    for _ in range(rd.short()):
+        answers.append((rd.text(), rd.short(), rd.short(), rd.number()))
+        masks.append(rd.number())
+
+    return BoardSpec(digest, theme, letters, tuple(answers), tuple(masks))
+
+
+def build_catalog(board_dir: str = BOARDS_DIR,
+                  out_path: str = CATALOG_PATH) -> dict[str, str]:
+    """
+    Parse and validate every board in board_dir and write them to
+    a catalog. The file is written to a temporary name and renamed
+    into place, so readers never map a half-written catalog.
+
+    Inputs:
+        board_dir (str): directory holding the .txt game files
+        out_path (str): destination catalog
+
+    Returns (dict[str, str]): the boards left out as invalid,
+        with the reason
+    """
+    boards = load_catalog(board_dir)
+    names = sorted(boards)
+    encoded_names = [name.encode("utf-8") for name in names]
+    records = [_encode_spec(boards[name]) for name in names]
+
+    offset = CAT_HEADER.size + CAT_ENTRY.size * len(names)
+    index = []
+    body = []
+    for name, data, record in zip(names, encoded_names, records):
+        size, mtime_ns = _file_stamp(boards.path(name))
+        index.append(CAT_ENTRY.pack(
+            bytes.fromhex(boards[name].digest), size, mtime_ns,
+            offset, len(data), offset + len(data), len(record)))
+        body += [data, record]
+        offset += len(data) + len(record)
+
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(CAT_HEADER.pack(CAT_MAGIC, CAT_VERSION, len(names)))
+        f.write(b"".join(index))
+        f.write(b"".join(body))
+    os.replace(tmp_path, out_path)
+
+    return boards.invalid
+
+
+def _file_stamp(path: str) -> tuple[int, int]:
+    """
+    Return the (size, mtime_ns) pair used to spot edited boards.
+    """
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+class MappedCatalog(Mapping[str, BoardSpec]):
+    """
+    Read-only mapping from board names to specs, backed by a
+    memory-mapped catalog file. Records are decoded on access.
+    """
+
+    path: str
+    _mm: mmap.mmap
+    _count: int
+    # names are decoded once, since every lookup searches them
+    _names: list[str]
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.path = path
+
+        try:
+            magic, version, self._count = CAT_HEADER.unpack_from(self._mm, 0)
+            if magic != CAT_MAGIC or version != CAT_VERSION:
+                raise ValueError(f"{path} is not a board catalog")
+
+            self._names = []
+            for i in range(self._count):
+                entry = self._entry(i)
+                self._names.append(
+                    self._mm[entry[3]:entry[3] + entry[4]].decode("utf-8"))
+        except (ValueError, struct.error):
+            self._mm.close()
+            raise
+
+    def _entry(self, i: int) -> tuple[bytes, int, int, int, int, int, int]:
+        return CAT_ENTRY.unpack_from(self._mm,
+                                     CAT_HEADER.size + i * CAT_ENTRY.size)
+
+    def _find(self, name: str) -> int:
+        i = bisect_left(self._names, name)
+        if i == len(self._names) or self._names[i] != name:
+            raise KeyError(name)
+
+        return i
+
+    def __getitem__(self, name: str) -> BoardSpec:
+        digest, _, _, _, _, rec_off, rec_len = self._entry(self._find(name))
+        spec = _decode_spec(digest.hex(), self._mm[rec_off:rec_off + rec_len])
+
+        # share the spec with games built from the text file
+        return register_spec(spec)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def digest(self, name: str) -> str:
+        """
+        Return the content hash recorded for a board.
+        """
+        return self._entry(self._find(name))[0].hex()
+
+    def is_fresh(self, name: str, board_dir: str = BOARDS_DIR) -> bool:
+        """
+        Decide whether a board's file still has the size and mtime
+        recorded in the catalog. A board whose file is gone counts
+        as fresh, so a catalog can ship without boards/.
+        """
+        _, size, mtime_ns, _, _, _, _ = self._entry(self._find(name))
+        try:
+            current = _file_stamp(os.path.join(board_dir, name + ".txt"))
+        except FileNotFoundError:
+            return True
+
+        return current == (size, mtime_ns)
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def open_catalog(path: str = CATALOG_PATH) -> MappedCatalog | None:
+    """
+    Map a catalog file, or return None if there is no usable one.
+    """
+    try:
+        return MappedCatalog(path)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def check_catalog(board_dir: str = BOARDS_DIR,
+                  path: str = CATALOG_PATH) -> dict[str, list[str]]:
+    """
+    Compare a catalog with the boards on disk by content hash.
+
+    Returns (dict[str, list[str]]): the names of "stale" boards
+        whose file changed, "missing" valid boards not in the
+        catalog, and "removed" boards with no file anymore
+    """
+    catalog = open_catalog(path)
+    boards = load_catalog(board_dir)
+    listed = set(catalog) if catalog is not None else set()
+
+    report: dict[str, list[str]] = {
+        "stale": sorted(name for name in listed & set(boards)
+                        if catalog is not None
+                        and catalog.digest(name) != boards[name].digest),
+        "missing": sorted(set(boards) - listed),
+        "removed": sorted(name for name in listed - set(boards)
+                          if name not in boards.invalid),
+    }
+    # a board edited into an invalid one is stale too
+    report["stale"] = sorted(report["stale"] +
+                             [name for name in listed & set(boards.invalid)])
+    if catalog is not None:
+        catalog.close()
+
+    return report
+
+
+def load_board(name: str | None = None, board_dir: str = BOARDS_DIR,
+               path: str = CATALOG_PATH,
+               rng: random.Random | None = None) -> tuple[BoardSpec, str]:
+    """
+    Load one board by name, or a random one, from the catalog if
+    it is present and up to date for that board, and otherwise
+    from its text file.
+
+    Inputs:
+        name (str | None): board name, e.g. "cs-142", or None
+        board_dir (str): directory holding the .txt game files
+        path (str): the catalog file
+        rng (random.Random | None): source for random picks
+
+    Returns (tuple[BoardSpec, str]): the board, and its game file
+
+    Raises FileNotFoundError if there is no such board, or no
+    board at all, and ValueError if the board is invalid.
+    """
+    pick = (rng or random).choice
+    catalog = open_catalog(path)
+    try:
+        return _load_board(catalog, name, board_dir, pick)
+    finally:
+        if catalog is not None:
+            catalog.close()
+
+
+def _load_board(catalog: MappedCatalog | None, name: str | None,
+                board_dir: str,
+                pick: Callable[[Sequence[str]], str]) -> tuple[BoardSpec, str]:
+    """
+    Body of load_board, with the catalog already opened.
+    """
+    if name is None:
+        # boards added since the catalog was built count too
+        try:
+            files = [f for f in os.listdir(board_dir) if f.endswith(".txt")]
+        except FileNotFoundError:
+            if catalog is None:
+                raise
+            files = []
+        names: Sequence[str] = sorted(
+            set(catalog or ()) | {board_name(f) for f in files})
+        if not names:
+            raise FileNotFoundError(f"No .txt files in {board_dir} directory.")
+        name = pick(names)
+
+    game_file = os.path.join(board_dir, f"{name}.txt")
+    if (catalog is not None and name in catalog
+            and catalog.is_fresh(name, board_dir)):
+        return catalog[name], game_file
+
+    if not os.path.exists(game_file):
+        raise FileNotFoundError(f"Game file '{game_file}' does not exist.")
+
+    return read_board_spec(game_file), game_file
+
+
+@click.command()
+@click.option("-b", "--boards", "board_dir", default=BOARDS_DIR,
+              help="Directory of .txt boards to catalog.")
+@click.option("-o", "--out", "out_path", default=CATALOG_PATH,
+              help="Catalog file to write or check.")
+@click.option("--check", is_flag=True,
+              help="Only report stale, missing and removed boards.")
+def cmd(board_dir: str, out_path: str, check: bool) -> None:
+    """
+    Build the binary board catalog from a directory of boards.
+    """
+    if check:
+        report = check_catalog(board_dir, out_path)
+        for kind, names in report.items():
+            for name in names:
+                print(f"{kind}: {name}")
+        if any(report.values()):
+            raise SystemExit(1)
+        print(f"{out_path} is up to date")
+        return
+
+    invalid = build_catalog(board_dir, out_path)
+    for name, reason in invalid.items():
+        print(f"Skipped {name}: {reason}")
+    print(f"Wrote {out_path} ({os.path.getsize(out_path)} bytes)")
+
+
+if __name__ == "__main__":
+    cmd()
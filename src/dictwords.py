@@ -0,0 +1,250 @@
+"""
+DICTIONARY-WORDS generation, outside the GUI.
+
+StrandsGame.dict_enhancement finds every web2.txt word that a strand
+spells on a board by walking the board and a prefix automaton of
+the words together (see automaton.py), tracking visited cells in a
+bitmask. The automaton is built from the board's sub-lexicon, so it
+stays small, and it is shared by every game on the same board.
+
+To write assets/GAME-with-words.txt for boards/GAME.txt and report
+the wall time, peak RSS and automaton size, run
+<src/dictwords.py -g boards/GAME.txt>.
+
+To do every board of boards/ at once, across a process pool, run
+<src/dictwords.py --all>. A manifest (assets/with-words.json) records
+the content hash of each board and the version (content hash) of
+web2.txt that its file was made with, so boards whose file is up to
+date are skipped; pass --force to redo them all.
+
+Both also save the board's word index (see wordindex.py). To list
+every strand spelling a word, in game file notation, run
+<src/dictwords.py -g boards/GAME.txt -w WORD>; the index is rebuilt
+first if the board was edited since it was saved.
+"""
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import click
+
+from boardspec import BOARDS_DIR, board_name, load_catalog, read_board_spec
+from lexicon import board_lexicon, load_lexicon, prefix_automaton, WEB2_PATH
+from strands import Strand, StrandsGame
+from wordindex import WordIndex, load_word_index, word_index_path
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None  # type: ignore[assignment]
+
+MANIFEST_PATH = "assets/with-words.json"
+
+
+def peak_rss_mb() -> float | None:
+    """
+    Return the peak resident set size of this process in MB, or
+    None where the platform does not report it.
+    """
+    if resource is None:
+        return None
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def lexicon_version(path: str = WEB2_PATH) -> str:
+    """
+    Hash the contents of a word list, so that dictionary words made
+    with an older version of it can be detected.
+    """
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def with_words_path(name: str, out_dir: str = "assets") -> str:
+    """
+    Return where the dictionary words of board name are written.
+    """
+    return os.path.join(out_dir, name + "-with-words.txt")
+
+
+def read_manifest(path: str) -> dict:
+    """
+    Read a batch manifest, or an empty one if it is missing or
+    unreadable.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"lexicon": None, "boards": {}}
+
+    if not isinstance(manifest, dict) or not isinstance(
+            manifest.get("boards"), dict):
+        return {"lexicon": None, "boards": {}}
+    return manifest
+
+
+def write_manifest(path: str, manifest: dict) -> None:
+    """
+    Write a batch manifest atomically.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def current_word_index(game_file: str,
+                       out_dir: str = "assets") -> WordIndex:
+    """
+    Load the saved word index of a board, first regenerating its
+    files if the index is missing, unreadable or was built from
+    different board contents.
+
+    Inputs:
+        game_file (str): the board's game file
+        out_dir (str): directory for the -with-words.txt and
+            -words.idx files
+
+    Returns (WordIndex): the index for the board as it is now
+    """
+    name = board_name(game_file)
+    index_file = word_index_path(name, out_dir)
+    digest = read_board_spec(game_file).digest
+    try:
+        index = load_word_index(index_file)
+        if index.digest == digest:
+            return index
+    except (OSError, ValueError):
+        pass
+
+    StrandsGame(game_file).dict_enhancement(
+        with_words_path(name, out_dir), index_file)
+    return load_word_index(index_file)
+
+
+def _write_board(game_file: str, outfile: str, index_file: str,
+                 words_path: str) -> int:
+    # runs in a worker process
+    return StrandsGame(game_file).dict_enhancement(outfile, index_file,
+                                                   words_path)
+
+
+def build_all(board_dir: str = BOARDS_DIR, out_dir: str = "assets",
+              manifest_path: str = MANIFEST_PATH,
+              words_path: str = WEB2_PATH,
+              jobs: int | None = None,
+              force: bool = False) -> dict[str, int | None]:
+    """
+    Write the dictionary words and word index of every valid board
+    in a directory, skipping boards whose files are up to date with
+    the manifest.
+
+    Inputs:
+        board_dir (str): directory holding the .txt game files
+        out_dir (str): directory for the -with-words.txt and
+            -words.idx files
+        manifest_path (str): the manifest to check and update
+        words_path (str): the word list to search for
+        jobs (int | None): worker processes, by default one per CPU
+        force (bool): redo every board
+
+    Returns (dict[str, int | None]): for each valid board, the number
+        of dictionary words written, or None if it was skipped
+    """
+    catalog = load_catalog(board_dir)
+    version = lexicon_version(words_path)
+    manifest = read_manifest(manifest_path)
+    done = manifest["boards"] if manifest["lexicon"] == version else {}
+
+    results: dict[str, int | None] = {}
+    todo = []
+    for name, spec in catalog.items():
+        if (not force and done.get(name) == spec.digest
+                and os.path.exists(with_words_path(name, out_dir))
+                and os.path.exists(word_index_path(name, out_dir))):
+            results[name] = None
+        else:
+            todo.append(name)
+
+    if todo:
+        # forked workers share the lexicon loaded here
+        load_lexicon(words_path).lower()
+        with ProcessPoolExecutor(jobs) as pool:
+            futures = {name: pool.submit(_write_board, catalog.path(name),
+                                         with_words_path(name, out_dir),
+                                         word_index_path(name, out_dir),
+                                         words_path)
+                       for name in todo}
+            for name, future in futures.items():
+                results[name] = future.result()
+
+    write_manifest(manifest_path, {
+        "lexicon": version,
+        "boards": {name: spec.digest for name, spec in catalog.items()}})
+
+    return dict(sorted(results.items()))
+
+
+@click.command()
+@click.option("-g", "--game", "game_file", type=str,
+              default="boards/cs-142.txt", help="Board file in boards/.")
+@click.option("--all", "all_boards", is_flag=True,
+              help="Do every board in boards/.")
+@click.option("-j", "--jobs", type=int, default=None,
+              help="Worker processes for --all.")
+@click.option("--force", is_flag=True,
+              help="With --all, redo boards that are up to date.")
+@click.option("-w", "--where", "word", type=str, default=None,
+              help="Look up a word in the board's saved word index.")
+def cmd(game_file: str, all_boards: bool, jobs: int | None,
+        force: bool, word: str | None) -> None:
+    """
+    Write the dictionary words of one board, or of every board,
+    and report the cost.
+    """
+    if word is not None:
+        paths = current_word_index(game_file).where(word.lower())
+        for r, c, packed in paths:
+            strand = Strand.from_packed(r, c, packed)
+            steps = " ".join(step.value for step in strand.steps)
+            print(f"{word} {r + 1} {c + 1} {steps}")
+        if not paths:
+            print(f"{word} is not a dictionary word on {game_file}")
+        return
+
+    if all_boards:
+        start = time.perf_counter()
+        results = build_all(jobs=jobs, force=force)
+        seconds = time.perf_counter() - start
+        written = [name for name, count in results.items()
+                   if count is not None]
+        for name in written:
+            print(f"Wrote {with_words_path(name)} ({results[name]} words)")
+        print(f"{len(written)} boards written, "
+              f"{len(results) - len(written)} up to date, "
+              f"in {seconds:.2f}s")
+        return
+
+    start = time.perf_counter()
+    game = StrandsGame(game_file)
+    count = game.dict_enhancement()
+    seconds = time.perf_counter() - start
+
+    # cached by the search above, so nothing is rebuilt here
+    automaton = prefix_automaton(board_lexicon(
+        load_lexicon(WEB2_PATH).lower(), game.game_board.letters))
+    print(f"{count} words on {game_file} in {seconds:.2f}s")
+    print(f"Automaton: {len(automaton)} states, "
+          f"{automaton.nbytes() / 1024:.1f} KB")
+    rss = peak_rss_mb()
+    if rss is not None:
+        print(f"Peak RSS: {rss:.1f} MB")
+
+
+if __name__ == "__main__":
+    cmd()
@@ -0,0 +1,149 @@
+"""
+Append-only log of the moves made in a game.
+
+Every StrandsGame records its submit_strand, submit_many and use_hint
+calls in an EventLog, so sessions can be audited and reconstructed
+later by replaying them (see replay.py). Events are appended to a
+byte buffer as varints: a submitted strand is its zigzag-encoded
+start row and column and its packed steps, and a hint is one byte.
+"""
+from typing import Iterator
+
+from base import StrandBase
+from paths import pack_steps
+
+EVENT_MAGIC = b"STEV"
+EVENT_VERSION = 1
+
+# event tags
+EVENT_SUBMIT = 0
+EVENT_HINT = 1
+
+
+def put_varint(out: bytearray, value: int) -> None:
+    """
+    Append a nonnegative integer as a little-endian base-128 varint.
+    """
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def get_varint(data: bytes | bytearray, pos: int) -> tuple[int, int]:
+    """
+    Read a varint at pos.
+
+    Returns (tuple[int, int]): the value and the position after it
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    # 0, -1, 1, -2, ... -> 0, 1, 2, 3, ...
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+class EventLog:
+    """
+    The moves of one game, in order, for the board with content
+    hash digest played with hint threshold hint_threshold.
+    """
+
+    digest: str
+    hint_threshold: int
+    count: int
+    _data: bytearray
+
+    def __init__(self, digest: str, hint_threshold: int):
+        self.digest = digest
+        self.hint_threshold = hint_threshold
+        self.count = 0
+        self._data = bytearray()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record_submit(self, strand: StrandBase,
+                      packed_steps: int | None = None) -> None:
+        """
+        Append a submitted strand. Pass packed_steps if already known.
+        """
+        if packed_steps is None:
+            packed_steps = pack_steps(strand.steps)
+        data = self._data
+        data.append(EVENT_SUBMIT)
+        put_varint(data, _zigzag(strand.start.r))
+        put_varint(data, _zigzag(strand.start.c))
+        put_varint(data, packed_steps)
+        self.count += 1
+
+    def record_hint(self) -> None:
+        """
+        Append a hint request.
+        """
+        self._data.append(EVENT_HINT)
+        self.count += 1
+
+    def events(self) -> Iterator[tuple[int, int, int, int]]:
+        """
+        Iterate over the events as (tag, start row, start col,
+        packed steps), with zeros after the tag for hints.
+        """
+        data = self._data
+        pos = 0
+        while pos < len(data):
+            tag = data[pos]
+            pos += 1
+            if tag == EVENT_HINT:
+                yield EVENT_HINT, 0, 0, 0
+                continue
+
+            r, pos = get_varint(data, pos)
+            c, pos = get_varint(data, pos)
+            packed, pos = get_varint(data, pos)
+            yield EVENT_SUBMIT, _unzigzag(r), _unzigzag(c), packed
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the log: magic, version, raw board digest, then
+        varints for the hint threshold and event count, then the
+        events.
+        """
+        out = bytearray(EVENT_MAGIC)
+        out.append(EVENT_VERSION)
+        out += bytes.fromhex(self.digest)
+        put_varint(out, self.hint_threshold)
+        put_varint(out, self.count)
+
+        return bytes(out + self._data)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "EventLog":
+        """
+        Inverse of to_bytes.
+
+        Raises ValueError if data is not an event log of this version.
+        """
+        if data[:4] != EVENT_MAGIC or data[4:5] != bytes([EVENT_VERSION]):
+            raise ValueError("not a game event log")
+
+        hint_threshold, pos = get_varint(data, 25)
+        log = cls(data[5:25].hex(), hint_threshold)
+        log.count, pos = get_varint(data, pos)
+        log._data = bytearray(data[pos:])
+
+        return log
+
@@ -0,0 +1,97 @@
+"""
+Per-game cache of guess classifications.
+
+Players resubmit the same strands, and every submit_strand call used
+to spell the strand and look it up in the answers and the dictionary
+again. A StrandsGame keeps a GuessCache of what each cell path
+classified as, keyed by strand_key, and only decides from its own
+state whether a cached answer was already found.
+"""
+from collections import OrderedDict
+
+from base import StrandBase
+from paths import pack_steps
+
+# guess classifications, besides answer indices
+GUESS_TOO_SHORT = -1
+GUESS_DICTIONARY = -2
+GUESS_NOT_A_WORD = -3
+GUESS_OFF_BOARD = -4
+
+# classifications remembered by each game, see GuessCache
+GUESS_CACHE_SIZE = 4096
+
+
+def strand_key(strand: StrandBase) -> tuple[int, int, int]:
+    """
+    Return a hashable (start row, start col, packed steps) key that
+    is equal for exactly the strands that compare equal.
+    """
+    # strands.Strand packs its steps once and caches them
+    packed_steps = getattr(strand, "packed_steps", None)
+    if packed_steps is not None:
+        return strand.start.r, strand.start.c, packed_steps()
+
+    return strand.start.r, strand.start.c, pack_steps(strand.steps)
+
+
+class GuessCache:
+    """
+    Bounded LRU cache of guess classifications, keyed by the cell
+    path of a strand as (start row, start col, packed steps). Only
+    state-independent outcomes are cached: the spelled word and
+    whether it is too short, an answer (by index), a dictionary word,
+    not a word, or off the board. Whether a guess was already found
+    is always decided from the game state.
+    """
+
+    maxsize: int
+    hits: int
+    misses: int
+    _entries: OrderedDict[tuple[int, int, int], tuple[int, str]]
+
+    def __init__(self, maxsize: int = GUESS_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple[int, int, int]) -> tuple[int, str] | None:
+        """
+        Look up a classification, counting the hit or miss.
+
+        Returns (tuple[int, str] | None): the classification and
+            spelled word, or None if not cached
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: tuple[int, int, int], entry: tuple[int, str]) -> None:
+        """
+        Cache a classification, evicting the least recently used
+        one when full.
+        """
+        if self.maxsize <= 0:
+            return
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Drop every cached classification and reset the counters.
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -4,12 +4,13 @@ Pos, Strand, Board, StrandsGame
 """
 import sys
 from typing import TypeAlias
-import os
-import random
 import pygame
 import click
 
 from strands import Pos, Strand, Board, StrandsGame
+from boardspec import BoardSpec, read_board_spec
+from catalog import load_board
+from sounds import SoundBank, sound_bank
 from ui import ArtGUIBase, ArtGUIStub
 from base import PosBase, StrandBase, BoardBase, StrandsGameBase, Step
 from art_gui import (ArtGUI9Slice, ArtGUIHarlequin,
@@ -54,6 +55,8 @@ class GuiStrands:
     show: bool
     font: pygame.font.Font
     frame_width: int
+    # only set when sounds are on
+    sounds: SoundBank
 
     # dictionary where key is index position of letter,
     # value is a tuple of the pixel position as well as
@@ -64,19 +67,31 @@ class GuiStrands:
     strd_lines: list[tuple[Loc, Loc]]
 
     def __init__(self, show: bool, brd_filename: str, hint_threshold: int,
-                 frame: str, sounds: bool, words: bool) -> None:
+                 frame: str, sounds: bool, words: bool,
+                 spec: BoardSpec | None = None) -> None:
         """
-        Initializes the GUI application.
+        Initializes the GUI application. If the board was already
+        loaded, e.g. from the board catalog, pass it as spec.
         """
         pygame.init()
         pygame.mixer.init()
 
-        self.game: StrandsGame = StrandsGame(brd_filename, hint_threshold)
-        if words:
-            self.game.dict_enhancement()
+        if spec is None:
+            spec = read_board_spec(brd_filename)
 
         if sounds:
+            # decodes every sound in the background while we set up
+            self.sounds = sound_bank()
+            self.game = StrandsGame.from_spec(spec, hint_threshold,
+                                              audio=self.sounds,
+                                              game_file=brd_filename)
             self.game.sound_mode = True
+        else:
+            self.game = StrandsGame.from_spec(spec, hint_threshold,
+                                              game_file=brd_filename)
+
+        if words:
+            self.game.dict_enhancement()
 
         # handling edge case where cat4 must pair with standard board
         if frame == "cat4":
@@ -105,6 +120,8 @@ class GuiStrands:
             self.show = True
         else:
             self.show = False
+            # load the dictionary while the player looks at the board
+            self.game.warm_dictionary()
 
         pygame.display.set_caption(self.game.theme())
 
@@ -153,8 +170,7 @@ class GuiStrands:
         """
         end = 0
         if sounds:
-            enter_sound = pygame.mixer.Sound("assets/maximize_008.ogg")
-            enter_sound.play()
+            self.sounds.play("maximize_008")
         while True:
             events = pygame.event.get()
 
@@ -162,8 +178,8 @@ class GuiStrands:
 
                 if event.type == pygame.QUIT:
                     if sounds:
-                        exit_sd = pygame.mixer.Sound("assets/close_002.ogg")
-                        exit_sd.play()
+                        exit_sd = self.sounds.get("close_002")
+                        self.sounds.play("close_002")
                         # from official pygame documentation
                         pygame.time.delay(int(exit_sd.get_length() * 1000))
 
@@ -176,8 +192,8 @@ class GuiStrands:
                 elif event.type == pygame.KEYUP:
                     if event.key == pygame.K_q:
                         if sounds:
-                            exit_sd = pygame.mixer.Sound("assets/close_002.ogg")
-                            exit_sd.play()
+                            exit_sd = self.sounds.get("close_002")
+                            self.sounds.play("close_002")
                             pygame.time.delay(int(exit_sd.get_length() * 1000))
 
                         pygame.quit()
@@ -191,9 +207,7 @@ class GuiStrands:
 
                         if event.key == pygame.K_ESCAPE:
                             if sounds:
-                                clr_sd = pygame.mixer.Sound("assets/" +
-                                                            "scratch_005.ogg")
-                                clr_sd.play()
+                                self.sounds.play("scratch_005")
 
                             self.temp_circles = {}
                             self.temp_circs_ordering = []
@@ -208,9 +222,7 @@ class GuiStrands:
                     ):
                     if event.type == pygame.MOUSEBUTTONUP:
                         if sounds:
-                            click_sd = pygame.mixer.Sound("assets/" +
-                                                             "click_005.ogg")
-                            click_sd.play()
+                            self.sounds.play("click_005")
                         x_click, y_click = event.pos
                         possible_circs = self.gen_pos_circs(self.col_width / 2)
 
@@ -244,8 +256,7 @@ class GuiStrands:
                 end == 0
                 ):
                 if sounds:
-                    click_sd = pygame.mixer.Sound("assets/jingles_STEEL02.ogg")
-                    click_sd.play()
+                    self.sounds.play("jingles_STEEL02")
                 print("The game is over! Exit anytime.")
                 end += 1
 
@@ -699,21 +710,16 @@ def main(show: bool, game: str | None, hint_threshold: int, frame: str,
     Raises FileNotFoundError if no .txt files in boards directory.
     '''
 
-    if game is None:
-        # condition ensuring os.path.join works later
-        board_fs = [brd for brd in os.listdir("boards") if brd.endswith(".txt")]
-        if not board_fs:
-            raise FileNotFoundError("No .txt files in boards directory.")
-        brd_filename = os.path.join("boards", random.choice(board_fs))
-    else:
-        brd_filename = os.path.join("boards", f"{game}.txt")
+    # one seek into the board catalog, or the text file if it is stale
+    spec, brd_filename = load_board(game)
 
     valid_frames = {"cat0", "cat2", "cat3", "cat4"}
     if frame not in valid_frames:
         print("Frame type is not supported. Input new frame.")
         sys.exit()
 
-    GuiStrands(show, brd_filename, hint_threshold, frame, sounds, words)
+    GuiStrands(show, brd_filename, hint_threshold, frame, sounds, words,
+               spec)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,929 @@
+"""
+Word lexicons for the Strands game logic.
+
+A lexicon wraps a dictionary word list (e.g. assets/web2.txt) with
+fast membership checks and prefix queries, while still behaving like
+the read-only, sorted list of words it was built from. There are two
+implementations:
+
+- Lexicon, which holds the words in memory with hashed membership, and
+- MappedLexicon, which reads a compiled binary lexicon through mmap,
+  so that worker processes share the same pages instead of each
+  holding their own list of Python strings.
+
+Lexicons are shared process-wide through load_lexicon, which reads
+each word list once and hands every caller the same instance until
+the file changes on disk or the cache is invalidated. If a fresh
+compiled lexicon (see compile_lexicon) sits next to the word list,
+it is used instead of parsing the text.
+
+The lowercased words of a word list are also available as a prefix
+automaton (see automaton.py) through load_trie, which saves it next
+to the word list on first use and memory-maps it afterwards, so the
+trie is built once and shared by every solver and process.
+
+To compile assets/web2.txt and assets/en_50k.txt, run
+<src/lexicon.py>, which writes assets/web2.lex and assets/web2.trie.
+"""
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, Mapping, Sequence, overload
+
+import click
+
+from automaton import PrefixAutomaton, saved_stamp
+
+WEB2_PATH = "assets/web2.txt"
+FREQ_PATH = "assets/en_50k.txt"
+
+# compiled lexicon layout, all integers little-endian:
+#   header:  magic, version, section count, then size and mtime_ns
+#            of the word list and frequency list it was compiled from
+#   section: word count, block size, then absolute offsets of the
+#            block index, front-coded blocks, frequency column
+#            (0 if absent) and first-byte prefix index
+# section 0 holds the words as given, section 1 the lowercased words.
+LEX_MAGIC = b"STLX"
+LEX_VERSION = 1
+LEX_HEADER = struct.Struct("<4sHHQQQQ")
+LEX_SECTION = struct.Struct("<IHHQQQQ")
+LEX_BLOCK_SIZE = 16
+
+
+class LexiconBase(ABC):
+    """
+    Immutable, sorted word collection with membership tests and
+    prefix queries. Indexing and iteration see the words in sorted
+    (code point) order rather than in file order.
+    """
+
+    # newline-joined words, see as_text
+    _text: str | None = None
+
+    @abstractmethod
+    def __contains__(self, word: object) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    @overload
+    def __getitem__(self, ind: int) -> str: ...
+
+    @overload
+    def __getitem__(self, ind: slice) -> list[str]: ...
+
+    def __getitem__(self, ind: int | slice) -> str | list[str]:
+        if isinstance(ind, slice):
+            return [self.word_at(i) for i in range(*ind.indices(len(self)))]
+
+        if ind < 0:
+            ind += len(self)
+        if not 0 <= ind < len(self):
+            raise IndexError("lexicon index out of range")
+
+        return self.word_at(ind)
+
+    @abstractmethod
+    def word_at(self, ind: int) -> str:
+        """
+        Return the word at a (non-negative, in range) sorted index.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def words_with_prefix(self, prefix: str) -> list[str]:
+        """
+        Return all words starting with prefix, in sorted order.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def has_prefix(self, prefix: str) -> bool:
+        """
+        Decide whether any word in the lexicon starts with prefix.
+        A word counts as its own prefix.
+        """
+        raise NotImplementedError
+
+    def as_text(self) -> str:
+        """
+        Return every word joined by newlines, in sorted order, for
+        whole-lexicon regex scans. Built once and then cached.
+        """
+        if self._text is None:
+            self._text = "\n".join(self)
+
+        return self._text
+
+    @abstractmethod
+    def lower(self) -> "LexiconBase":
+        """
+        Return the lowercased version of this lexicon. It is built
+        on first use and then cached, so every caller of lower() on
+        a shared lexicon also shares the lowercased one.
+        """
+        raise NotImplementedError
+
+
+class Lexicon(LexiconBase):
+    """
+    In-memory lexicon, with O(1) hashed membership tests and
+    binary-search prefix queries over the sorted words.
+    """
+
+    _words: tuple[str, ...]
+    _word_set: frozenset[str]
+    _lower: "Lexicon | None"
+
+    def __init__(self, words: Iterable[str]):
+        word_set = frozenset(words)
+        self._word_set = word_set
+        self._words = tuple(sorted(word_set))
+        self._lower = None
+
+    @classmethod
+    def from_file(cls, path: str) -> "Lexicon":
+        """
+        Build a lexicon from a text file with one word per line.
+        Blank lines are ignored.
+
+        Inputs:
+            path (str): the word list file
+
+        Returns (Lexicon): the lexicon of stripped words
+        """
+        with open(path, encoding="utf-8") as f:
+            words = [line.strip() for line in f.readlines()]
+
+        return cls(word for word in words if word)
+
+    def __contains__(self, word: object) -> bool:
+        return word in self._word_set
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._words)
+
+    def word_at(self, ind: int) -> str:
+        return self._words[ind]
+
+    def _prefix_range(self, prefix: str) -> tuple[int, int]:
+        """
+        Compute the half-open index range of words starting
+        with prefix, using binary search on the sorted words.
+        """
+        lo = bisect_left(self._words, prefix)
+        # chr(0x10FFFF) sorts after every character we could append
+        hi = bisect_left(self._words, prefix + "\U0010ffff", lo)
+
+        return lo, hi
+
+    def has_prefix(self, prefix: str) -> bool:
+        lo, hi = self._prefix_range(prefix)
+        return lo < hi
+
+    def words_with_prefix(self, prefix: str) -> list[str]:
+        lo, hi = self._prefix_range(prefix)
+        return list(self._words[lo:hi])
+
+    def lower(self) -> "Lexicon":
+        if self._lower is None:
+            if all(word.islower() for word in self._words):
+                self._lower = self
+            else:
+                self._lower = Lexicon(word.lower() for word in self._words)
+
+        return self._lower
+
+
+class BoardLexicon(Lexicon):
+    """
+    The words of a full lexicon that could possibly be spelled on a
+    particular board: their letter multiset fits within the board's
+    letters, and every pair of consecutive letters sits on some pair
+    of adjacent cells. Any word spelled by a non-cyclic strand on the
+    board passes both checks, so lookups for such strands give the
+    same answers as the full lexicon.
+    """
+
+    full_size: int
+
+    def __init__(self, words: Iterable[str], full_size: int):
+        super().__init__(words)
+        self.full_size = full_size
+
+    @property
+    def reduction_ratio(self) -> float:
+        """
+        Fraction of the full lexicon filtered out for this board,
+        e.g. 0.99 when only 1% of the words were kept.
+        """
+        if self.full_size == 0:
+            return 0.0
+
+        return 1 - len(self) / self.full_size
+
+
+class MappedLexicon(LexiconBase):
+    """
+    Lexicon backed by one section of a memory-mapped compiled
+    lexicon file. Words are front-coded in blocks of LEX_BLOCK_SIZE;
+    lookups narrow the range with the first-byte prefix index, binary
+    search the block heads and then decode a single block.
+    """
+
+    _mm: mmap.mmap
+    _count: int
+    _block_size: int
+    _block_index: memoryview
+    _blocks_off: int
+    _freqs: memoryview | None
+    _prefix_index: memoryview
+    _lower: "MappedLexicon | None"
+
+    def __init__(self, mm: mmap.mmap, section: int):
+        _, _, num_sections, *_ = LEX_HEADER.unpack_from(mm, 0)
+        if not 0 <= section < num_sections:
+            raise ValueError(f"No section {section} in compiled lexicon")
+
+        (count, block_size, _, index_off, blocks_off, freq_off,
+         prefix_off) = LEX_SECTION.unpack_from(
+             mm, LEX_HEADER.size + section * LEX_SECTION.size)
+
+        num_blocks = -(-count // block_size)
+        view = memoryview(mm)
+
+        self._mm = mm
+        self._count = count
+        self._block_size = block_size
+        self._block_index = view[index_off: index_off + 4 * num_blocks
+                                 ].cast("I")
+        self._blocks_off = blocks_off
+        self._freqs = (view[freq_off: freq_off + 4 * count].cast("I")
+                       if freq_off else None)
+        self._prefix_index = view[prefix_off: prefix_off + 4 * 257].cast("I")
+        self._lower = (self if section == 1 or num_sections < 2 else None)
+
+    @classmethod
+    def open(cls, path: str) -> "MappedLexicon":
+        """
+        Memory-map a compiled lexicon file and return its lexicon
+        of words as given (section 0).
+
+        Raises ValueError if the file is not a compiled lexicon
+        this version can read.
+        """
+        if sys.byteorder != "little":
+            raise ValueError("Compiled lexicons require a little-endian host")
+
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, *_ = LEX_HEADER.unpack_from(mm, 0)
+        if magic != LEX_MAGIC or version != LEX_VERSION:
+            mm.close()
+            raise ValueError(f"{path} is not a version {LEX_VERSION} lexicon")
+
+        return cls(mm, 0)
+
+    def _head(self, block: int) -> bytes:
+        """
+        Return the first word of a block, which is stored in full.
+        """
+        pos = self._blocks_off + self._block_index[block]
+        length = self._mm[pos]
+        return self._mm[pos + 1: pos + 1 + length]
+
+    def _decode_block(self, block: int) -> list[bytes]:
+        """
+        Decode every word of a front-coded block.
+        """
+        mm = self._mm
+        pos = self._blocks_off + self._block_index[block]
+        size = min(self._block_size, self._count - block * self._block_size)
+
+        length = mm[pos]
+        word = mm[pos + 1: pos + 1 + length]
+        pos += 1 + length
+        words = [word]
+
+        for _ in range(size - 1):
+            shared = mm[pos]
+            length = mm[pos + 1]
+            word = word[:shared] + mm[pos + 2: pos + 2 + length]
+            pos += 2 + length
+            words.append(word)
+
+        return words
+
+    def _seek(self, key: bytes) -> tuple[int, bytes | None]:
+        """
+        Find the index of the first word not less than key, along
+        with that word (None if every word is less than key).
+        """
+        if not key:
+            return (0, self._head(0)) if self._count else (0, None)
+
+        first = self._prefix_index[key[0]]
+        last = self._prefix_index[key[0] + 1]
+        if first == last:
+            if first < self._count:
+                return first, self.word_at(first).encode("utf-8")
+            return first, None
+
+        size = self._block_size
+        lo_block = first // size
+        lo, hi = lo_block, (last - 1) // size + 1
+
+        # rightmost block whose head is not greater than key
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._head(mid) <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        block = lo - 1
+        if block < lo_block:
+            return first, self.word_at(first).encode("utf-8")
+
+        for ind, word in enumerate(self._decode_block(block)):
+            if word >= key:
+                return block * size + ind, word
+
+        ind = (block + 1) * size
+        if ind < self._count:
+            return ind, self._head(block + 1)
+        return ind, None
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str):
+            return False
+
+        key = word.encode("utf-8")
+        return self._seek(key)[1] == key
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for block in range(len(self._block_index)):
+            for word in self._decode_block(block):
+                yield word.decode("utf-8")
+
+    def word_at(self, ind: int) -> str:
+        block, offset = divmod(ind, self._block_size)
+        return self._decode_block(block)[offset].decode("utf-8")
+
+    def has_prefix(self, prefix: str) -> bool:
+        key = prefix.encode("utf-8")
+        word = self._seek(key)[1]
+        return word is not None and word.startswith(key)
+
+    def words_with_prefix(self, prefix: str) -> list[str]:
+        key = prefix.encode("utf-8")
+        ind, word = self._seek(key)
+        if word is None or not word.startswith(key):
+            return []
+
+        size = self._block_size
+        block, offset = divmod(ind, size)
+        found: list[str] = []
+        while block < len(self._block_index):
+            for word in self._decode_block(block)[offset:]:
+                if not word.startswith(key):
+                    return found
+                found.append(word.decode("utf-8"))
+            block += 1
+            offset = 0
+
+        return found
+
+    def findall(self, pattern: "re.Pattern[bytes]",
+                prefixes: Iterable[str]) -> list[str]:
+        """
+        Scan the words starting with each of prefixes for lines
+        matching a multiline pattern, one prefix at a time, so that
+        only the blocks holding those words are decoded rather than
+        the whole mapped file (see as_text).
+
+        Returns (list[str]): the matches, in sorted order
+        """
+        size = self._block_size
+        found: list[str] = []
+        for prefix in sorted(set(prefixes)):
+            key = prefix.encode("utf-8")
+            first, word = self._seek(key)
+            if word is None or not word.startswith(key):
+                continue
+            if key[-1] == 0xff:
+                last = self._count
+            else:
+                last = self._seek(key[:-1] + bytes([key[-1] + 1]))[0]
+
+            words: list[bytes] = []
+            for block in range(first // size, (last - 1) // size + 1):
+                words += self._decode_block(block)
+            start = first % size
+            text = b"\n".join(words[start: start + last - first])
+            found += [word.decode("utf-8")
+                      for word in pattern.findall(text)]
+
+        return found
+
+    def frequency(self, word: str) -> int:
+        """
+        Return the frequency recorded for word at compile time,
+        or 0 if the word is unknown or has no recorded frequency.
+        """
+        if self._freqs is None:
+            return 0
+
+        key = word.encode("utf-8")
+        ind, found = self._seek(key)
+        if found != key:
+            return 0
+
+        return self._freqs[ind]
+
+    def lower(self) -> "MappedLexicon":
+        if self._lower is None:
+            self._lower = MappedLexicon(self._mm, 1)
+
+        return self._lower
+
+
+class MappedFrequencies(Mapping[str, int]):
+    """
+    Read-only word -> frequency mapping over the frequency column
+    of a compiled lexicon. Words without a frequency are absent.
+    """
+
+    _lexicon: MappedLexicon
+
+    def __init__(self, lexicon: MappedLexicon):
+        self._lexicon = lexicon
+
+    def __getitem__(self, word: str) -> int:
+        freq = self._lexicon.frequency(word)
+        if freq == 0:
+            raise KeyError(word)
+        return freq
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self._lexicon.frequency(word) > 0
+
+    def __iter__(self) -> Iterator[str]:
+        for word in self._lexicon:
+            if self._lexicon.frequency(word):
+                yield word
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+def compiled_path(path: str) -> str:
+    """
+    Return where the compiled version of a word list lives.
+    """
+    return os.path.splitext(path)[0] + ".lex"
+
+
+def trie_path(path: str) -> str:
+    """
+    Return where the saved trie of a word list lives.
+    """
+    return os.path.splitext(path)[0] + ".trie"
+
+
+def _file_stamp(path: str) -> tuple[int, int]:
+    """
+    Return the (size, mtime_ns) pair used to detect stale
+    compiled lexicons.
+    """
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def read_frequencies(path: str) -> dict[str, int]:
+    """
+    Parse a "WORD COUNT" frequency list such as assets/en_50k.txt.
+    """
+    freqs = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f.readlines():
+            lst = line.split()
+            if len(lst) == 2:
+                freqs[lst[0]] = int(lst[1])
+
+    return freqs
+
+
+def _encode_section(words: list[str], freqs: dict[str, int] | None,
+                    start: int) -> tuple[bytes, bytes]:
+    """
+    Encode a sorted word list as a compiled lexicon section that
+    will be written at absolute file offset start.
+
+    Returns (tuple[bytes, bytes]): the section header and body
+    """
+    encoded = [word.encode("utf-8") for word in words]
+    size = LEX_BLOCK_SIZE
+
+    blocks = bytearray()
+    block_index = array("I")
+    prefix_index = array("I", [0] * 257)
+    for ind, word in enumerate(encoded):
+        if len(word) > 255:
+            raise ValueError(f"Word too long to compile: {words[ind]}")
+
+        prefix_index[word[0] + 1] += 1
+        if ind % size == 0:
+            block_index.append(len(blocks))
+            blocks += bytes([len(word)]) + word
+        else:
+            prev = encoded[ind - 1]
+            shared = 0
+            limit = min(len(prev), len(word))
+            while shared < limit and prev[shared] == word[shared]:
+                shared += 1
+            blocks += bytes([shared, len(word) - shared]) + word[shared:]
+
+    # turn first-byte counts into starting word indices
+    for byte in range(256):
+        prefix_index[byte + 1] += prefix_index[byte]
+
+    index_off = start
+    blocks_off = index_off + 4 * len(block_index)
+    freq_off = blocks_off + len(blocks)
+    body = block_index.tobytes() + bytes(blocks)
+
+    if freqs is not None:
+        body += array("I", [min(freqs.get(word, 0), 0xFFFFFFFF)
+                            for word in words]).tobytes()
+        prefix_off = freq_off + 4 * len(words)
+    else:
+        prefix_off = freq_off
+        freq_off = 0
+    body += prefix_index.tobytes()
+
+    header = LEX_SECTION.pack(len(words), size, 0, index_off, blocks_off,
+                              freq_off, prefix_off)
+    return header, body
+
+
+def compile_lexicon(words_path: str = WEB2_PATH,
+                    freq_path: str = FREQ_PATH,
+                    out_path: str | None = None) -> str:
+    """
+    Compile a word list and frequency list into a binary lexicon
+    that MappedLexicon can memory-map. The file is written to a
+    temporary name and renamed into place, so processes mapping
+    an older version are never handed a half-written file.
+
+    Inputs:
+        words_path (str): the word list, one word per line
+        freq_path (str): the "WORD COUNT" frequency list
+        out_path (str | None): destination, compiled_path by default
+
+    Returns (str): the path of the compiled lexicon
+    """
+    if sys.byteorder != "little":
+        raise ValueError("Compiled lexicons require a little-endian host")
+
+    if out_path is None:
+        out_path = compiled_path(words_path)
+
+    lexicon = Lexicon.from_file(words_path)
+    freqs = read_frequencies(freq_path)
+
+    words_stamp = _file_stamp(words_path)
+    freq_stamp = _file_stamp(freq_path)
+    header = LEX_HEADER.pack(LEX_MAGIC, LEX_VERSION, 2, *words_stamp,
+                             *freq_stamp)
+
+    start = LEX_HEADER.size + 2 * LEX_SECTION.size
+    head_0, body_0 = _encode_section(list(lexicon), None, start)
+    head_1, body_1 = _encode_section(list(lexicon.lower()), freqs,
+                                     start + len(body_0))
+
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header + head_0 + head_1 + body_0 + body_1)
+    os.replace(tmp_path, out_path)
+
+    return out_path
+
+
+def is_compiled_fresh(words_path: str = WEB2_PATH,
+                      freq_path: str | None = FREQ_PATH) -> bool:
+    """
+    Decide whether the compiled lexicon for words_path exists and
+    was built from the current words_path and freq_path files.
+    With no freq_path, only the word list is checked.
+    """
+    lex_path = compiled_path(words_path)
+    try:
+        with open(lex_path, "rb") as f:
+            header = f.read(LEX_HEADER.size)
+        magic, version, _, *stamps = LEX_HEADER.unpack(header)
+        current = list(_file_stamp(words_path))
+        if freq_path is None:
+            stamps = stamps[:2]
+        else:
+            current.extend(_file_stamp(freq_path))
+    except (OSError, struct.error):
+        return False
+
+    return (magic == LEX_MAGIC and version == LEX_VERSION
+            and stamps == current)
+
+
+# absolute path -> (mtime_ns, lexicon) of every lexicon loaded so far
+_LEXICONS: dict[str, tuple[int, LexiconBase]] = {}
+_FREQUENCIES: dict[str, tuple[int, Mapping[str, int]]] = {}
+# (full lexicon, board letters) -> sub-lexicon for that board
+_BOARD_LEXICONS: dict[tuple[LexiconBase, tuple[tuple[str, ...], ...]],
+                      BoardLexicon] = {}
+# lexicon -> prefix automaton of its words
+_AUTOMATA: dict[LexiconBase, PrefixAutomaton] = {}
+# absolute path -> (mtime_ns, trie) of every word list trie loaded
+_TRIES: dict[str, tuple[int, PrefixAutomaton]] = {}
+_LEXICONS_LOCK = threading.Lock()
+
+
+def _read_lexicon(path: str) -> LexiconBase:
+    """
+    Load a word list, preferring a fresh compiled lexicon and
+    falling back to parsing the text file.
+    """
+    if is_compiled_fresh(path, None):
+        try:
+            return MappedLexicon.open(compiled_path(path))
+        except (OSError, ValueError):
+            pass
+
+    return Lexicon.from_file(path)
+
+
+def load_lexicon(path: str = WEB2_PATH) -> LexiconBase:
+    """
+    Return the shared lexicon for a word list file, reading the file
+    only if it has not been loaded yet or was modified since.
+
+    Inputs:
+        path (str): the word list file
+
+    Returns (LexiconBase): the process-wide lexicon for path
+    """
+    key = os.path.abspath(path)
+    mtime = os.stat(key).st_mtime_ns
+
+    with _LEXICONS_LOCK:
+        cached = _LEXICONS.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        lexicon = _read_lexicon(key)
+        _LEXICONS[key] = (mtime, lexicon)
+
+    return lexicon
+
+
+def load_frequencies(path: str = FREQ_PATH,
+                     words_path: str = WEB2_PATH) -> Mapping[str, int]:
+    """
+    Return the shared word -> frequency mapping for a frequency list.
+    When the compiled lexicon for words_path is fresh, this reads its
+    frequency column (covering only words in the lexicon); otherwise
+    the text frequency list is parsed.
+    """
+    key = os.path.abspath(path)
+    mtime = os.stat(key).st_mtime_ns
+
+    with _LEXICONS_LOCK:
+        cached = _FREQUENCIES.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    lexicon = load_lexicon(words_path)
+    freqs: Mapping[str, int]
+    if (isinstance(lexicon, MappedLexicon)
+            and is_compiled_fresh(words_path, path)):
+        freqs = MappedFrequencies(lexicon.lower())
+    else:
+        freqs = read_frequencies(key)
+
+    with _LEXICONS_LOCK:
+        _FREQUENCIES[key] = (mtime, freqs)
+
+    return freqs
+
+
+def board_lexicon(lexicon: LexiconBase,
+                  letters: Sequence[Sequence[str]]) -> BoardLexicon:
+    """
+    Return the sub-lexicon of words that could be spelled on a board
+    of letters (see BoardLexicon). Results are cached per lexicon and
+    board, so games and solvers on the same board share them.
+
+    Inputs:
+        lexicon (LexiconBase): the full lexicon to filter
+        letters (Sequence[Sequence[str]]): the board, row by row
+
+    Returns (BoardLexicon): the board-scoped sub-lexicon
+    """
+    board = tuple(tuple(row) for row in letters)
+    key = (lexicon, board)
+    with _LEXICONS_LOCK:
+        cached = _BOARD_LEXICONS.get(key)
+    if cached is not None:
+        return cached
+
+    rows = len(board)
+    cols = len(board[0]) if board else 0
+
+    counts: dict[str, int] = {}
+    bigrams: set[str] = set()
+    for r in range(rows):
+        for c in range(cols):
+            letter = board[r][c]
+            counts[letter] = counts.get(letter, 0) + 1
+            for nb_r in range(max(r - 1, 0), min(r + 2, rows)):
+                for nb_c in range(max(c - 1, 0), min(c + 2, cols)):
+                    if (nb_r, nb_c) != (r, c):
+                        bigrams.add(letter + board[nb_r][nb_c])
+
+    # cheap first pass over the whole lexicon: words of board letters
+    pattern = "^(?:%s){1,%d}$" % ("|".join(map(re.escape, counts)),
+                                  rows * cols)
+    if isinstance(lexicon, MappedLexicon):
+        # scan only the mapped blocks of words starting with a board
+        # bigram, keeping the pages shared
+        board_letter_words = [letter for letter in counts
+                              if letter in lexicon]
+        board_letter_words += lexicon.findall(
+            re.compile(pattern.encode("utf-8"), re.MULTILINE), bigrams)
+    else:
+        board_letter_words = re.findall(pattern, lexicon.as_text(),
+                                        re.MULTILINE)
+
+    kept = []
+    for word in board_letter_words:
+        if any(word[i: i + 2] not in bigrams for i in range(len(word) - 1)):
+            continue
+        if any(word.count(letter) > counts[letter] for letter in set(word)):
+            continue
+        kept.append(word)
+
+    sub_lexicon = BoardLexicon(kept, len(lexicon))
+    with _LEXICONS_LOCK:
+        _BOARD_LEXICONS[key] = sub_lexicon
+
+    return sub_lexicon
+
+
+def prefix_automaton(lexicon: LexiconBase) -> PrefixAutomaton:
+    """
+    Return the prefix automaton accepting the words of a lexicon,
+    building it on first use. Automata are cached per lexicon, so
+    every game and solver using a lexicon shares one.
+    """
+    with _LEXICONS_LOCK:
+        cached = _AUTOMATA.get(lexicon)
+    if cached is not None:
+        return cached
+
+    automaton = PrefixAutomaton.from_words(lexicon)
+    with _LEXICONS_LOCK:
+        return _AUTOMATA.setdefault(lexicon, automaton)
+
+
+def compile_trie(words_path: str = WEB2_PATH,
+                 out_path: str | None = None) -> str:
+    """
+    Save the prefix automaton of the lowercased words of a word list
+    so that load_trie can memory-map it.
+
+    Inputs:
+        words_path (str): the word list, one word per line
+        out_path (str | None): destination, trie_path by default
+
+    Returns (str): the path of the saved trie
+    """
+    if out_path is None:
+        out_path = trie_path(words_path)
+
+    stamp = _file_stamp(words_path)
+    automaton = PrefixAutomaton.from_words(load_lexicon(words_path).lower())
+    automaton.write(out_path, stamp)
+
+    return out_path
+
+
+def load_trie(path: str = WEB2_PATH) -> PrefixAutomaton:
+    """
+    Return the shared prefix automaton of the lowercased words of a
+    word list. A saved trie built from the current file is mapped;
+    otherwise the trie is built and saved for next time.
+
+    Inputs:
+        path (str): the word list file
+
+    Returns (PrefixAutomaton): the process-wide trie for path
+    """
+    key = os.path.abspath(path)
+    mtime = os.stat(key).st_mtime_ns
+
+    with _LEXICONS_LOCK:
+        cached = _TRIES.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    out_path = trie_path(key)
+    automaton = None
+    if saved_stamp(out_path) == _file_stamp(key):
+        try:
+            automaton = PrefixAutomaton.open(out_path)
+        except (OSError, ValueError):
+            pass
+
+    if automaton is None:
+        automaton = PrefixAutomaton.from_words(load_lexicon(key).lower())
+        try:
+            automaton.write(out_path, _file_stamp(key))
+        except (OSError, ValueError):
+            # read-only assets: keep the trie in memory only
+            pass
+
+    with _LEXICONS_LOCK:
+        _TRIES[key] = (mtime, automaton)
+
+    return automaton
+
+
+def invalidate_lexicon(path: str | None = None) -> None:
+    """
+    Drop a cached lexicon so that the next load_lexicon re-reads
+    the file. With no path, every cached lexicon, frequency list
+    and trie is dropped. Board sub-lexicons and prefix automata
+    are always dropped.
+    """
+    with _LEXICONS_LOCK:
+        _BOARD_LEXICONS.clear()
+        _AUTOMATA.clear()
+        if path is None:
+            _LEXICONS.clear()
+            _FREQUENCIES.clear()
+            _TRIES.clear()
+        else:
+            _LEXICONS.pop(os.path.abspath(path), None)
+            _FREQUENCIES.pop(os.path.abspath(path), None)
+            _TRIES.pop(os.path.abspath(path), None)
+
+
+def reload_lexicon(path: str = WEB2_PATH) -> LexiconBase:
+    """
+    Force a fresh read of a word list file, replacing the shared
+    lexicon for every later load_lexicon call.
+    """
+    invalidate_lexicon(path)
+    return load_lexicon(path)
+
+
+@click.command()
+@click.option("-w", "--words", "words_path", default=WEB2_PATH,
+              help="Word list to compile.")
+@click.option("-f", "--freqs", "freq_path", default=FREQ_PATH,
+              help="Word frequency list to compile alongside.")
+@click.option("-o", "--out", "out_path", default=None,
+              help="Destination, defaults to the word list with .lex.")
+def cmd(words_path: str, freq_path: str, out_path: str | None) -> None:
+    """
+    Compile a word list into a memory-mappable binary lexicon
+    and trie.
+    """
+    out = compile_lexicon(words_path, freq_path, out_path)
+    print(f"Wrote {out} ({os.path.getsize(out)} bytes)")
+    trie = compile_trie(words_path, None if out_path is None
+                        else os.path.splitext(out_path)[0] + ".trie")
+    print(f"Wrote {trie} ({os.path.getsize(trie)} bytes)")
+
+
+if __name__ == "__main__":
+    cmd()
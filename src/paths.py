@@ -0,0 +1,228 @@
+"""
+Table-driven step engine for strands.
+
+Steps are looked up in delta tables instead of being decoded through
+if/elif chains, and decode_strands turns many (start, steps) strands
+into flat row and column arrays in one call. When NumPy is installed,
+large batches are decoded with cumulative sums instead of Python loops.
+
+Strands are also validated on cell indices: cell_flags spots cycles
+with a set of visited cells and folds by looking up, for each
+diagonal step, the crossing diagonal of the same 2x2 square.
+"""
+from array import array
+from typing import NamedTuple, Sequence
+
+from base import Step
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None  # type: ignore[assignment]
+
+# (row, col) change for each step, and back
+STEP_DELTAS: dict[Step, tuple[int, int]] = {
+    Step.W: (0, -1),
+    Step.N: (-1, 0),
+    Step.E: (0, 1),
+    Step.S: (1, 0),
+    Step.NW: (-1, -1),
+    Step.NE: (-1, 1),
+    Step.SE: (1, 1),
+    Step.SW: (1, -1),
+}
+DELTA_STEPS: dict[tuple[int, int], Step] = {
+    delta: step for step, delta in STEP_DELTAS.items()
+}
+
+# 3-bit codes for packing steps into integers, and back
+STEP_CODES: dict[Step, int] = {step: code for code, step in enumerate(Step)}
+CODE_STEPS: tuple[Step, ...] = tuple(Step)
+CODE_DR: tuple[int, ...] = tuple(STEP_DELTAS[s][0] for s in CODE_STEPS)
+CODE_DC: tuple[int, ...] = tuple(STEP_DELTAS[s][1] for s in CODE_STEPS)
+
+# cell_flags results
+CYCLIC = 1
+FOLDED = 2
+
+# batches with at least this many steps use NumPy, if installed
+NUMPY_MIN_STEPS = 2048
+
+
+def pack_steps(steps: Sequence[Step]) -> int:
+    """
+    Pack steps into an integer, 3 bits per step with the first
+    step in the highest bits. A leading 1 bit records the number
+    of steps, so no steps packs to 1.
+    """
+    packed = 1
+    for step in steps:
+        packed = packed << 3 | STEP_CODES[step]
+
+    return packed
+
+
+def unpack_steps(packed: int) -> list[Step]:
+    """
+    Inverse of pack_steps.
+    """
+    steps = []
+    while packed > 1:
+        steps.append(CODE_STEPS[packed & 7])
+        packed >>= 3
+    steps.reverse()
+
+    return steps
+
+
+class DecodedStrands(NamedTuple):
+    """
+    Flat positions of a batch of strands. The positions of the ith
+    strand are rows[offsets[i]:offsets[i + 1]] and
+    cols[offsets[i]:offsets[i + 1]], so offsets has one more entry
+    than there are strands. The arrays are NumPy arrays if NumPy
+    decoded the batch, and array.array objects otherwise.
+    """
+
+    rows: Sequence[int]
+    cols: Sequence[int]
+    offsets: Sequence[int]
+
+
+def decode_strands(strands: Sequence[tuple[int, int, Sequence[Step]]],
+                   use_numpy: bool | None = None) -> DecodedStrands:
+    """
+    Decode many strands, given as (start row, start col, steps),
+    into flat coordinate arrays.
+
+    Inputs:
+        strands (Sequence[tuple[int, int, Sequence[Step]]]): the batch
+        use_numpy (bool | None): force or forbid the NumPy path; by
+            default it is used for large batches when available
+
+    Returns (DecodedStrands): the positions of every strand
+    """
+    offsets = array("q", [0])
+    total = 0
+    for _, _, steps in strands:
+        total += len(steps) + 1
+        offsets.append(total)
+
+    if use_numpy is None:
+        use_numpy = np is not None and total >= NUMPY_MIN_STEPS
+    if use_numpy:
+        if np is None:
+            raise ValueError("NumPy is not installed")
+        return _decode_numpy(strands, offsets, total)
+
+    rows = array("q", bytes(8 * total))
+    cols = array("q", bytes(8 * total))
+    codes = STEP_CODES
+    ind = 0
+    for r, c, steps in strands:
+        rows[ind] = r
+        cols[ind] = c
+        ind += 1
+        for step in steps:
+            code = codes[step]
+            r += CODE_DR[code]
+            c += CODE_DC[code]
+            rows[ind] = r
+            cols[ind] = c
+            ind += 1
+
+    return DecodedStrands(rows, cols, offsets)
+
+
+def _decode_numpy(strands: Sequence[tuple[int, int, Sequence[Step]]],
+                  offsets: array, total: int) -> DecodedStrands:
+    """
+    NumPy version of decode_strands: lay out the start of each
+    strand followed by its step deltas, take one cumulative sum,
+    then subtract the running total carried over from the
+    previous strands.
+    """
+    assert np is not None
+    codes = np.fromiter(
+        (STEP_CODES[step] for _, _, steps in strands for step in steps),
+        dtype=np.int8, count=total - len(strands))
+    starts = np.array([(r, c) for r, c, _ in strands],
+                      dtype=np.int64).reshape(-1, 2)
+    offs = np.frombuffer(offsets, dtype=np.int64)
+    is_start = np.zeros(total, dtype=bool)
+    is_start[offs[:-1]] = True
+
+    coords = []
+    for axis, table in ((0, CODE_DR), (1, CODE_DC)):
+        deltas = np.empty(total, dtype=np.int64)
+        deltas[is_start] = starts[:, axis]
+        deltas[~is_start] = np.asarray(table, dtype=np.int64)[codes]
+
+        summed = np.cumsum(deltas)
+        carried = np.concatenate(([0], summed[offs[1:-1] - 1]))
+        coords.append(summed - np.repeat(carried, np.diff(offs)))
+
+    # ndarrays index like the sequences DecodedStrands declares
+    return DecodedStrands(coords[0], coords[1],
+                          offs)  # type: ignore[arg-type]
+
+
+def strands_in_bounds(decoded: DecodedStrands, num_rows: int,
+                      num_cols: int) -> list[bool]:
+    """
+    Decide, for every strand of a decoded batch, whether all of
+    its positions lie within a num_rows x num_cols board.
+    """
+    rows, cols, offsets = decoded
+    if np is not None and isinstance(rows, np.ndarray):
+        inside = ((rows >= 0) & (rows < num_rows)
+                  & (cols >= 0) & (cols < num_cols))
+        # every strand has at least its start, so no empty segments
+        return np.logical_and.reduceat(
+            inside, np.asarray(offsets[:-1])).tolist()
+
+    results = []
+    for i in range(len(offsets) - 1):
+        results.append(all(0 <= rows[j] < num_rows and 0 <= cols[j] < num_cols
+                           for j in range(offsets[i], offsets[i + 1])))
+
+    return results
+
+
+def cell_flags(cells: Sequence[int], num_rows: int, num_cols: int) -> int:
+    """
+    Check a path of adjacent cells on a num_rows x num_cols grid.
+    Time and memory grow with the length of the path, not the size
+    of the grid.
+
+    Inputs:
+        cells (Sequence[int]): the cell indices r * num_cols + c
+        num_rows (int): grid height
+        num_cols (int): grid width
+
+    Returns (int): CYCLIC if a cell repeats, plus FOLDED if two
+        diagonal steps cross each other
+    """
+    flags = 0
+    seen: set[int] = set()
+    # diagonal steps taken, keyed (min cell, max cell)
+    diagonals: set[tuple[int, int]] = set()
+    prev = -1
+    for cell in cells:
+        if cell in seen:
+            flags |= CYCLIC
+        seen.add(cell)
+        if prev >= 0 and cell // num_cols != prev // num_cols \
+                and cell % num_cols != prev % num_cols:
+            lo, hi = min(prev, cell), max(prev, cell)
+            # the other diagonal of the same 2x2 square
+            if hi - lo == num_cols + 1:
+                cross = (lo + 1, hi - 1)
+            else:
+                cross = (lo - 1, hi + 1)
+            if cross in diagonals:
+                flags |= FOLDED
+            diagonals.add((lo, hi))
+        prev = cell
+
+    return flags
@@ -0,0 +1,159 @@
+"""
+Bulk replay of game event logs.
+
+replay rebuilds a game from its EventLog, with no sounds and no
+printing, feeding runs of consecutive submits through submit_many.
+replay_many does the same for many logs and reports the throughput.
+
+To benchmark, run <src/replay.py>, which records random sessions on
+every board and replays them, checking that each replayed game ends
+in the same state as the original.
+"""
+import random
+import time
+from typing import Iterable, NamedTuple
+
+import click
+
+from base import Step
+from boardspec import BoardSpec, load_catalog, spec_by_digest
+from events import EventLog, EVENT_SUBMIT
+from strands import Pos, Strand, StrandsGame
+
+# replays with at least this many submits per run use submit_many
+SUBMIT_BATCH_MIN = 2
+
+
+class ReplayStats(NamedTuple):
+    """
+    Totals for a bulk replay.
+    """
+
+    games: int
+    events: int
+    seconds: float
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.seconds if self.seconds else 0.0
+
+
+def replay(log: EventLog, spec: BoardSpec | None = None) -> StrandsGame:
+    """
+    Re-run a game from its event log, silently.
+
+    Inputs:
+        log (EventLog): the moves to replay
+        spec (BoardSpec | None): the board, by default the one
+            loaded earlier in this process with the logged hash
+
+    Returns (StrandsGame): the game after the last event
+    """
+    if spec is None:
+        spec = spec_by_digest(log.digest)
+    game = StrandsGame.from_spec(spec, log.hint_threshold)
+    game.quiet = True
+
+    batch: list[Strand] = []
+    for tag, r, c, packed in log.events():
+        if tag == EVENT_SUBMIT:
+            batch.append(Strand.from_packed(r, c, packed, game.game_board))
+            continue
+
+        _flush(game, batch)
+        game.use_hint()
+    _flush(game, batch)
+
+    return game
+
+
+def _flush(game: StrandsGame, batch: list[Strand]) -> None:
+    """
+    Submit and clear a run of logged strands.
+    """
+    if len(batch) >= SUBMIT_BATCH_MIN:
+        game.submit_many(batch)
+    elif batch:
+        game.submit_strand(batch[0])
+    batch.clear()
+
+
+def replay_many(logs: Iterable[EventLog]) -> ReplayStats:
+    """
+    Replay many event logs and time it.
+
+    Returns (ReplayStats): games and events replayed, and the time
+    """
+    games = 0
+    events = 0
+    start = time.perf_counter()
+    for log in logs:
+        replay(log)
+        games += 1
+        events += len(log)
+
+    return ReplayStats(games, events, time.perf_counter() - start)
+
+
+def record_random_session(spec: BoardSpec, num_events: int,
+                          rng: random.Random,
+                          hint_rate: float = 0.01) -> StrandsGame:
+    """
+    Play num_events random moves on a board, silently: mostly random
+    walks, some answers, and hint requests at hint_rate.
+
+    Returns (StrandsGame): the game, with its event log
+    """
+    game = StrandsGame.from_spec(spec)
+    game.quiet = True
+    steps = list(Step)
+    answers = game.answers()
+    for _ in range(num_events):
+        roll = rng.random()
+        if roll < hint_rate:
+            # hints are only defined while answers are left
+            if not game.game_over():
+                game.use_hint()
+        elif roll < 0.05:
+            game.submit_strand(rng.choice(answers)[1])
+        else:
+            start = Pos(rng.randrange(spec.num_rows),
+                        rng.randrange(spec.num_cols))
+            game.submit_strand(Strand(start, rng.choices(
+                steps, k=rng.randrange(1, 7))))
+
+    return game
+
+
+@click.command()
+@click.option("-n", "--events", "num_events", type=int, default=20000,
+              help="Events recorded per board.")
+@click.option("-s", "--seed", type=int, default=0, help="Random seed.")
+def cmd(num_events: int, seed: int) -> None:
+    """
+    Record random sessions on every board, then replay them all.
+    """
+    rng = random.Random(seed)
+    originals = []
+    start = time.perf_counter()
+    for spec in load_catalog().values():
+        originals.append(record_random_session(spec, num_events, rng))
+    recorded = time.perf_counter() - start
+
+    logs = [EventLog.from_bytes(game.event_log.to_bytes())
+            for game in originals]
+    stats = replay_many(logs)
+
+    for game, log in zip(originals, logs):
+        if replay(log).to_bytes() != game.to_bytes():
+            raise SystemExit(f"replay diverged on {log.digest}")
+
+    log_bytes = sum(len(log.to_bytes()) for log in logs)
+    print(f"Recorded {stats.events} events on {stats.games} boards "
+          f"in {recorded:.2f}s ({log_bytes} bytes of logs)")
+    print(f"Replayed in {stats.seconds:.2f}s: "
+          f"{stats.events_per_second:,.0f} events/s")
+
+
+if __name__ == "__main__":
+    cmd()
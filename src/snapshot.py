@@ -0,0 +1,127 @@
+"""
+Compact binary snapshots of a game session.
+
+StrandsGame.to_bytes and StrandsGame.from_bytes persist a session
+between requests without pickling its lists of (word, Strand) tuples.
+A Snapshot is the decoded form of the bytes: the magic, a version
+byte and the raw SHA-1 of the board file, then unsigned varints for
+the hint threshold, the flags, the hint state and word, the found
+answers, every guess and the new-guess count, then the event log
+(see events.py) behind its length.
+"""
+import struct
+from typing import NamedTuple
+
+from events import EventLog, put_varint, get_varint
+
+SNAPSHOT_MAGIC = b"STSS"
+SNAPSHOT_VERSION = 2
+SNAPSHOT_HEADER = struct.Struct("<4sB20s")
+
+# hint_state values in snapshots
+HINT_STATES: tuple[bool | None, ...] = (None, False, True)
+
+# a guess: answer index, or -1 for a dictionary guess followed by
+# its start row, start column and packed steps
+SnapshotGuess = tuple[int, int, int, int]
+
+
+class Snapshot(NamedTuple):
+    """
+    The session state of a game on the board with content hash
+    digest, with answers and guesses as indices and packed strands.
+    """
+
+    digest: str
+    hint_thresh: int
+    shown_hint_msg: bool
+    show_mode: bool
+    hint_state: bool | None
+    # index of the hint word among the answers
+    hint_index: int
+    # answer indices, in found order
+    found_order: tuple[int, ...]
+    guesses: tuple[SnapshotGuess, ...]
+    # new_game_guesses is always the tail of the dictionary guesses
+    num_new: int
+    event_log: EventLog
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the snapshot, see the module docstring.
+        """
+        out = bytearray(SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, bytes.fromhex(self.digest)))
+
+        put_varint(out, self.hint_thresh)
+        put_varint(out, self.shown_hint_msg | self.show_mode << 1)
+        put_varint(out, HINT_STATES.index(self.hint_state))
+        put_varint(out, self.hint_index)
+
+        put_varint(out, len(self.found_order))
+        for ind in self.found_order:
+            put_varint(out, ind)
+
+        put_varint(out, len(self.guesses))
+        for asw_ind, r, c, packed in self.guesses:
+            if asw_ind >= 0:
+                # odd tags are answers
+                put_varint(out, asw_ind << 1 | 1)
+            else:
+                put_varint(out, 0)
+                put_varint(out, r)
+                put_varint(out, c)
+                put_varint(out, packed)
+        put_varint(out, self.num_new)
+
+        log = self.event_log.to_bytes()
+        put_varint(out, len(log))
+
+        return bytes(out + log)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Snapshot":
+        """
+        Inverse of to_bytes.
+
+        Raises ValueError if data is not a snapshot of this version,
+        or its event log is for a different board.
+        """
+        magic, version, raw_digest = SNAPSHOT_HEADER.unpack_from(data, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("not a game snapshot")
+
+        pos = SNAPSHOT_HEADER.size
+        hint_thresh, pos = get_varint(data, pos)
+        flags, pos = get_varint(data, pos)
+        hint_state, pos = get_varint(data, pos)
+        hint_index, pos = get_varint(data, pos)
+
+        num_found, pos = get_varint(data, pos)
+        found_order = []
+        for _ in range(num_found):
+            ind, pos = get_varint(data, pos)
+            found_order.append(ind)
+
+        num_guesses, pos = get_varint(data, pos)
+        guesses = []
+        for _ in range(num_guesses):
+            tag, pos = get_varint(data, pos)
+            if tag & 1:
+                guesses.append((tag >> 1, 0, 0, 0))
+                continue
+
+            r, pos = get_varint(data, pos)
+            c, pos = get_varint(data, pos)
+            packed, pos = get_varint(data, pos)
+            guesses.append((-1, r, c, packed))
+
+        num_new, pos = get_varint(data, pos)
+        log_size, pos = get_varint(data, pos)
+        event_log = EventLog.from_bytes(data[pos:pos + log_size])
+        if event_log.digest != raw_digest.hex():
+            raise ValueError("event log is for a different board")
+
+        return cls(raw_digest.hex(), hint_thresh, bool(flags & 1),
+                   bool(flags & 2), HINT_STATES[hint_state], hint_index,
+                   tuple(found_order), tuple(guesses), num_new, event_log)
@@ -16,7 +16,7 @@ https://stackoverflow.com/questions/8508799/bit-masking-in-python
 
 
 For the Solver given answer strings:
-- Use a Trie object to efficiently compare all possible word combinations in 
+- Use a trie to efficiently compare all possible word combinations in 
 board with all dictionary words, return all the matches.
 - Convert each possible word into a strand
 - Compare with answer strings and find matching strands to solve the board. 
@@ -52,7 +52,12 @@ theme words.
 import click
 import spacy
 from strands import Pos, Board, Strand, Step
-from typing import Optional, List, Dict, Set
+from lexicon import (LexiconBase, load_lexicon, load_frequencies, load_trie,
+                     WEB2_PATH, FREQ_PATH)
+from automaton import PrefixAutomaton
+from paths import unpack_steps
+from bisect import bisect_left
+from typing import List, Dict, Set, Mapping
 
 @click.command()
 @click.option("-t", "--type", required=False, help="Use General Solver")
@@ -98,45 +103,6 @@ PERMS = {(-1, -1): Step.NW,
         (1, 0): Step.S, 
         (1, 1): Step.SE}
 
-class TrieNode:
-    """
-    Node for Trie class. Stores a character and all unique characters that come
-    after the character in a set of words. 
-    """
-    children: dict[str, "TrieNode"]
-    char: Optional[str]
-    is_end: bool
-
-    def __init__(self, char: Optional[str]=None):
-        self.children = {}
-        self.char = char
-        self.is_end = False
-
-class Trie:
-    """
-    Root of the Trie. Stores tree nodes that describe the words in a certain set
-    of words. Each node has a unique character and a dictionary of unique 
-    characters that may come after it in any given word. 
-    """
-
-    root: TrieNode
-
-    def __init__(self) -> None:
-        self.root = TrieNode()
-
-    def add(self, word: str) -> None:
-        """
-        Add a word to the Trie. 
-        """
-        node = self.root
-
-        for char in word:
-            if char not in node.children:
-                node.children[char] = TrieNode(char)
-            node = node.children[char]
-        
-        node.is_end = True    
-            
 class Mask:
     """
     FOR GENERAL SOLVER. Integer mask intended to represent a typical strands 
@@ -201,28 +167,6 @@ class Mask:
         return new_mask
 
 
-class HashPos(Pos):
-    """
-    FOR GENERAL SOLVER. Child class of Pos to make it hashable. 
-    """
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, Pos):
-            raise NotImplementedError
-        
-        return other.c == self.c and other.r == self.r
-    
-    def __hash__(self) -> int:
-        return hash((self.r, self.c))
-
-
-class HashStrand(Strand):
-    """
-    FOR GENERAL SOLVER. Child class of Strand to make it hashable.
-    """
-
-    def __hash__(self) -> int:
-        return hash((self.start, tuple(self.steps)))
-    
 class Solver:
     """
     Solver class. Supports solving any board for two cases:
@@ -240,8 +184,11 @@ class Solver:
     board_lst: list[list[str]]
     answers: list[str]
     board: Board
-    filtered: list[HashStrand]
-    dictionary: list[str]
+    filtered: list[Strand]
+    dictionary: LexiconBase
+    # shared, memory-mapped trie of the lowercase dictionary words
+    trie: PrefixAutomaton
+    frequency_chart: Mapping[str, int]
     cols: int
     rows: int
     nlp: spacy.Language
@@ -277,17 +224,11 @@ class Solver:
             word = full[0].lower()
             answers.append(word)
 
-        # get word list --> to be put in Trie. 
-        with open("assets/web2.txt", encoding="utf-8") as f:
-            word_dictionary = [line.strip().lower() for line in f.readlines()]
+        # get shared word list --> to be put in Trie. 
+        word_dictionary = load_lexicon(WEB2_PATH).lower()
 
-        # get frequecy chart of top 50k words
-        frequency_chart = {}
-        with open("assets/en_50k.txt", encoding="utf-8") as f:
-            for line in f.readlines():
-                lst = line.split()
-                if len(lst[0]) > 3:
-                    frequency_chart[lst[0]] = int(lst[1])
+        # get shared frequecy chart of top 50k words
+        frequency_chart = load_frequencies(FREQ_PATH)
 
         self.game_file = game_file
         self.dictionary = word_dictionary
@@ -296,13 +237,14 @@ class Solver:
         self.answers = answers
         self.filtered = []
         self.board = Board(board_lst)
+        self.trie = load_trie(WEB2_PATH)
         self.cols = len(board_lst[0])
         self.rows = len(board_lst)
         self.board_size = self.cols * self.rows
         self.nlp = spacy.load("en_core_web_md")
 
     def convert_to_strand(self,
-raw: dict[str, tuple[tuple[int, int], tuple[Step, ...]]]) -> list[HashStrand]:
+raw: dict[str, tuple[tuple[int, int], tuple[Step, ...]]]) -> list[Strand]:
         """
         GIven a dictionary of a word and its raw strand representation, convert
         it into a list of Strands
@@ -312,7 +254,7 @@ raw: dict[str, tuple[tuple[int, int], tuple[Step, ...]]]) -> list[HashStrand]:
         for word in raw.values():
             start, steps = word
             r, c = start
-            all_strands.append(HashStrand(HashPos(r, c), list(steps)))
+            all_strands.append(Strand(Pos(r, c), list(steps)))
 
         return all_strands
     
@@ -321,63 +263,64 @@ raw: dict[str, tuple[tuple[int, int], tuple[Step, ...]]]) -> list[HashStrand]:
         """
         Given a game file, returns a list of all of the valid words found in
         the game file. Words will be represented by the Strand class. 
-        """
 
-        # for efficient sorting, we can stop when a prefix fails to match
-        trie = Trie()
-        for word in self.dictionary:
-            trie.add(word)
+        Iterative version of the original recursive search (see
+        solverbench.py), with the same result in the same order: for each word, the first path the depth first
+        search reaches, starting from cells in row-major order and trying
+        neighbors in PERMS order. Cells are board indices, the visited
+        cells an integer mask and the steps taken a packed integer, and
+        the neighbors of each cell come from the board's precomputed
+        tables, which list them in PERMS order.
+        """
+        trie = self.trie
+        offsets = trie.offsets
+        labels = trie.labels
+        targets = trie.targets
+        finals = trie.finals
+        flat_letters = self.board.flat_letters
+        cell_neighbors = self.board.cell_neighbors
+        cell_steps = self.board.cell_steps
+        cols = self.cols
 
-        # set of all words
         all_words = {}
-        # keep track of which node we have been to
-        visited = [[False] * self.cols for _ in range(self.rows)]
+        for start in range(self.rows * cols):
+            # a cell is entered once its letter continues some word
+            state = trie.step(0, flat_letters[start])
+            if state < 0:
+                continue
+            stack = [(start, state, 1 << start, flat_letters[start], 1)]
+
+            while stack:
+                ind, state, visited, path, packed = stack.pop()
+
+                # take all words > 2 len
+                if (finals[state >> 3] >> (state & 7) & 1 and len(path) > 2
+                        and path not in all_words):
+                    all_words[path] = ((start // cols, start % cols),
+                                       tuple(unpack_steps(packed)))
+
+                lo = offsets[state]
+                hi = offsets[state + 1]
+                if lo == hi:
+                    continue
+
+                # pushed in reverse, so popped in PERMS order
+                nbrs = cell_neighbors[ind]
+                codes = cell_steps[ind]
+                for i in range(len(nbrs) - 1, -1, -1):
+                    w = nbrs[i]
+                    if visited >> w & 1:
+                        continue
+                    lett = flat_letters[w]
+                    j = bisect_left(labels, ord(lett), lo, hi)
+                    if j < hi and labels[j] == ord(lett):
+                        stack.append((w, targets[j], visited | 1 << w,
+                                      path + lett, packed << 3 | codes[i]))
 
-        
-        def all_words_dfs(r: int, c: int, node: TrieNode, 
-            path: str, start: tuple[int, int], steps: tuple[Step, ...]) -> None:
-            """
-            Helper function for all_words. Recursively traverses a game board
-            in the form of a list until every letter has been visited. 
-            """
-            # take all words > 2 len
-            if node.is_end:
-                if len(path) > 2:
-                    if path not in all_words:
-                        all_words[path] = (start, steps[:-1])
-
-            # double check indices and if we've been here
-            if not (0 <= r < self.rows and 0 <= c < self.cols):
-                return None
-            if visited[r][c]:
-                return None
-            # assign letter, end search if not a word
-            letter = self.board_lst[r][c]
-            if letter not in node.children:
-                return None
-            # update tracker
-            visited[r][c] = True
-            # recurse to children, track start and steps
-            for perm in PERMS.keys():
-                nr, nc = perm
-                if 0 <= (r + nr) < self.rows and 0 <= (c + nc) < self.cols:
-                    new_steps = steps + (PERMS[(nr, nc)],) # immutable tuple
-                    all_words_dfs(r + nr, c + nc, node.children[letter], 
-                                  path + letter, start, new_steps)
-
-            # reset when moving to next word
-            visited[r][c] = False
-
-        # run dfs through each letter on board
-        for r in range(self.rows):
-            for c in range(self.cols):
-                all_words_dfs(r, c, trie.root, "", (r, c), ())
-        
         return all_words
 
-    
     def sort_words(self, raw_words: dict[str, tuple[tuple[int, int],
-                                        tuple[Step, ...]]]) -> list[HashStrand]:
+                                        tuple[Step, ...]]]) -> list[Strand]:
         """
         Filtering function for all collected words. Uses a frequency score, 
         cuts words that are too short or too long. Then turns words into strands
@@ -386,7 +329,7 @@ raw: dict[str, tuple[tuple[int, int], tuple[Step, ...]]]) -> list[HashStrand]:
         # sort words that only are the top 50k in english dictionary. 
         top_50k = {}
         for word in raw_words.keys():
-            if word in self.frequency_chart and self.frequency_chart[word] >200:
+            if len(word) > 3 and self.frequency_chart.get(word, 0) > 200:
                 top_50k[word] = raw_words[word]
         # pop words that are too long
         for word in list(top_50k.keys()):
@@ -397,8 +340,7 @@ raw: dict[str, tuple[tuple[int, int], tuple[Step, ...]]]) -> list[HashStrand]:
         all_strands = self.convert_to_strand(top_50k)
         
         # remove invalid strands
-        filtered = list(filter(lambda x: not (x.is_cyclic() or x.is_folded()),
-                                all_strands))
+        filtered = self.board.valid_strands(all_strands)
         
         # NEW: Sort by theme similarity and length
         filtered.sort(key=lambda s: (self.get_theme_similarity(self.board.evaluate_strand(s)), len(s.positions())), reverse=True)
@@ -408,7 +350,7 @@ raw: dict[str, tuple[tuple[int, int], tuple[Step, ...]]]) -> list[HashStrand]:
         return filtered
     
     def get_answer_strands(self, 
-                    all_strands: list[HashStrand]) -> dict[str, HashStrand]:
+                    all_strands: list[Strand]) -> dict[str, Strand]:
         """
         For a solver implementation that assumes the solver knows each answer
         word string, but does not know it's starting position or steps.
@@ -426,7 +368,7 @@ raw: dict[str, tuple[tuple[int, int], tuple[Step, ...]]]) -> list[HashStrand]:
 
         return found_answers
 
-    def show_general_result(self) -> List[Dict[str, HashStrand]]:
+    def show_general_result(self) -> List[Dict[str, Strand]]:
         """
         Function that obtains current result from using the general solver.
         """
@@ -512,7 +454,7 @@ raw: dict[str, tuple[tuple[int, int], tuple[Step, ...]]]) -> list[HashStrand]:
                 steps_str = " ".join([s.value for s in self.get_answer_strands(self.convert_to_strand(self.all_words()))[key].steps])
                 new.write(f"{key} {r+1} {c+1} {steps_str}\n")
 
-    def find_spangrams(self, strands: List[HashStrand]) -> List[HashStrand]:
+    def find_spangrams(self, strands: List[Strand]) -> List[Strand]:
         """
         Identifies strands that are potential spangrams.
         A spangram touches two opposite edges of the board.
@@ -543,7 +485,7 @@ raw: dict[str, tuple[tuple[int, int], tuple[Step, ...]]]) -> list[HashStrand]:
             return 0.0
         return theme_doc.similarity(word_doc)
 
-    def solve_with_dlx(self, strands: List[HashStrand]) -> List[List[HashStrand]]:
+    def solve_with_dlx(self, strands: List[Strand]) -> List[List[Strand]]:
         """
         Solves the exact cover problem using DLX.
         """
@@ -0,0 +1,132 @@
+"""
+Benchmark for the solver's board-word search.
+
+Solver.all_words is an iterative search over cell indices, with an
+integer visited mask and the board's precomputed neighbor tables.
+all_words_recursive below is the original recursive search it
+replaced, which kept a 2D visited list, tried every direction of
+PERMS at each cell and built a new steps tuple per edge.
+
+To time both on every board in boards/, checking that they find the
+same words with the same paths, run <src/solverbench.py>.
+"""
+import os
+import time
+from functools import partial
+from typing import Callable
+
+import click
+
+from base import Step
+from boardspec import BOARDS_DIR
+from solver import PERMS, Solver
+
+# word -> (start row and column, steps), as returned by all_words
+RawWords = dict[str, tuple[tuple[int, int], tuple[Step, ...]]]
+
+
+def best_time(search: Callable[[], object], repeat: int) -> float:
+    """
+    Return the fastest of repeat runs of search, in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        search()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def all_words_recursive(solver: Solver) -> RawWords:
+    """
+    The solver's original recursive all_words, kept as the reference
+    that Solver.all_words is checked and benchmarked against.
+    """
+    trie = solver.trie
+    rows = solver.rows
+    cols = solver.cols
+
+    # set of all words
+    all_words: RawWords = {}
+    # keep track of which node we have been to
+    visited = [[False] * cols for _ in range(rows)]
+
+    # kept as originally written, arguments and all
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def all_words_dfs(r: int, c: int, state: int, path: str,
+                      start: tuple[int, int],
+                      steps: tuple[Step, ...]) -> None:
+        """
+        Recursively traverses a game board in the form of a list until
+        every letter has been visited.
+        """
+        # take all words > 2 len
+        if trie.is_final(state):
+            if len(path) > 2:
+                if path not in all_words:
+                    all_words[path] = (start, steps[:-1])
+
+        # double check indices and if we've been here
+        if not (0 <= r < rows and 0 <= c < cols):
+            return None
+        if visited[r][c]:
+            return None
+        # assign letter, end search if not a word
+        letter = solver.board_lst[r][c]
+        child = trie.step(state, letter)
+        if child < 0:
+            return None
+        # update tracker
+        visited[r][c] = True
+        # recurse to children, track start and steps
+        for (nr, nc), step in PERMS.items():
+            if 0 <= (r + nr) < rows and 0 <= (c + nc) < cols:
+                all_words_dfs(r + nr, c + nc, child, path + letter, start,
+                              steps + (step,))
+
+        # reset when moving to next word
+        visited[r][c] = False
+        return None
+
+    # run dfs through each letter on board
+    for r in range(rows):
+        for c in range(cols):
+            all_words_dfs(r, c, 0, "", (r, c), ())
+
+    return all_words
+
+
+@click.command()
+@click.option("-b", "--boards", "board_dir", default=BOARDS_DIR,
+              help="Directory of game files.")
+@click.option("-r", "--repeat", type=int, default=3,
+              help="Runs per board; the fastest counts.")
+def cmd(board_dir: str, repeat: int) -> None:
+    """
+    Time all_words against all_words_recursive on every board.
+    """
+    total_new = 0.0
+    total_old = 0.0
+    boards = 0
+    for file in sorted(os.listdir(board_dir)):
+        if not file.endswith(".txt"):
+            continue
+        solver = Solver(os.path.join(board_dir, file))
+
+        if solver.all_words() != all_words_recursive(solver):
+            raise SystemExit(f"all_words differs on {file}")
+        new = best_time(solver.all_words, repeat)
+        old = best_time(partial(all_words_recursive, solver), repeat)
+        print(f"{file:40} {old * 1000:8.1f}ms -> {new * 1000:7.1f}ms "
+              f"({old / new:.1f}x)")
+        total_new += new
+        total_old += old
+        boards += 1
+
+    print(f"{boards} boards: {total_old:.2f}s -> {total_new:.2f}s "
+          f"({total_old / total_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    cmd()
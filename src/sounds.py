@@ -0,0 +1,117 @@
+"""
+Preloaded sound effects for the GUI-SOUND enhancement.
+
+Decoding an .ogg file takes long enough to be noticeable on every
+click, so a SoundBank decodes every sound in assets/ once, in a
+background thread, and then plays the cached pygame Sound objects
+on a fixed pool of mixer channels.
+"""
+import glob
+import os
+import threading
+
+import pygame
+
+from audio import AudioSink
+
+SOUNDS_DIR = "assets"
+NUM_CHANNELS = 8
+
+
+class SoundBank(AudioSink):
+    """
+    Cache of decoded sounds keyed by file name without extension,
+    e.g. "click_005" for assets/click_005.ogg.
+    """
+
+    sounds_dir: str
+    sounds: dict[str, pygame.mixer.Sound]
+    _loaded: threading.Event
+    _thread: threading.Thread | None
+
+    def __init__(self, sounds_dir: str = SOUNDS_DIR,
+                 num_channels: int = NUM_CHANNELS, background: bool = True):
+        """
+        Start decoding every .ogg file in sounds_dir. The mixer is
+        initialized if needed and given num_channels channels.
+
+        Inputs:
+            sounds_dir (str): directory holding the .ogg files
+            num_channels (int): number of sounds that can overlap
+            background (bool): decode in a daemon thread if True,
+                otherwise decode before returning
+        """
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        pygame.mixer.set_num_channels(num_channels)
+
+        self.sounds_dir = sounds_dir
+        self.sounds = {}
+        self._loaded = threading.Event()
+        self._thread = None
+
+        if background:
+            self._thread = threading.Thread(target=self._load, daemon=True)
+            self._thread.start()
+        else:
+            self._load()
+
+    def _load(self) -> None:
+        """
+        Decode all sounds, then mark the bank as loaded.
+        """
+        try:
+            paths = sorted(glob.glob(os.path.join(self.sounds_dir, "*.ogg")))
+            for path in paths:
+                name = os.path.splitext(os.path.basename(path))[0]
+                self.sounds[name] = pygame.mixer.Sound(path)
+        finally:
+            # never leave callers of get() waiting on a failed load
+            self._loaded.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Wait until every sound has been decoded.
+
+        Returns (bool): True if loading finished within timeout
+        """
+        return self._loaded.wait(timeout)
+
+    def get(self, name: str) -> pygame.mixer.Sound:
+        """
+        Return the decoded sound for name, waiting for the
+        background load to finish if needed.
+
+        Raises KeyError if there is no such sound.
+        """
+        if name not in self.sounds:
+            self.wait()
+
+        return self.sounds[name]
+
+    def play(self, name: str) -> None:
+        """
+        Play a sound on a free channel. If every channel is busy,
+        the one that has been playing the longest is cut off.
+        """
+        sound = self.get(name)
+        channel = pygame.mixer.find_channel(True)
+        if channel is not None:
+            channel.play(sound)
+
+
+_SOUND_BANK: SoundBank | None = None
+_SOUND_BANK_LOCK = threading.Lock()
+
+
+def sound_bank() -> SoundBank:
+    """
+    Return the process-wide sound bank, starting it on first use.
+    """
+    global _SOUND_BANK
+
+    with _SOUND_BANK_LOCK:
+        if _SOUND_BANK is None:
+            _SOUND_BANK = SoundBank()
+
+        return _SOUND_BANK
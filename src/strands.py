@@ -1,10 +1,34 @@
 """
-Game logic for Milestone 2:
-Pos, StrandFake, BoardFake, StrandsGameFake
+Game logic: Pos, Strand, Board and StrandsGame.
+
+Board files are parsed in boardspec.py. A game's event log is in
+events.py, its guess cache in guesscache.py, its session snapshots in
+snapshot.py and the word index of its board in wordindex.py.
 """
-import pygame
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable, Sequence, TypeVar
 
 from base import PosBase, StrandBase, BoardBase, StrandsGameBase, Step
+from lexicon import (LexiconBase, BoardLexicon, load_lexicon, board_lexicon,
+                     prefix_automaton, WEB2_PATH)
+from automaton import PrefixAutomaton
+from audio import AudioSink, NullAudioSink
+from events import EventLog
+from guesscache import (GUESS_TOO_SHORT, GUESS_DICTIONARY, GUESS_NOT_A_WORD,
+                        GUESS_OFF_BOARD, GuessCache, strand_key)
+from snapshot import Snapshot
+from boardspec import BoardSpec, board_spec, read_board_spec, spec_by_digest
+from wordindex import PackedPath, WordIndex
+from paths import (STEP_DELTAS, DELTA_STEPS, STEP_CODES, CYCLIC, FOLDED,
+                   pack_steps,
+                   unpack_steps, cell_flags, decode_strands,
+                   strands_in_bounds, np)
+
+# any kind of strand, for filters that return what they are given
+S = TypeVar("S", bound=StrandBase)
 
 
 class Pos(PosBase):
@@ -13,62 +37,46 @@ class Pos(PosBase):
     row and column integers. Position (0, 0) corresponds to
     the top-left corner of a board, and row and column
     indices increase down and to the right, respectively.
+
+    Positions are immutable and hashable, so they can be used
+    directly in sets and as dict keys. Constructing a position
+    always makes a new object; each Board hands out one shared
+    position per cell through cells, pos_at and shared_positions
+    instead.
     """
 
-    # may look back at this versus old version
-    def take_step(self, step: Step) -> PosBase:
+    def __init__(self, r: int, c: int) -> None:
+        # PosBase.__init__ would assign through __setattr__, which
+        # forbids changes, so set the fields directly
+        # pylint: disable=super-init-not-called
+        object.__setattr__(self, "r", r)
+        object.__setattr__(self, "c", c)
 
-        c = self.c
-        r = self.r
-
-
-          # value method from official python website Enum documentation
-        if step == step.W:
-            c -= 1
-        elif step == step.E:
-            c += 1
-        elif step == step.N:
-            r -= 1
-        elif step == step.S:
-            r += 1
-        elif step == step.NE:
-            r -= 1
-            c += 1
-        elif step == step.NW:
-            r -= 1
-            c -= 1
-        elif step == step.SE:
-            r += 1
-            c += 1
-        else:
-            r += 1
-            c -= 1
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("Pos is immutable")
 
-        return Pos(r, c)
+    def __eq__(self, other: object) -> bool:
+        # board cells are shared, so this is the common case
+        if self is other:
+            return True
 
-    def step_to(self, other: PosBase) -> Step:
-        if self == other:
-            raise ValueError
+        return super().__eq__(other)
 
-        r_dist = self.r - other.r
-        c_dist = self.c - other.c
+    def __hash__(self) -> int:
+        return hash((self.r, self.c))
 
-        if abs(r_dist) < 2 and abs(c_dist) < 2:
-            step = ""
+    def take_step(self, step: Step) -> PosBase:
+        dr, dc = STEP_DELTAS[step]
 
-            if r_dist == -1:
-                step += "s"
-            elif r_dist == 1:
-                step += "n"
-            if c_dist == -1:
-                step += "e"
-            elif c_dist == 1:
-                step += "w"
+        return Pos(self.r + dr, self.c + dc)
 
-            # from official python website Enum documentation
-            return Step(step)
+    def step_to(self, other: PosBase) -> Step:
+        step = DELTA_STEPS.get((other.r - self.r, other.c - self.c))
+        if step is None:
+            # same position, or not adjacent
+            raise ValueError
 
-        raise ValueError
+        return step
 
     def is_adjacent_to(self, other: PosBase) -> bool:
         try:
@@ -78,70 +86,151 @@ class Pos(PosBase):
         except ValueError:
             return False
 
+
 class Strand(StrandBase):
     """
     Strands, represented as a start position
     followed by a sequence of steps.
+
+    Strands are treated as values: the positions, packed steps
+    and cell bitmasks are computed once and cached, so the start
+    and steps must not be changed after construction.
     """
-    def positions(self) -> list[PosBase]:
 
-        stack = []
-        stack.append(self.start)
-        position_list = [self.start]
+    _positions: tuple[PosBase, ...] | None
+    _packed_steps: int | None
+    _cell_masks: dict[int, int]
+    _check_flags: int | None
+
+    def __init__(self, start: PosBase, steps: list[Step]):
+        super().__init__(start, steps)
+        self._positions = None
+        self._packed_steps = None
+        self._cell_masks = {}
+        self._check_flags = None
+
+    @classmethod
+    def from_packed(cls, r: int, c: int, packed_steps: int,
+                    board: "Board | None" = None) -> "Strand":
+        """
+        Build a strand from its start row, column and packed steps.
+        If it lies within board, its positions are the board's shared
+        cell positions rather than new ones.
+        """
+        steps = unpack_steps(packed_steps)
+        positions = (board.shared_positions(r, c, steps)
+                     if board is not None else None)
+        strand = cls(positions[0] if positions else Pos(r, c), steps)
+        strand._packed_steps = packed_steps
+        strand._positions = positions
 
-        for step in self.steps:
-            start_pos = stack.pop()
-            new_pos = start_pos.take_step(step)
-            stack.append(new_pos)
-            position_list.append(new_pos)
+        return strand
 
-        return position_list
+    def packed_steps(self) -> int:
+        """
+        Return the steps packed into an integer (see pack_steps).
+        """
+        if self._packed_steps is None:
+            self._packed_steps = pack_steps(self.steps)
 
-    def is_cyclic(self) -> bool:
-        pos_lst = self.positions()
-        ind_lst = []
-        for pos in pos_lst:
-            ind_lst.append((pos.r, pos.c))
+        return self._packed_steps
 
-        # sets guarantee unique elements
-        if len(ind_lst) != len(set(ind_lst)):
-            return True
+    def _cached_positions(self) -> tuple[PosBase, ...]:
+        """
+        Walk the steps once and cache the resulting positions.
+        """
+        if self._positions is None:
+            # hashable copy of the start, whatever its class
+            r, c = self.start.r, self.start.c
+            position_list: list[PosBase] = [Pos(r, c)]
 
-        return False
+            for step in self.steps:
+                dr, dc = STEP_DELTAS[step]
+                r += dr
+                c += dc
+                position_list.append(Pos(r, c))
 
-    def is_folded(self) -> bool:
-        connections: set[tuple[tuple[int, int],
-                               tuple[int, int]]] = set()
-        pos_lst = self.positions()
+            self._positions = tuple(position_list)
+
+        return self._positions
 
-        for ind, pos in enumerate(pos_lst[:-1]):
-            end = pos_lst[ind + 1]
-            st = (pos.r, pos.c)
-            ed = (end.r, end.c)
+    def positions(self) -> list[PosBase]:
+        return list(self._cached_positions())
 
-            connections.add((st, ed))
+    def cell_mask(self, cols: int) -> int:
+        """
+        Compute the cells covered by the strand as a bitmask, with
+        the cell (r, c) as bit r * cols + c. Only meaningful when
+        every position lies within a board with cols columns.
+        """
+        mask = self._cell_masks.get(cols)
+        if mask is None:
+            mask = 0
+            for pos in self._cached_positions():
+                mask |= 1 << (pos.r * cols + pos.c)
+            self._cell_masks[cols] = mask
 
-        for st, ed in connections:
-            start = Pos(st[0], st[1])
-            stop = Pos(ed[0], ed[1])
-            # checking if diagonal connection
-            if start.step_to(stop) in {Step.NW, Step.SW, Step.NE, Step.SE}:
+        return mask
 
-                # two possible alternative diagonals
-                d_1 = (st[0], ed[1])
-                d_2 = (ed[0], st[1])
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Strand):
+            return (self.start.r == other.start.r
+                    and self.start.c == other.start.c
+                    and self.packed_steps() == other.packed_steps())
 
-                if (d_1, d_2) in connections or (d_2, d_1) in connections:
-                    return True
+        return super().__eq__(other)
 
-        return False
+    def __hash__(self) -> int:
+        return hash((self.start.r, self.start.c, self.packed_steps()))
+
+    def _flags(self) -> int:
+        """
+        Compute and cache cell_flags over the strand's bounding box,
+        which works wherever the strand lies.
+        """
+        if self._check_flags is None:
+            pos_lst = self._cached_positions()
+            min_r = min(pos.r for pos in pos_lst)
+            min_c = min(pos.c for pos in pos_lst)
+            num_rows = max(pos.r for pos in pos_lst) - min_r + 1
+            num_cols = max(pos.c for pos in pos_lst) - min_c + 1
+
+            cells = [(pos.r - min_r) * num_cols + pos.c - min_c
+                     for pos in pos_lst]
+            self._check_flags = cell_flags(cells, num_rows, num_cols)
+
+        return self._check_flags
+
+    def is_cyclic(self) -> bool:
+        return bool(self._flags() & CYCLIC)
+
+    def is_folded(self) -> bool:
+        return bool(self._flags() & FOLDED)
 
 class Board(BoardBase):
     """
     Boards for the Strands game, consisting of a
     rectangular grid of letters.
+
+    Besides the letter grid, cells are numbered r * cols + c, and
+    the letters and neighbors are also stored flat by cell index,
+    so searches can run on integers without allocating positions.
     """
 
+    letters: list[list[str]]
+    cols: int
+    # letters flattened row by row, one character per cell index
+    flat_letters: str
+    # flyweight cell positions, indexed by r * cols + c
+    cells: tuple[Pos, ...]
+    # the neighbors of each cell, as cell indices in PERMS order
+    # (see solver.py); the only neighbor table, find_neighbors
+    # maps it to positions
+    cell_neighbors: tuple[tuple[int, ...], ...]
+    # the step code (see paths.STEP_CODES) from each cell to each
+    # of its neighbors, in cell_neighbors order
+    cell_steps: tuple[tuple[int, ...], ...]
+
     # accidently implemented check if letters valid
     def __init__(self, letters: list[list[str]]):
 
@@ -163,6 +252,26 @@ class Board(BoardBase):
                     raise ValueError
 
         self.letters = letters
+        self.cols = row_size
+        self.flat_letters = "".join("".join(row) for row in letters)
+
+        num_rows = len(letters)
+        self.cell_neighbors = tuple(
+            tuple((r + d_r) * row_size + c + d_c
+                  for d_r in (-1, 0, 1) for d_c in (-1, 0, 1)
+                  if ((d_r, d_c) != (0, 0)
+                      and 0 <= r + d_r < num_rows
+                      and 0 <= c + d_c < row_size))
+            for r in range(num_rows) for c in range(row_size))
+        self.cell_steps = tuple(
+            tuple(STEP_CODES[DELTA_STEPS[(j // row_size - i // row_size,
+                                          j % row_size - i % row_size)]]
+                  for j in nbrs)
+            for i, nbrs in enumerate(self.cell_neighbors))
+
+        # one position object per cell, flattened row by row
+        self.cells = tuple(Pos(r, c) for r in range(num_rows)
+                           for c in range(row_size))
 
     def num_rows(self) -> int:
         return len(self.letters)
@@ -170,65 +279,166 @@ class Board(BoardBase):
     def num_cols(self) -> int:
         return len(self.letters[0])
 
-    def get_letter(self, pos: PosBase) -> str:
+    def num_cells(self) -> int:
+        """
+        Return the number of cells, num_rows() * num_cols().
+        """
+        return len(self.flat_letters)
 
-        # converting to 0-indexing
-        if pos.r > self.num_rows() - 1 or pos.c > self.num_cols() - 1:
-            raise ValueError
-        if pos.r < 0 or pos.c < 0:
+    def cell_index(self, pos: PosBase) -> int:
+        """
+        Return the index r * num_cols() + c of a position.
+
+        Raises ValueError if the position is not within
+        the bounds of the board.
+        """
+        if not (0 <= pos.r < len(self.letters) and 0 <= pos.c < self.cols):
             raise ValueError
 
-        return self.letters[pos.r][pos.c]
+        return pos.r * self.cols + pos.c
+
+    def strand_cells(self, strand: StrandBase) -> list[int]:
+        """
+        Return the cell indices of a strand's positions, in order.
+
+        Raises ValueError if any of the strand's positions are not
+        within the bounds of the board.
+        """
+        num_rows = len(self.letters)
+        cols = self.cols
+        cells = []
+        for pos in strand.positions():
+            if not (0 <= pos.r < num_rows and 0 <= pos.c < cols):
+                raise ValueError
+            cells.append(pos.r * cols + pos.c)
+
+        return cells
+
+    def get_letter(self, pos: PosBase) -> str:
+        return self.flat_letters[self.cell_index(pos)]
+
+    def evaluate_cells(self, indices: Iterable[int]) -> str:
+        """
+        Spell out the letters at the given cell indices.
+        Indices are assumed to be within the board.
+        """
+        return "".join(map(self.flat_letters.__getitem__, indices))
 
     def evaluate_strand(self, strand: StrandBase) -> str:
-        msg = ""
-        pos_lst = strand.positions()
+        # ValueError covered by strand_cells()
+        return self.evaluate_cells(self.strand_cells(strand))
+
+    def cell_mask(self, strand: StrandBase) -> int:
+        """
+        Compute the set of cells covered by a strand as a bitmask,
+        where the cell (r, c) is bit r * num_cols() + c.
+
+        Raises ValueError if any of the strand's positions are not
+        within the bounds of the board.
+        """
+        cells = self.strand_cells(strand)
+
+        if isinstance(strand, Strand):
+            return strand.cell_mask(self.cols)
+
+        mask = 0
+        for ind in cells:
+            mask |= 1 << ind
+
+        return mask
+
+    def valid_strands(self, strands: Iterable[S]) -> list[S]:
+        """
+        Filter candidate strands in one pass, keeping those that are
+        neither cyclic nor folded. Every strand must lie within the
+        bounds of the board.
+
+        Inputs:
+            strands (Iterable[S]): the candidates
+
+        Returns (list[S]): the valid strands, in order
+        """
+        num_rows = len(self.letters)
+        cols = self.cols
+        valid = []
+        for strand in strands:
+            if not cell_flags(self.strand_cells(strand), num_rows, cols):
+                valid.append(strand)
+
+        return valid
+
+    def pos_at(self, r: int, c: int) -> Pos:
+        """
+        Return the single position object for the cell (r, c),
+        from the per-board table of cell positions.
+
+        Raises ValueError if (r, c) is not within the bounds
+        of the board.
+        """
+        if not (0 <= r < len(self.letters) and 0 <= c < self.cols):
+            raise ValueError
+
+        return self.cells[r * self.cols + c]
+
+    def shared_positions(self, r: int, c: int,
+                         steps: Sequence[Step]) -> tuple[Pos, ...] | None:
+        """
+        Walk steps from the cell (r, c) over the board's shared cell
+        positions.
+
+        Returns (tuple[Pos, ...] | None): the positions, or None if
+            the walk leaves the board
+        """
+        num_rows = len(self.letters)
+        cols = self.cols
+        if not (0 <= r < num_rows and 0 <= c < cols):
+            return None
 
-        for pos in pos_lst:
-            # ValueError covered by get_letter()
-            msg += self.get_letter(pos)
+        cells = self.cells
+        positions = [cells[r * cols + c]]
+        for step in steps:
+            dr, dc = STEP_DELTAS[step]
+            r += dr
+            c += dc
+            if not (0 <= r < num_rows and 0 <= c < cols):
+                return None
+            positions.append(cells[r * cols + c])
 
-        return msg
+        return tuple(positions)
 
-    def find_neighbors(self, pos: PosBase) -> set[tuple[int, int]]:
+    def find_neighbors(self, pos: PosBase) -> set[Pos]:
         """
         Helper function for the DICTIONARY-WORDS
         game enhancement. Given a valid board PosBase,
-        computes and returns neighboring position objects
-        in a list. These are purposely not in PosBase form
-        because this class does not support being in a set.
+        returns the positions of its neighboring cells,
+        looked up in a table precomputed for the board.
 
         Inputs:
             pos (PosBase): the board position to start
 
-        Returns (set[tuple[int, int]]): the positions of all neighbors
+        Returns (set[Pos]): the positions of all neighbors
         """
-        pos_r_nbs = [(pos.r + 1, pos.c), (pos.r - 1, pos.c)]
-        pos_c_nbs = [(pos.r, pos.c + 1), (pos.r, pos.c - 1)]
-        pos_diag_nbs = [(pos.r + 1, pos.c + 1), (pos.r + 1, pos.c - 1),
-                        (pos.r - 1, pos.c + 1), (pos.r - 1, pos.c - 1)]
-
-        row_count = self.num_rows()
-        col_count = self.num_cols()
+        cells = self.cells
+        return {cells[j]
+                for j in self.cell_neighbors[pos.r * self.cols + pos.c]}
 
-        if pos.r == row_count - 1:
-            del pos_r_nbs[0]
-        elif pos.r == 0:
-            del pos_r_nbs[1]
+# digest -> board, shared by the games built from the same spec
+_SPEC_BOARDS: dict[str, Board] = {}
 
-        if pos.c == col_count - 1:
-            del pos_c_nbs[0]
-        elif pos.c == 0:
-            del pos_c_nbs[1]
 
-        diags = []
-        for r, c in pos_diag_nbs:
-            if 0 <= r <= row_count - 1 and 0 <= c <= col_count - 1:
-                diags.append((r, c))
+def spec_board(spec: BoardSpec) -> Board:
+    """
+    Return the board for a spec, building it on first use. The
+    spec is already validated, and boards are never modified, so
+    every game on the same board shares one Board.
+    """
+    board = _SPEC_BOARDS.get(spec.digest)
+    if board is None:
+        board = Board([list(row) for row in spec.letters])
+        board = _SPEC_BOARDS.setdefault(spec.digest, board)
 
-        neighbors = set(pos_r_nbs + pos_c_nbs + diags)
+    return board
 
-        return neighbors
 
 class StrandsGame(StrandsGameBase):
     """
@@ -241,111 +451,199 @@ class StrandsGame(StrandsGameBase):
     game_board: Board
     game_answers: list[tuple[str, StrandBase]]
     game_file: str
+    spec: BoardSpec
     show_mode: bool
     sound_mode: bool
+    audio: AudioSink
     tot_game_guesses: list[tuple[str, StrandBase]]
+    # (word, start row, start col, packed steps) of dictionary guesses
+    dict_guess_keys: set[tuple[str, int, int, int]]
+    # state-independent classifications of recent guesses
+    guess_cache: GuessCache
+    # every submit and hint request made on this game, in order
+    event_log: EventLog
+    # if True, hint_meter never prints
+    quiet: bool
     hint_state: None | bool
     hint_word: str
     # guesses made after hint cleared
     new_game_guesses: list[tuple[str, StrandBase]]
-    word_dictionary: list[str]
-
-    def __init__(self, game_file: str | list[str], hint_threshold: int = 3):
-
-        # for relevant sound enhancements
-        pygame.mixer.init()
-
-        # process raw txt file
+    # found-state index: answer word -> answer index, bitmask of
+    # found answer indices, and found answer indices in found order
+    answer_index: dict[str, int]
+    # answer cell bitmasks, and cell bitmask -> answer index
+    answer_masks: list[int]
+    mask_index: dict[int, int]
+    found_mask: int
+    found_order: list[int]
+    # loaded on first use, see load_dictionary
+    _word_dictionary: LexiconBase | None
+    _board_words: BoardLexicon | None
+    _dictionary_lock: threading.Lock
+    dictionary_load_time: float | None
+    dictionary_load_hook: Callable[[float], None] | None
+
+    def __init__(self, game_file: str | list[str], hint_threshold: int = 3,
+                 audio: AudioSink | None = None):
+
+        # sound enhancements go through a pluggable sink, silent by
+        # default so that headless games never touch pygame
+        self.audio = audio if audio is not None else NullAudioSink()
+
+        # process raw txt file, or reuse its spec if seen before
         if isinstance(game_file, str):
             self.game_file = game_file
-            with open(game_file, encoding="utf-8") as f:
-                lines_lst: list[str] = [line.strip() for line in f.readlines()]
+            spec = read_board_spec(game_file)
         else:
-            lines_lst = [line.strip() for line in game_file]
+            # readlines() keeps the line breaks, splitlines() does not
+            spec = board_spec("\n".join(line.rstrip("\r\n")
+                                        for line in game_file))
 
-        self.game_theme = lines_lst[0]
-        # check if game theme exists:
-        if self.game_theme == "":
-            raise ValueError
+        self._setup(spec, hint_threshold)
 
-        self.hint_thresh = hint_threshold
-        self.shown_hint_msg = False
+    @classmethod
+    def from_spec(cls, spec: BoardSpec, hint_threshold: int = 3,
+                  audio: AudioSink | None = None,
+                  game_file: str | None = None) -> "StrandsGame":
+        """
+        Build a game from an already validated board spec, without
+        reading or checking a game file.
 
-        board_lst: list[list[str]] = []
+        Inputs:
+            spec (BoardSpec): the board
+            hint_threshold (int): as for the constructor
+            audio (AudioSink | None): as for the constructor
+            game_file (str | None): the file the spec came from, if
+                any, for the DICTIONARY-WORDS enhancement
 
-        # assumes one space before grid in valid file
-        for ind, r in enumerate(lines_lst[2:]):
-            if r == "":
-                board_stp = ind + 3
-                break
+        Returns (StrandsGame): a new game
+        """
+        game = cls.__new__(cls)
+        game.audio = audio if audio is not None else NullAudioSink()
+        if game_file is not None:
+            game.game_file = game_file
+        game._setup(spec, hint_threshold)
 
-            alph_lst = [alph.lower() for alph in r.split()]
-            board_lst.append(alph_lst)
+        return game
 
-        self.game_board = Board(board_lst) # updated to be board object
+    def _setup(self, spec: BoardSpec, hint_threshold: int) -> None:
+        """
+        Initialize the game state for a new game on a board.
+        """
+        self.spec = spec
+        self.game_theme = spec.theme
+        self.hint_thresh = hint_threshold
+        self.shown_hint_msg = False
+        self.game_board = spec_board(spec)
+
+        game_answers: list[tuple[str, StrandBase]] = [
+            (word, Strand.from_packed(r, c, packed, self.game_board))
+            for word, r, c, packed in spec.answers]
+
+        # word dictionary is only loaded once a guess needs it
+        self._word_dictionary = None
+        self._board_words = None
+        self._dictionary_lock = threading.Lock()
+        self.dictionary_load_time = None
+        self.dictionary_load_hook = None
+        self.game_answers = game_answers
+        self.answer_index = {}
+        for ind, (word, _) in enumerate(game_answers):
+            # first answer wins, matching the old linear scan
+            self.answer_index.setdefault(word, ind)
+        self.answer_masks = list(spec.answer_masks)
+        self.mask_index = {}
+        for ind, mask in enumerate(self.answer_masks):
+            self.mask_index.setdefault(mask, ind)
+        self.found_mask = 0
+        self.found_order = []
+        self.tot_game_guesses = []
+        self.dict_guess_keys = set()
+        self.guess_cache = GuessCache()
+        self.event_log = EventLog(spec.digest, hint_threshold)
+        self.quiet = False
+        self.hint_state = None
+        self.hint_word = self.game_answers[0][0]
+        self.new_game_guesses = []
 
-        game_answers: list[tuple[str, StrandBase]] = []
-        for ind, r in enumerate(lines_lst[board_stp:]):
-            if r == "":
-                break
+        # assume in Play mode
+        self.show_mode = False
 
-            steps: list[Step] = []
-            full = r.split()
-            word = full[0].lower()
+        # sounds enhancement
+        self.sound_mode = False
 
-            # adjusting to 0-indexing
-            start = Pos(int(full[1]) - 1, int(full[2]) - 1)
-            steps.extend([Step(dirc.lower()) for dirc in full[3:]])
+    @property
+    def word_dictionary(self) -> LexiconBase:
+        """
+        The shared web2.txt dictionary, loaded on first use.
+        """
+        if self._word_dictionary is None:
+            self.load_dictionary()
+        assert self._word_dictionary is not None
 
-            game_answers.append((word, Strand(start, steps)))
+        return self._word_dictionary
 
-        # game board and answer checks (board object already checks some)
+    @property
+    def board_words(self) -> BoardLexicon:
+        """
+        The dictionary words that can be spelled on game_board,
+        loaded on first use.
+        """
+        if self._board_words is None:
+            self.load_dictionary()
+        assert self._board_words is not None
 
-        # check if no space between theme and board
-        if self.game_board.letters == []:
-            raise ValueError
-        # check if no space between board and answers
-        if not game_answers:
-            raise ValueError
+        return self._board_words
 
-        tot_ans_len = 0
-        for answer in game_answers:
-            # check answer longer than three letters
-            if len(answer[0]) < 3:
-                raise ValueError
+    def load_dictionary(self) -> None:
+        """
+        Load the word dictionary and its board-scoped sub-lexicon,
+        if not loaded yet. This happens on the first submitted strand
+        that is not a theme word, or earlier through warm_dictionary.
+        Once loaded, the elapsed seconds are stored in
+        dictionary_load_time and passed to dictionary_load_hook.
+        """
+        with self._dictionary_lock:
+            if self._board_words is not None:
+                return
 
-            # check answers start on board and strand object actually gives word
-            if answer[0] != self.game_board.evaluate_strand(answer[1]):
-                raise ValueError
+            start = time.perf_counter()
+            word_dictionary = load_lexicon(WEB2_PATH)
+            board_words = board_lexicon(word_dictionary,
+                                        self.game_board.letters)
+            elapsed = time.perf_counter() - start
 
-            tot_ans_len += len(answer[0])
+            self._word_dictionary = word_dictionary
+            self._board_words = board_words
+            self.dictionary_load_time = elapsed
 
-        # make sure answers fill board
-        if tot_ans_len != (self.game_board.num_cols() *
-                           self.game_board.num_rows()):
-            print("answers do not fill board")
-            raise ValueError
+        if self.dictionary_load_hook is not None:
+            self.dictionary_load_hook(elapsed)
 
-        # initializing word dictionary using web2.txt
-        with open("assets/web2.txt", encoding="utf-8") as f:
-            word_dictionary = [line.strip() for line in f.readlines()]
+    def warm_dictionary(self, background: bool = True
+                        ) -> threading.Thread | None:
+        """
+        Load the word dictionary ahead of the first guess.
 
-        # word dictionary
-        self.word_dictionary = word_dictionary
-        self.game_answers = game_answers
-        self.tot_game_guesses = []
-        self.hint_state = None
-        self.hint_word = self.game_answers[0][0]
-        self.new_game_guesses = []
+        Inputs:
+            background (bool): load in a daemon thread if True,
+                otherwise load before returning
 
-        # assume in Play mode
-        self.show_mode = False
+        Returns (threading.Thread | None): the loading thread, if any
+        """
+        if not background:
+            self.load_dictionary()
+            return None
 
-        # sounds enhancement
-        self.sound_mode = False
+        thread = threading.Thread(target=self.load_dictionary, daemon=True)
+        thread.start()
+
+        return thread
 
-    def run_dfs(self, start: tuple[int, int], dictionary: set[str],
-                partials: set[str], words_sub: set[str]) -> None:
+    def run_dfs(self, start: Pos, automaton: PrefixAutomaton,
+                words_sub: set[str],
+                paths_sub: dict[str, list[PackedPath]] | None = None
+                ) -> None:
         '''
         Part of the DICTIONARY-WORDS enhancement.
         Performs a DFS on the game_board from boards/G.txt
@@ -354,71 +652,226 @@ class StrandsGame(StrandsGameBase):
         on the board from web2.txt.
 
         Inputs:
-            start (tuple[int, int]): the starting position for dfs
-            dictionary (set[str]): the desired source dictionary
+            start (Pos): the starting position for dfs
+            automaton (PrefixAutomaton): the desired source dictionary
             words_sub (set[str]): the destination word set
+            paths_sub (dict[str, list[PackedPath]] | None): if given,
+                every path found for a word is appended to its list
+                as (start row, start col, packed steps)
 
         Returns:
             Nothing
         '''
-        srt_r, srt_c = start
-        stack = [(start, [start],
-                  self.game_board.get_letter(Pos(srt_r, srt_c)))]
+        board = self.game_board
+        flat_letters = board.flat_letters
+        cell_neighbors = board.cell_neighbors
+        cell_steps = board.cell_steps
+        offsets = automaton.offsets
+        labels = automaton.labels
+        targets = automaton.targets
+        finals = automaton.finals
+
+        # cells are board indices and journeys are bitmasks of them;
+        # the automaton state stands for the word spelled so far, and
+        # the steps taken are packed as in pack_steps
+        ind = board.cell_index(start)
+        state = automaton.step(0, flat_letters[ind])
+        if state < 0:
+            return
+        stack = [(ind, state, 1 << ind, flat_letters[ind], 1)]
 
         while stack:
-            (r, c), journey, board_wrd = stack.pop()
-
-            if board_wrd not in partials and board_wrd not in dictionary:
-                continue
+            ind, state, journey, board_wrd, packed = stack.pop()
 
-            if board_wrd in dictionary and not len(board_wrd) < 3:
+            if finals[state >> 3] >> (state & 7) & 1 and len(board_wrd) >= 3:
                 words_sub.add(board_wrd)
+                if paths_sub is not None:
+                    paths_sub.setdefault(board_wrd, []).append(
+                        (start.r, start.c, packed))
+
+            lo = offsets[state]
+            hi = offsets[state + 1]
+            if lo == hi:
+                continue
 
-            for w in self.game_board.find_neighbors(Pos(r, c)):
-                nb_r, nb_c = w
+            for w, code in zip(cell_neighbors[ind], cell_steps[ind]):
 
                 # prevents dfs revisiting
-                if w not in journey:
-                    lett = self.game_board.get_letter(Pos(nb_r, nb_c))
-                    stack.append((w, journey + [w], board_wrd + lett))
+                if journey >> w & 1:
+                    continue
+
+                # only follow letters that continue some word
+                lett = flat_letters[w]
+                i = bisect_left(labels, ord(lett), lo, hi)
+                if i < hi and labels[i] == ord(lett):
+                    stack.append((w, targets[i], journey | 1 << w,
+                                  board_wrd + lett, packed << 3 | code))
+
+    def _board_automaton(self, words_path: str) -> PrefixAutomaton:
+        """
+        Return the shared automaton of the words of words_path
+        (lowercase) that could be spelled on this board.
+        """
+        # only words that fit the board can be found by the dfs,
+        # and the automaton is shared by every game on this board
+        dictionary = board_lexicon(load_lexicon(words_path).lower(),
+                                   self.game_board.letters)
+        return prefix_automaton(dictionary)
 
-    def dict_enhancement(self) -> None:
+    def dictionary_words(self, words_path: str = WEB2_PATH) -> set[str]:
         """
         Iterates through all letters in the game_board,
         running DFS starting at each one to construct a set
         of all dictionary words in the game.
+
+        Inputs:
+            words_path (str): the word list to search for
+
+        Returns (set[str]): the lowercase words of at least three
+            letters that a non-cyclic strand spells
         """
+        automaton = self._board_automaton(words_path)
+        words_sub: set[str] = set()
+        for start in self.game_board.cells:
+            self.run_dfs(start, automaton, words_sub)
 
-        with open("assets/web2.txt", encoding="utf-8") as f:
-            dictionary = set(line.strip().lower() for line in f.readlines())
+        return words_sub
 
-        # hoping to reduce computation time with O(1) lookups
-        partials = set()
-        for wrd in dictionary:
-            for p in range(1, len(wrd)):
-                partial = wrd[:p]
-                partials.add(partial)
+    def word_index(self, words_path: str = WEB2_PATH) -> WordIndex:
+        """
+        Like dictionary_words, but also record every distinct
+        non-cyclic strand spelling each word.
 
+        Returns (WordIndex): the paths of each dictionary word
+        """
+        automaton = self._board_automaton(words_path)
         words_sub: set[str] = set()
-        for r in range(self.game_board.num_rows()):
-            for c in range(self.game_board.num_cols()):
-                start = (r, c)
-                self.run_dfs(start, dictionary, partials, words_sub)
+        paths_sub: dict[str, list[PackedPath]] = {}
+        for start in self.game_board.cells:
+            self.run_dfs(start, automaton, words_sub, paths_sub)
 
-        # building new file name from old
-        assert (self.game_file.endswith(".txt")
-                and self.game_file.startswith("boards/"))
-        splice = self.game_file[7: -4]
-        outfile = "assets/" + splice + "-with-words.txt"
+        return WordIndex(self.spec.digest, paths_sub)
 
+    def dict_enhancement(self, outfile: str | None = None,
+                         index_file: str | None = None,
+                         words_path: str = WEB2_PATH) -> int:
+        """
+        Write the game file followed by its dictionary words to
+        assets/G-with-words.txt, for the game file boards/G.txt, and
+        the paths of those words to assets/G-words.idx (see
+        wordindex.py). Both files are replaced atomically.
+
+        Inputs:
+            outfile (str | None): write the words here instead
+            index_file (str | None): write the index here instead
+            words_path (str): the word list to search for
+
+        Returns (int): the number of dictionary words
+        """
+        index = self.word_index(words_path)
+
+        # building new file names from old
+        if outfile is None or index_file is None:
+            assert (self.game_file.endswith(".txt")
+                    and self.game_file.startswith("boards/"))
+            splice = self.game_file[7: -4]
+            if outfile is None:
+                outfile = "assets/" + splice + "-with-words.txt"
+            if index_file is None:
+                index_file = "assets/" + splice + "-words.idx"
+
+        tmp_path = outfile + ".tmp"
         with (open(self.game_file, encoding="utf-8") as old,
-              open(outfile, "w", encoding="utf-8") as new):
+              open(tmp_path, "w", encoding="utf-8") as new):
             for line in old.readlines():
                 new.write(line)
 
             new.write("\nRelevant Dictionary Words:\n")
-            for word in sorted(words_sub):
+            for word in index:
                 new.write(word + "\n")
+        os.replace(tmp_path, outfile)
+        index.write(index_file)
+
+        return len(index)
+
+    def to_bytes(self) -> bytes:
+        """
+        Snapshot the session state: the board's content hash, hint
+        threshold, state and word, the found answers in found order
+        and every guess, the show_mode and shown_hint_msg flags, and
+        the event log. Audio, sound_mode and the dictionary are not
+        part of it.
+
+        Returns (bytes): the snapshot, see snapshot.py
+        """
+        guesses = []
+        for word, strand in self.tot_game_guesses:
+            asw_ind = self.answer_index.get(word)
+            if asw_ind is not None and strand is self.game_answers[asw_ind][1]:
+                guesses.append((asw_ind, 0, 0, 0))
+            else:
+                guesses.append((-1, *strand_key(strand)))
+
+        return Snapshot(
+            self.spec.digest, self.hint_thresh, self.shown_hint_msg,
+            self.show_mode, self.hint_state,
+            self.answer_index[self.hint_word], tuple(self.found_order),
+            tuple(guesses), len(self.new_game_guesses),
+            self.event_log).to_bytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, spec: BoardSpec | None = None,
+                   audio: AudioSink | None = None,
+                   game_file: str | None = None) -> "StrandsGame":
+        """
+        Restore a session saved by to_bytes.
+
+        Inputs:
+            data (bytes): the snapshot
+            spec (BoardSpec | None): the board, by default the one
+                loaded earlier in this process with the saved hash
+            audio (AudioSink | None): as for the constructor
+            game_file (str | None): as for from_spec
+
+        Returns (StrandsGame): the restored game
+
+        Raises ValueError if data is not a snapshot of this version
+        or was taken on a different board than spec, and KeyError if
+        the board was never loaded in this process.
+        """
+        snap = Snapshot.from_bytes(data)
+        if spec is None:
+            spec = spec_by_digest(snap.digest)
+        elif spec.digest != snap.digest:
+            raise ValueError("snapshot is for a different board")
+
+        game = cls.from_spec(spec, snap.hint_thresh, audio, game_file)
+        game.shown_hint_msg = snap.shown_hint_msg
+        game.show_mode = snap.show_mode
+        game.hint_state = snap.hint_state
+        game.hint_word = game.game_answers[snap.hint_index][0]
+        for ind in snap.found_order:
+            game.found_mask |= 1 << ind
+            game.found_order.append(ind)
+
+        board = game.game_board
+        dict_guesses: list[tuple[str, StrandBase]] = []
+        for asw_ind, r, c, packed in snap.guesses:
+            if asw_ind >= 0:
+                game.tot_game_guesses.append(game.game_answers[asw_ind])
+                continue
+
+            strand = Strand.from_packed(r, c, packed, board)
+            guess = (board.evaluate_strand(strand), strand)
+            game.tot_game_guesses.append(guess)
+            game.dict_guess_keys.add((guess[0], r, c, packed))
+            dict_guesses.append(guess)
+
+        num_new = snap.num_new
+        game.new_game_guesses = dict_guesses[len(dict_guesses) - num_new:]
+        game.event_log = snap.event_log
+
+        return game
 
     def get_hint_word(self) -> str:
         """
@@ -439,21 +892,31 @@ class StrandsGame(StrandsGameBase):
 
     def found_strands(self) -> list[StrandBase]:
 
-        found_strands: list[StrandBase] = []
-        for gus_word, _ in self.tot_game_guesses:
-            for ans_word, ans_strd in self.game_answers:
-                if gus_word == ans_word:
-                    # appends desired ans_strd, even if different from guess
-                    found_strands.append(ans_strd)
+        # appends desired answer strands, even if different from guess
+        return [self.game_answers[ind][1] for ind in self.found_order]
 
-        return found_strands
+    def is_found(self, ind: int) -> bool:
+        """
+        Decide whether the ith answer has been found.
+        """
+        return bool(self.found_mask >> ind & 1)
 
-    def game_over(self) -> bool:
+    def overlapping_answer(self, strand: StrandBase) -> int | None:
+        """
+        Find the answer covering exactly the same cells as strand,
+        possibly along a different path (see found_strands in base).
 
-        if len(self.found_strands()) == len(self.answers()):
-            return True
+        Returns (int | None): the answer index, or None if no answer
+            covers those cells or strand leaves the board
+        """
+        try:
+            return self.mask_index.get(self.game_board.cell_mask(strand))
+        except ValueError:
+            return None
 
-        return False
+    def game_over(self) -> bool:
+
+        return self.found_mask == (1 << len(self.game_answers)) - 1
 
     def hint_threshold(self) -> int:
         return self.hint_thresh
@@ -463,110 +926,196 @@ class StrandsGame(StrandsGameBase):
         level = len(self.new_game_guesses)
         if level >= self.hint_threshold() and not self.shown_hint_msg:
             # only does this once per beating the threshold
-            print("You can request a hint!")
+            if not self.quiet:
+                print("You can request a hint!")
             self.shown_hint_msg = True
 
         return level
 
     def active_hint(self) -> None | tuple[int, bool]:
 
-        # theme words found thus far
-        found_theme_strds = self.found_strands()
-
         if self.hint_state is None:
             return None
 
-        for ind, (word, strd) in enumerate(self.answers()):
-            if strd not in found_theme_strds:
-                # ith answer is 0-indexed
-                i = ind
-                self.hint_word = word
-                return (i, self.hint_state)
-
-        return None
-
-    def submit_strand(self, strand: StrandBase) -> tuple[str, bool] | str:
+        # lowest unset bit is the first unfound answer
+        unfound = ~self.found_mask & ((1 << len(self.game_answers)) - 1)
+        if not unfound:
+            return None
 
-        # ensures pos arguments of strand exist on board
-        try:
-            board_letters = [self.board().get_letter(pos)
-                             for pos in strand.positions()]
-        except ValueError:
-            return "Not a theme word"
+        # ith answer is 0-indexed
+        i = (unfound & -unfound).bit_length() - 1
+        self.hint_word = self.game_answers[i][0]
+        return (i, self.hint_state)
 
-        board_word = "".join(board_letters)
+    def _classify_guess(self, board_word: str, strand: StrandBase,
+                        cyclic: bool | None = None) -> int:
+        """
+        Classify an on-board guess independently of the game state.
+        Pass cyclic if already known for the strand.
 
+        Returns (int): the answer index for theme words, otherwise
+            GUESS_TOO_SHORT, GUESS_DICTIONARY or GUESS_NOT_A_WORD
+        """
         # check if too short
         if len(board_word) < 3:
-            if not self.show_mode and self.sound_mode:
-                error_sound = pygame.mixer.Sound("assets/error_008.ogg")
-                error_sound.play()
+            return GUESS_TOO_SHORT
+
+        # check if answer
+        asw_ind = self.answer_index.get(board_word)
+        if asw_ind is not None:
+            return asw_ind
+
+        # check if dictionary word
+        # (board_words only covers strands that never revisit a cell)
+        if board_word in self.board_words:
+            return GUESS_DICTIONARY
+        if cyclic is None:
+            cyclic = strand.is_cyclic()
+        if cyclic and board_word in self.word_dictionary:
+            return GUESS_DICTIONARY
+
+        return GUESS_NOT_A_WORD
+
+    def _apply_guess(self, kind: int, board_word: str,
+                     strand: StrandBase) -> tuple[str, bool] | str:
+        """
+        Update the game state for a classified guess.
 
+        Returns (tuple[str, bool] | str): the submit_strand result
+        """
+        if kind == GUESS_TOO_SHORT:
             return "Too short"
 
-        # check if answer/already found answer
-        for asw_word, asw_strd in self.answers():
-            if board_word == asw_word:
-                if asw_strd not in self.found_strands():
-                    self.tot_game_guesses.append((asw_word, asw_strd))
-                    # theme word is found basic imp
-                    if asw_word == self.hint_word:
-                        # clearing the hint
-                        self.hint_state = None
-
-                    if not self.show_mode and self.sound_mode:
-                        cor_sd = pygame.mixer.Sound("assets/" +
-                                                    "confirmation_001.ogg")
-                        cor_sd.play()
-                    return (asw_word, True)
-
-                if not self.show_mode and self.sound_mode:
-                    error_sound = pygame.mixer.Sound("assets/error_008.ogg")
-                    error_sound.play()
+        if kind == GUESS_NOT_A_WORD:
+            return "Not in word list"
 
+        # check if already found answer
+        if kind >= 0:
+            if self.is_found(kind):
                 return "Already found"
 
-        # check if dictionary word/already found dictionary word
-        if board_word in self.word_dictionary:
-            # is an unfound word
-            if (board_word, strand) not in self.tot_game_guesses:
-                self.tot_game_guesses.append((board_word, strand))
+            asw_word, asw_strd = self.game_answers[kind]
+            self.tot_game_guesses.append((asw_word, asw_strd))
+            self.found_mask |= 1 << kind
+            self.found_order.append(kind)
+            # theme word is found basic imp
+            if asw_word == self.hint_word:
+                # clearing the hint
+                self.hint_state = None
+
+            return (asw_word, True)
 
-                # hint meter updates when this is appended
-                self.new_game_guesses.append((board_word, strand))
+        # check if already found dictionary word
+        key = (board_word, *strand_key(strand))
+        if key in self.dict_guess_keys:
+            return "Already found"
 
-                if not self.show_mode and self.sound_mode:
-                    dict_sound = pygame.mixer.Sound("assets/maximize_006.ogg")
-                    dict_sound.play()
+        self.dict_guess_keys.add(key)
+        self.tot_game_guesses.append((board_word, strand))
 
-                return (board_word, False)
-            # already found
+        # hint meter updates when this is appended
+        self.new_game_guesses.append((board_word, strand))
+
+        return (board_word, False)
+
+    def submit_strand(self, strand: StrandBase) -> tuple[str, bool] | str:
+
+        # the same cell path always classifies the same way
+        key = strand_key(strand)
+        self.event_log.record_submit(strand, key[2])
+        cached = self.guess_cache.get(key)
+        if cached is not None:
+            kind, board_word = cached
+        else:
+            # ensures pos arguments of strand exist on board
+            try:
+                board_word = self.game_board.evaluate_strand(strand)
+            except ValueError:
+                kind, board_word = GUESS_OFF_BOARD, ""
             else:
-                if not self.show_mode and self.sound_mode:
-                    error_sound = pygame.mixer.Sound("assets/error_008.ogg")
-                    error_sound.play()
+                kind = self._classify_guess(board_word, strand)
+            self.guess_cache.put(key, (kind, board_word))
 
-                return "Already found"
+        if kind == GUESS_OFF_BOARD:
+            return "Not a theme word"
+
+        result = self._apply_guess(kind, board_word, strand)
+
+        if self.sound_mode:
+            if result == "Not in word list":
+                self.audio.play("error_008")
+            elif not self.show_mode:
+                if isinstance(result, str):
+                    self.audio.play("error_008")
+                elif result[1]:
+                    self.audio.play("confirmation_001")
+                else:
+                    self.audio.play("maximize_006")
+
+        return result
+
+    def submit_many(self, strands: Sequence[StrandBase]
+                    ) -> list[tuple[str, bool] | str]:
+        """
+        Submit a batch of strands, with the same results and final
+        state as calling submit_strand on each in order, but without
+        playing any sounds. All strands are decoded and spelled in
+        bulk (with NumPy for large batches, if installed), and each
+        distinct guess is classified once.
+
+        Inputs:
+            strands (Sequence[StrandBase]): the guesses, in order
 
-        # word is not a valid dictionary word
+        Returns (list[tuple[str, bool] | str]): the result of each
+        """
+        board = self.game_board
+        num_cols = board.cols
+        decoded = decode_strands(
+            [(strand.start.r, strand.start.c, strand.steps)
+             for strand in strands])
+        inside = strands_in_bounds(decoded, board.num_rows(), num_cols)
+
+        rows, cols, offsets = decoded
+        if np is not None and isinstance(rows, np.ndarray):
+            cells = (rows * num_cols + cols).tolist()
         else:
-            if self.sound_mode:
-                error_sound = pygame.mixer.Sound("assets/error_008.ogg")
-                error_sound.play()
-            return "Not in word list"
+            cells = [r * num_cols + c for r, c in zip(rows, cols)]
+
+        log = self.event_log
+        for strand in strands:
+            log.record_submit(strand, strand_key(strand)[2])
+
+        flat_letters = board.flat_letters
+        # (word, cyclic) -> classification, within this batch
+        kinds: dict[tuple[str, bool], int] = {}
+        results: list[tuple[str, bool] | str] = []
+        for i, strand in enumerate(strands):
+            if not inside[i]:
+                results.append("Not a theme word")
+                continue
+
+            path = cells[offsets[i]:offsets[i + 1]]
+            board_word = "".join(map(flat_letters.__getitem__, path))
+            cyclic = len(set(path)) != len(path)
+            kind = kinds.get((board_word, cyclic))
+            if kind is None:
+                kind = self._classify_guess(board_word, strand, cyclic)
+                kinds[(board_word, cyclic)] = kind
+
+            results.append(self._apply_guess(kind, board_word, strand))
+
+        return results
 
     def use_hint(self) -> tuple[int, bool] | str:
 
+        self.event_log.record_hint()
         if self.sound_mode:
-            hint_sound = pygame.mixer.Sound("assets/question_003.ogg")
-            hint_sound.play()
+            self.audio.play("question_003")
 
         # check if we need to reset hint state to false (NEW LOGIC)
-        if self.hint_word:
-            for tup in self.tot_game_guesses:
-                if self.hint_word == tup[0]:
-                    self.hint_state = None
-                    break
+        hint_ind = self.answer_index.get(self.hint_word)
+        if hint_ind is not None and self.is_found(hint_ind):
+            self.hint_state = None
 
         hint_level = self.hint_meter()
         hint_threshold = self.hint_threshold()
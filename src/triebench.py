@@ -0,0 +1,147 @@
+"""
+Benchmark for the solver's dictionary trie.
+
+Solver.all_words used to build an object Trie (one TrieNode, with its
+own dict, per prefix; kept below as Trie) on every call. It now walks
+the shared prefix automaton from lexicon.load_trie, which is built
+once, saved to assets/web2.trie and memory-mapped by every later
+solver and process.
+
+To compare build time, load time and memory of the two, run
+<src/triebench.py>.
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, TypeVar
+
+import click
+
+from automaton import PrefixAutomaton
+from boardspec import load_catalog
+from lexicon import board_lexicon, load_lexicon, WEB2_PATH
+
+T = TypeVar("T")
+
+
+class TrieNode:
+    """
+    Node for Trie class. Stores a character and all unique characters that come
+    after the character in a set of words. Only used by Trie.
+    """
+    children: dict[str, "TrieNode"]
+    char: str | None
+    is_end: bool
+
+    def __init__(self, char: str | None = None):
+        self.children = {}
+        self.char = char
+        self.is_end = False
+
+
+class Trie:
+    """
+    Root of the Trie. Stores tree nodes that describe the words in a certain set
+    of words. Each node has a unique character and a dictionary of unique
+    characters that may come after it in any given word.
+
+    The solver's original trie, which it no longer uses: it walks the
+    shared array trie from lexicon.load_trie instead.
+    """
+
+    root: TrieNode
+
+    def __init__(self) -> None:
+        self.root = TrieNode()
+
+    def add(self, word: str) -> None:
+        """
+        Add a word to the Trie.
+        """
+        node = self.root
+
+        for char in word:
+            if char not in node.children:
+                node.children[char] = TrieNode(char)
+            node = node.children[char]
+
+        node.is_end = True
+
+
+def measure(build: Callable[[], T]) -> tuple[T, float, int]:
+    """
+    Run build twice: once for time, and once tracing allocations,
+    which slows it down.
+
+    Returns (tuple[T, float, int]): the result, the seconds taken and
+        the bytes still allocated by it afterwards
+    """
+    start = time.perf_counter()
+    build()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, seconds, size
+
+
+def object_trie(words: list[str]) -> Trie:
+    """
+    Build the solver's original object Trie of words.
+    """
+    trie = Trie()
+    for word in words:
+        trie.add(word)
+
+    return trie
+
+
+@click.command()
+@click.option("-w", "--words", "words_path", default=WEB2_PATH,
+              help="Word list to build the tries from.")
+def cmd(words_path: str) -> None:
+    """
+    Compare the object Trie with the array-backed, mapped trie.
+    """
+    words = list(load_lexicon(words_path).lower())
+    print(f"{len(words)} words in {words_path}")
+
+    _, seconds, size = measure(lambda: object_trie(words))
+    print(f"Object Trie: built in {seconds:.2f}s, {size / 2**20:.1f} MB")
+
+    automaton, seconds, size = measure(
+        lambda: PrefixAutomaton.from_words(words))
+    print(f"Array trie:  built in {seconds:.2f}s, {size / 2**20:.1f} MB "
+          f"({len(automaton)} states)")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "words.trie")
+        start = time.perf_counter()
+        automaton.write(path)
+        seconds = time.perf_counter() - start
+        print(f"Array trie:  saved in {seconds:.3f}s, "
+              f"{os.path.getsize(path) / 2**20:.1f} MB on disk")
+
+        mapped, seconds, size = measure(lambda: PrefixAutomaton.open(path))
+        print(f"Array trie:  mapped in {seconds * 1000:.2f}ms, "
+              f"{size / 1024:.1f} KB of heap")
+        del mapped
+
+    # what all_words used to pay on every call, per board
+    letters = [spec.letters for spec in load_catalog().values()]
+    start = time.perf_counter()
+    for board in letters:
+        object_trie(list(board_lexicon(load_lexicon(words_path).lower(),
+                                       board)))
+    seconds = time.perf_counter() - start
+    print(f"Object Trie of each board's words: "
+          f"{seconds / len(letters) * 1000:.1f}ms per all_words call "
+          f"on {len(letters)} boards")
+
+
+if __name__ == "__main__":
+    cmd()
@@ -1,7 +1,5 @@
 # src/tui.py
 import sys
-import os
-import random
 from typing import List
 import click
 from colorama import Fore, Style, init
@@ -11,6 +9,7 @@ from ui import ArtTUIStub, ArtTUIBase
 from fakes import StrandsGameFake
 from stubs import PosStub, StrandStub
 from strands import StrandsGame
+from catalog import load_board
 from art_tui import ART_FRAMES  # Art frame classes keyed by name
 
 
@@ -191,27 +190,20 @@ def main(show: bool, game: str, hint_threshold: int, art_frame_name: str,
     """
     init(autoreset=True)  # For colorama
 
-    board_dir = "boards"
-    # Pick a board file:
-    if game is None:
-        game_files = [f for f in os.listdir(board_dir) if f.endswith(".txt")]
-        if not game_files:
-            print("Error: No game boards found in the boards directory.")
-            return
-        game_file = os.path.join(board_dir, random.choice(game_files))
-    else:
-        game_file = os.path.join(board_dir, f"{game}.txt")
-        if not os.path.exists(game_file):
-            print(f"Error: Game file '{game_file}' does not exist.")
-            return
-
-    # Try loading the real game with the hint threshold
+    # Pick a board, from the board catalog unless its file changed:
     try:
-        game_instance = StrandsGame(game_file, hint_threshold=hint_threshold)
+        spec, game_file = load_board(game)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        return
     except Exception as e:
         print(f"Error loading game: {e}")
         return
 
+    # Load the real game with the hint threshold
+    game_instance = StrandsGame.from_spec(spec, hint_threshold=hint_threshold,
+                                          game_file=game_file)
+
     # Pick art frame class, default to stub
     art_cls = ArtTUIStub
     if art_frame_name is not None:
@@ -243,6 +235,8 @@ def main(show: bool, game: str, hint_threshold: int, art_frame_name: str,
     if show:
         tui.run_show_mode()
     else:
+        # Load the dictionary while the player reads the board
+        game_instance.warm_dictionary()
         tui.run_play_mode()
 
 
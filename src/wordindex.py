@@ -0,0 +1,137 @@
+"""
+Path-annotated index of the dictionary words on a board.
+
+The DICTIONARY-WORDS file only lists words. A WordIndex also records
+every distinct cell path that spells each word, as packed strands
+(start row, start column, packed steps; see paths.pack_steps), so a
+hint engine or bot can ask where a word lies on the board with a
+lookup instead of a search. Turn a path back into a Strand with
+Strand.from_packed(r, c, packed).
+
+StrandsGame.word_index builds the index, and dict_enhancement saves
+it next to the words file as assets/G-words.idx. The file holds the
+magic, a version byte and the raw SHA-1 of the board file, then
+varints: the word count and, for each word in sorted order, its
+UTF-8 length and bytes, its path count and its paths.
+"""
+import os
+from typing import Iterator, Mapping
+
+from events import put_varint, get_varint
+
+INDEX_MAGIC = b"STWI"
+INDEX_VERSION = 1
+
+# a path: start row, start column and packed steps
+PackedPath = tuple[int, int, int]
+
+
+def word_index_path(name: str, out_dir: str = "assets") -> str:
+    """
+    Return where the word index of board name is written.
+    """
+    return os.path.join(out_dir, name + "-words.idx")
+
+
+class WordIndex(Mapping[str, tuple[PackedPath, ...]]):
+    """
+    Read-only mapping from each dictionary word on the board with
+    content hash digest to its paths, sorted.
+    """
+
+    digest: str
+    _paths: dict[str, tuple[PackedPath, ...]]
+
+    def __init__(self, digest: str,
+                 paths: Mapping[str, list[PackedPath]]):
+        self.digest = digest
+        self._paths = {word: tuple(sorted(paths[word]))
+                       for word in sorted(paths)}
+
+    def __getitem__(self, word: str) -> tuple[PackedPath, ...]:
+        return self._paths[word]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def where(self, word: str) -> tuple[PackedPath, ...]:
+        """
+        Return every path spelling word, or no paths if it is not a
+        dictionary word on the board.
+        """
+        return self._paths.get(word, ())
+
+    def num_paths(self) -> int:
+        """
+        Return the number of paths over all words.
+        """
+        return sum(len(paths) for paths in self._paths.values())
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the index, see the module docstring.
+        """
+        out = bytearray(INDEX_MAGIC)
+        out.append(INDEX_VERSION)
+        out += bytes.fromhex(self.digest)
+        put_varint(out, len(self._paths))
+        for word, paths in self._paths.items():
+            raw = word.encode("utf-8")
+            put_varint(out, len(raw))
+            out += raw
+            put_varint(out, len(paths))
+            for r, c, packed in paths:
+                put_varint(out, r)
+                put_varint(out, c)
+                put_varint(out, packed)
+
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "WordIndex":
+        """
+        Inverse of to_bytes.
+
+        Raises ValueError if data is not a word index of this version.
+        """
+        if data[:4] != INDEX_MAGIC or data[4:5] != bytes([INDEX_VERSION]):
+            raise ValueError("not a word index")
+
+        num_words, pos = get_varint(data, 25)
+        paths: dict[str, list[PackedPath]] = {}
+        for _ in range(num_words):
+            size, pos = get_varint(data, pos)
+            word = data[pos:pos + size].decode("utf-8")
+            pos += size
+            num_paths, pos = get_varint(data, pos)
+            word_paths = []
+            for _ in range(num_paths):
+                r, pos = get_varint(data, pos)
+                c, pos = get_varint(data, pos)
+                packed, pos = get_varint(data, pos)
+                word_paths.append((r, c, packed))
+            paths[word] = word_paths
+
+        return cls(data[5:25].hex(), paths)
+
+    def write(self, path: str) -> None:
+        """
+        Save the index to a file, atomically.
+        """
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(tmp_path, path)
+
+
+def load_word_index(path: str) -> WordIndex:
+    """
+    Read a word index saved by WordIndex.write.
+
+    Raises ValueError if the file is not a word index.
+    """
+    with open(path, "rb") as f:
+        return WordIndex.from_bytes(f.read())
@@ -0,0 +1,152 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from automaton import PrefixAutomaton, saved_stamp
+from dictwords import build_all
+from lexicon import (Lexicon, prefix_automaton, invalidate_lexicon,
+                     compile_trie, load_trie, trie_path)
+from strands import StrandsGame
+
+
+def test_automaton_words_and_prefixes() -> None:
+    words = ["fort", "forty", "form", "cone", "c", "fort"]
+    auto = PrefixAutomaton.from_words(words)
+    # root, c, co, con, cone, f, fo, for, form, fort, forty
+    assert len(auto) == 11
+    for word in set(words):
+        assert word in auto
+    assert "for" not in auto
+    assert "" not in auto
+    assert 42 not in auto
+    assert auto.has_prefix("for")
+    assert auto.has_prefix("")
+    assert not auto.has_prefix("fortz")
+
+    state = auto.walk("for")
+    assert not auto.is_final(state)
+    assert auto.is_final(auto.step(state, "m"))
+    assert auto.step(state, "z") == -1
+    assert auto.walk("x") == -1
+    assert auto.nbytes() > 0
+
+
+def test_prefix_automaton_is_shared() -> None:
+    lex = Lexicon(["ant", "anteater"])
+    auto = prefix_automaton(lex)
+    assert prefix_automaton(lex) is auto
+    assert "anteater" in auto
+
+    invalidate_lexicon()
+    assert prefix_automaton(lex) is not auto
+
+
+def _dfs_words(game: StrandsGame) -> set[str]:
+    # brute force: every non-cyclic strand of up to 8 letters
+    board = game.game_board
+    lower = {w.lower() for w in Lexicon.from_file("assets/web2.txt")}
+    found = set()
+
+    def go(ind: int, seen: int, word: str) -> None:
+        if len(word) >= 3 and word in lower:
+            found.add(word)
+        if len(word) == 8:
+            return
+        for w in board.cell_neighbors[ind]:
+            if not seen >> w & 1:
+                go(w, seen | 1 << w, word + board.flat_letters[w])
+
+    for ind in range(board.num_cells()):
+        go(ind, 1 << ind, board.flat_letters[ind])
+
+    return found
+
+
+def test_dictionary_words_match_search() -> None:
+    game = StrandsGame("boards/cs-142.txt")
+    words = game.dictionary_words()
+    assert {"cone", "fort"} <= words
+    assert {w for w in words if len(w) <= 8} == _dfs_words(game)
+
+
+def test_build_all_is_incremental(tmp_path: Path) -> None:
+    board_dir = tmp_path / "boards"
+    board_dir.mkdir()
+    for name in ["cs-142", "directions"]:
+        shutil.copy(f"boards/{name}.txt", board_dir / f"{name}.txt")
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    manifest = str(tmp_path / "manifest.json")
+    words = tmp_path / "words.txt"
+    words.write_text("cone\nfort\nwry\n")
+
+    def run() -> dict[str, int | None]:
+        return build_all(str(board_dir), str(out_dir), manifest,
+                         str(words), jobs=2)
+
+    first = run()
+    assert sorted(first) == ["cs-142", "directions"]
+    assert first["cs-142"] == 3 and first["directions"] is not None
+    text = (out_dir / "cs-142-with-words.txt").read_text()
+    assert text.endswith("\nRelevant Dictionary Words:\ncone\nfort\nwry\n")
+    assert (out_dir / "cs-142-words.idx").exists()
+    assert run() == {"cs-142": None, "directions": None}
+
+    # an edited board is redone, and so is everything after the
+    # word list changes
+    path = board_dir / "directions.txt"
+    path.write_text(path.read_text().replace('"Directions"', '"Compass"'))
+    redone = run()
+    assert redone["cs-142"] is None
+    assert redone["directions"] == first["directions"]
+    assert run() == {"cs-142": None, "directions": None}
+    words.write_text("cone\nfort\ntwo\nwry\nzebra\n")
+    assert None not in run().values()
+    text = (out_dir / "cs-142-with-words.txt").read_text()
+    assert text.endswith("\ncone\nfort\ntwo\nwry\n")
+    assert not list(out_dir.glob("*.tmp"))
+
+
+def test_automaton_save_and_map(tmp_path: Path) -> None:
+    words = ["fort", "forty", "form", "cone", "zz"]
+    auto = PrefixAutomaton.from_words(words)
+    path = str(tmp_path / "words.trie")
+    auto.write(path, (12, 34))
+    assert saved_stamp(path) == (12, 34)
+
+    mapped = PrefixAutomaton.open(path)
+    assert len(mapped) == len(auto)
+    assert mapped.nbytes() == auto.nbytes()
+    for word in words:
+        assert word in mapped
+    assert "for" not in mapped and mapped.has_prefix("for")
+    assert mapped.walk("forty") == auto.walk("forty")
+
+    with open(path, "r+b") as f:
+        f.write(b"STLX")
+    assert saved_stamp(path) is None
+    with pytest.raises(ValueError):
+        PrefixAutomaton.open(path)
+
+
+def test_load_trie_saves_once(tmp_path: Path) -> None:
+    words = tmp_path / "words.txt"
+    words.write_text("Ant\nanteater\nbee\n")
+    trie = load_trie(str(words))
+    assert "ant" in trie and "Ant" not in trie
+    assert load_trie(str(words)) is trie
+
+    # a fresh process maps the saved trie instead of building it
+    invalidate_lexicon()
+    assert saved_stamp(trie_path(str(words))) is not None
+    mapped = load_trie(str(words))
+    assert mapped is not trie and "anteater" in mapped
+
+    # editing the word list rebuilds it
+    words.write_text("cow\n")
+    os.utime(words, ns=(0, 0))
+    rebuilt = load_trie(str(words))
+    assert "cow" in rebuilt and "bee" not in rebuilt
+    assert compile_trie(str(words)) == trie_path(str(words))
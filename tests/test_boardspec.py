@@ -0,0 +1,70 @@
+import pytest
+
+from base import Step
+from boardspec import (BoardSpec, parse_board, board_spec, read_board_spec,
+                       load_catalog)
+from strands import Pos, Strand, StrandsGame
+
+
+def test_catalog_matches_game_files() -> None:
+    catalog = load_catalog()
+    assert "shine-on" not in catalog
+    assert "leaves the board" in catalog.invalid["shine-on"]
+    assert len(catalog) == 43
+
+    for name, spec in catalog.items():
+        game = StrandsGame(catalog.path(name))
+        board = game.board()
+        assert spec.theme == game.theme()
+        assert [list(row) for row in spec.letters] == board.letters
+        assert [(word, Strand.from_packed(r, c, packed))
+                for word, r, c, packed in spec.answers] == game.answers()
+        assert list(spec.answer_masks) == [board.cell_mask(strand)
+                                           for _, strand in game.answers()]
+
+
+def test_specs_shared_by_content() -> None:
+    spec = read_board_spec("boards/directions.txt")
+    assert read_board_spec("boards/directions.txt") is spec
+    assert load_catalog(names=["directions"])["directions"] is spec
+
+    with open("boards/directions.txt", encoding="utf-8") as f:
+        text = f.read()
+    assert board_spec(text) is spec
+    assert parse_board(text) == spec
+    assert parse_board(text + "\n") != spec
+
+
+def test_parse_board_invalid() -> None:
+    good = ('"Directions"\n\nE A S T\nT S E W\n\n'
+            'east 1 1 e e e\nwest 2 4 w w w\n')
+    assert isinstance(parse_board(good), BoardSpec)
+
+    bad_variants = [
+        "",
+        '"Directions"\n\nE A S T\n',
+        '"Directions"\n\nE A S T\nW E S\n\neast 1 1 e e e\n',
+        '"Directions"\n\nE A S 7\n\neast 1 1 e e e\n',
+        '"Directions"\n\nE A S T\n\neast 1 1 z z\n',
+        '"Directions"\n\nE A S T\n\neast 9 9 e e e\n',
+        '"Directions"\n\nE A S T\n\nwest 1 1 e e e\n',
+        '"Directions"\n\nE A S T\n\neas 1 1 e e\n',
+        '"Directions"\n\nE A S T\n\n',
+    ]
+    for text in bad_variants:
+        with pytest.raises(ValueError):
+            parse_board(text)
+
+
+def test_game_from_spec() -> None:
+    spec = read_board_spec("boards/directions.txt")
+    game = StrandsGame.from_spec(spec, hint_threshold=5)
+    other = StrandsGame.from_spec(spec)
+    assert game.hint_threshold() == 5
+    assert game.board() is other.board()
+    assert game.spec is spec
+
+    east = Strand(Pos(0, 0), [Step.E, Step.E, Step.E])
+    assert game.submit_strand(east) == ("east", True)
+    assert game.found_strands() == [east]
+    assert other.found_strands() == []
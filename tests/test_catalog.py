@@ -0,0 +1,107 @@
+import os
+import random
+import shutil
+from pathlib import Path
+
+import pytest
+
+from boardspec import load_catalog, read_board_spec
+from catalog import (MappedCatalog, build_catalog, check_catalog,
+                     load_board, open_catalog)
+
+
+def test_catalog_round_trip(tmp_path: Path) -> None:
+    out = str(tmp_path / "boards.cat")
+    invalid = build_catalog("boards", out)
+    assert list(invalid) == ["shine-on"]
+
+    boards = load_catalog()
+    catalog = MappedCatalog(out)
+    assert list(catalog) == sorted(boards)
+    for name in boards:
+        assert catalog[name] == boards[name]
+        # decoded specs are shared with the ones parsed from text
+        assert catalog[name] is read_board_spec(boards.path(name))
+    with pytest.raises(KeyError):
+        catalog["shine-on"]
+    assert check_catalog("boards", out) == {"stale": [], "missing": [],
+                                             "removed": []}
+
+
+def _copy_boards(tmp_path: Path, names: list[str]) -> str:
+    board_dir = tmp_path / "boards"
+    board_dir.mkdir()
+    for name in names:
+        shutil.copy(f"boards/{name}.txt", board_dir / f"{name}.txt")
+
+    return str(board_dir)
+
+
+def test_catalog_detects_stale_boards(tmp_path: Path) -> None:
+    board_dir = _copy_boards(tmp_path, ["cs-142", "directions", "fore"])
+    out = str(tmp_path / "boards.cat")
+    build_catalog(board_dir, out)
+
+    # edit one board, add one and remove one
+    path = os.path.join(board_dir, "directions.txt")
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text.replace('"Directions"', '"Compass points"'))
+    shutil.copy("boards/happy.txt", os.path.join(board_dir, "happy.txt"))
+    os.remove(os.path.join(board_dir, "fore.txt"))
+
+    assert check_catalog(board_dir, out) == {
+        "stale": ["directions"], "missing": ["happy"], "removed": ["fore"]}
+
+    # loading the edited board falls back to its text file
+    catalog = open_catalog(out)
+    assert catalog is not None
+    assert not catalog.is_fresh("directions", board_dir)
+    assert catalog.is_fresh("cs-142", board_dir)
+    spec, game_file = load_board("directions", board_dir, out)
+    assert spec.theme == '"Compass points"'
+    assert game_file == path
+
+    # a board whose file is gone still loads from the catalog
+    spec, _ = load_board("fore", board_dir, out)
+    assert spec.answers[0][0] == "wood"
+
+
+def test_load_board_random_and_missing(tmp_path: Path) -> None:
+    board_dir = _copy_boards(tmp_path, ["cs-142", "directions"])
+    out = str(tmp_path / "boards.cat")
+
+    # without a catalog, boards come from the text files
+    spec, game_file = load_board(None, board_dir, out, random.Random(0))
+    assert game_file in {os.path.join(board_dir, "cs-142.txt"),
+                         os.path.join(board_dir, "directions.txt")}
+    assert spec is read_board_spec(game_file)
+
+    build_catalog(board_dir, out)
+    picks = {load_board(None, board_dir, out, random.Random(seed))[1]
+             for seed in range(20)}
+    assert len(picks) == 2
+
+    # a board added after the catalog was built can be picked too
+    shutil.copy("boards/fore.txt", os.path.join(board_dir, "fore.txt"))
+    picks = {load_board(None, board_dir, out, random.Random(seed))[1]
+             for seed in range(30)}
+    assert os.path.join(board_dir, "fore.txt") in picks
+
+    # and the catalog alone is enough without the directory
+    shutil.rmtree(board_dir)
+    spec, game_file = load_board(None, board_dir, out, random.Random(0))
+    original = os.path.join("boards", os.path.basename(game_file))
+    assert spec.digest == read_board_spec(original).digest
+
+    with pytest.raises(FileNotFoundError):
+        load_board("no-such-board", board_dir, out)
+
+
+def test_catalog_rejects_bad_header(tmp_path: Path) -> None:
+    path = tmp_path / "boards.cat"
+    path.write_bytes(b"STLX" + bytes(64))
+    with pytest.raises(ValueError):
+        MappedCatalog(str(path))
+    assert open_catalog(str(path)) is None
@@ -0,0 +1,171 @@
+import pytest
+from pathlib import Path
+
+from lexicon import (Lexicon, MappedLexicon, load_lexicon,
+                     invalidate_lexicon, reload_lexicon, load_frequencies,
+                     compile_lexicon, compiled_path, is_compiled_fresh,
+                     board_lexicon,
+                     WEB2_PATH)
+from strands import StrandsGame
+
+
+def test_lexicon_membership() -> None:
+    lex = Lexicon(["fort", "forty", "cone", "Aaron"])
+    assert "fort" in lex
+    assert "forty" in lex
+    assert "Aaron" in lex
+    assert "aaron" not in lex
+    assert "for" not in lex
+
+
+def test_lexicon_list_access() -> None:
+    lex = Lexicon(["sort", "fort", "cone", "fort"])
+    assert len(lex) == 3
+    assert list(lex) == ["cone", "fort", "sort"]
+    assert lex[0] == "cone"
+    assert lex[-1] == "sort"
+    assert lex[1:] == ["fort", "sort"]
+
+
+def test_lexicon_prefixes() -> None:
+    lex = Lexicon(["fort", "forty", "form", "cone"])
+    assert lex.has_prefix("f")
+    assert lex.has_prefix("for")
+    assert lex.has_prefix("forty")
+    assert not lex.has_prefix("fortz")
+    assert not lex.has_prefix("x")
+    assert lex.words_with_prefix("fort") == ["fort", "forty"]
+    assert lex.words_with_prefix("co") == ["cone"]
+    assert lex.words_with_prefix("z") == []
+
+
+def test_lexicon_from_web2() -> None:
+    lex = Lexicon.from_file("assets/web2.txt")
+    assert "cone" in lex
+    assert "worm" in lex
+    assert "cmsc" not in lex
+    assert lex.has_prefix("direc")
+
+
+def test_load_lexicon_shared(tmp_path: Path) -> None:
+    path = tmp_path / "words.txt"
+    path.write_text("Cone\nfort\n", encoding="utf-8")
+
+    lex = load_lexicon(str(path))
+    assert load_lexicon(str(path)) is lex
+    assert "Cone" in lex and "cone" not in lex
+    assert lex.lower() is lex.lower()
+    assert "cone" in lex.lower()
+
+
+def test_load_lexicon_invalidate_and_reload(tmp_path: Path) -> None:
+    path = tmp_path / "words.txt"
+    path.write_text("cone\n", encoding="utf-8")
+
+    lex = load_lexicon(str(path))
+    invalidate_lexicon(str(path))
+    lex2 = load_lexicon(str(path))
+    assert lex2 is not lex
+
+    path.write_text("cone\nfort\n", encoding="utf-8")
+    lex3 = reload_lexicon(str(path))
+    assert lex3 is not lex2
+    assert "fort" in lex3
+    assert load_lexicon(str(path)) is lex3
+
+
+def test_games_share_lexicon() -> None:
+    game1 = StrandsGame("boards/cs-142.txt")
+    game2 = StrandsGame("boards/directions.txt")
+    assert game1.word_dictionary is game2.word_dictionary
+    assert game1.word_dictionary is load_lexicon(WEB2_PATH)
+
+
+def test_compiled_lexicon_matches_text(tmp_path: Path) -> None:
+    words = tmp_path / "words.txt"
+    freqs = tmp_path / "freqs.txt"
+    words.write_text("Cone\ncone\nfort\nforty\nform\nworm\nAaron\n" +
+                     "".join(f"word{i}\n" for i in range(40)),
+                     encoding="utf-8")
+    freqs.write_text("fort 300\nworm 12\nzebra 5\n", encoding="utf-8")
+
+    assert not is_compiled_fresh(str(words), str(freqs))
+    out = compile_lexicon(str(words), str(freqs))
+    assert out == compiled_path(str(words))
+    assert is_compiled_fresh(str(words), str(freqs))
+
+    text = Lexicon.from_file(str(words))
+    mapped = MappedLexicon.open(out)
+    assert list(mapped) == list(text)
+    assert list(mapped.lower()) == list(text.lower())
+    assert mapped[3] == text[3]
+    assert "Cone" in mapped and "aaron" not in mapped
+    assert "aaron" in mapped.lower()
+    for prefix in ["", "f", "for", "fort", "word1", "x", "Co"]:
+        assert mapped.has_prefix(prefix) == text.has_prefix(prefix)
+        assert (mapped.words_with_prefix(prefix) ==
+                text.words_with_prefix(prefix))
+    assert mapped.lower().frequency("fort") == 300
+    assert mapped.lower().frequency("zebra") == 0
+
+
+def test_load_lexicon_prefers_fresh_compiled(tmp_path: Path) -> None:
+    words = tmp_path / "words.txt"
+    freqs = tmp_path / "freqs.txt"
+    words.write_text("cone\nfort\n", encoding="utf-8")
+    freqs.write_text("fort 300\n", encoding="utf-8")
+    compile_lexicon(str(words), str(freqs))
+
+    invalidate_lexicon(str(words))
+    assert isinstance(load_lexicon(str(words)), MappedLexicon)
+    freq_chart = load_frequencies(str(freqs), str(words))
+    assert freq_chart["fort"] == 300 and "cone" not in freq_chart
+
+    # editing the word list makes the compiled lexicon stale
+    words.write_text("cone\nfort\nworm\n", encoding="utf-8")
+    assert not is_compiled_fresh(str(words), str(freqs))
+    lex = load_lexicon(str(words))
+    assert isinstance(lex, Lexicon)
+    assert "worm" in lex
+
+
+def test_board_lexicon_filters_words() -> None:
+    letters = [["c", "s", "m", "c", "t"],
+               ["o", "f", "o", "r", "y"],
+               ["n", "e", "o", "w", "t"]]
+    lex = Lexicon(["cone", "fort", "forty", "two", "worm", "zebra",
+                   "tot", "cycle", "mom", "nest"])
+    sub = board_lexicon(lex, letters)
+
+    # tot: t's are never adjacent; mom: only one m on the board
+    # nest: s and t are never adjacent
+    assert list(sub) == ["cone", "fort", "forty", "two", "worm"]
+    assert sub.full_size == 10
+    assert sub.reduction_ratio == pytest.approx(0.5)
+    assert board_lexicon(lex, letters) is sub
+
+
+def test_board_lexicon_scans_mapped_blocks(tmp_path: Path) -> None:
+    letters = [["c", "s", "m", "c", "t"],
+               ["o", "f", "o", "r", "y"],
+               ["n", "e", "o", "w", "t"]]
+    words = tmp_path / "words.txt"
+    words.write_text("a\nc\ncone\nfort\nforty\ntwo\nworm\nzebra\ntot\n"
+                     "cycle\nmom\nnest\n" +
+                     "".join(f"for{i}\n" for i in range(40)),
+                     encoding="utf-8")
+    mapped = MappedLexicon.open(compile_lexicon(str(words)))
+    text = Lexicon.from_file(str(words))
+
+    sub = board_lexicon(mapped, letters)
+    assert list(sub) == list(board_lexicon(text, letters))
+    assert list(sub) == ["c", "cone", "fort", "forty", "two", "worm"]
+    # the mapped words are never decoded as a whole
+    assert mapped._text is None
+
+
+def test_game_board_words() -> None:
+    game = StrandsGame("boards/cs-142.txt")
+    assert "cone" in game.board_words
+    assert "zebra" not in game.board_words
+    assert 0.99 < game.board_words.reduction_ratio < 1
@@ -0,0 +1,72 @@
+import pytest
+
+from base import Step
+from paths import (STEP_DELTAS, DELTA_STEPS, decode_strands,
+                   strands_in_bounds, np)
+from strands import Pos, Strand
+
+
+def test_step_tables_match_pos() -> None:
+    pos = Pos(3, 3)
+    for step in Step:
+        other = pos.take_step(step)
+        assert (other.r - pos.r, other.c - pos.c) == STEP_DELTAS[step]
+        assert pos.step_to(other) == step
+        assert DELTA_STEPS[STEP_DELTAS[step]] == step
+
+    with pytest.raises(ValueError):
+        pos.step_to(pos)
+    with pytest.raises(ValueError):
+        pos.step_to(Pos(5, 3))
+
+
+def _sample_strands() -> list[tuple[int, int, list[Step]]]:
+    steps = list(Step)
+    batch = []
+    for i in range(300):
+        # deterministic mix of lengths, starts and steps
+        walk = [steps[(i * 7 + j * 3) % 8] for j in range(i % 9)]
+        batch.append((i % 6, (i * 5) % 8, walk))
+
+    return batch
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_decode_strands_matches_positions(use_numpy: bool) -> None:
+    if use_numpy and np is None:
+        pytest.skip("NumPy is not installed")
+
+    batch = _sample_strands()
+    rows, cols, offsets = decode_strands(batch, use_numpy=use_numpy)
+    assert len(offsets) == len(batch) + 1
+
+    for i, (r, c, steps) in enumerate(batch):
+        expected = Strand(Pos(r, c), steps).positions()
+        decoded = [Pos(int(rows[j]), int(cols[j]))
+                   for j in range(offsets[i], offsets[i + 1])]
+        assert decoded == expected
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_strands_in_bounds(use_numpy: bool) -> None:
+    if use_numpy and np is None:
+        pytest.skip("NumPy is not installed")
+
+    batch = _sample_strands()
+    decoded = decode_strands(batch, use_numpy=use_numpy)
+    expected = [all(0 <= p.r < 8 and 0 <= p.c < 6
+                    for p in Strand(Pos(r, c), steps).positions())
+                for r, c, steps in batch]
+    assert strands_in_bounds(decoded, 8, 6) == expected
+    assert not all(expected) and any(expected)
+
+
+def test_long_strand_flags() -> None:
+    # the checks follow the path, whatever its bounding box
+    diagonal = Strand(Pos(0, 0), [Step.SE] * 600)
+    assert not diagonal.is_cyclic() and not diagonal.is_folded()
+
+    zigzag = Strand(Pos(0, 0), [Step.SE, Step.NE] * 300 + [Step.W, Step.SE])
+    assert not zigzag.is_cyclic() and zigzag.is_folded()
+    back = Strand(Pos(0, 0), [Step.E] * 600 + [Step.W])
+    assert back.is_cyclic() and not back.is_folded()
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from base import Step
+from boardspec import read_board_spec
+from events import EventLog, EVENT_SUBMIT, EVENT_HINT
+from paths import pack_steps
+from replay import record_random_session, replay, replay_many
+from strands import Pos, Strand, StrandsGame
+
+
+def test_game_records_events() -> None:
+    game = StrandsGame("boards/cs-142.txt", hint_threshold=1)
+    cone = Strand(Pos(0, 0), [Step.S, Step.S, Step.E])
+    off = Strand(Pos(-2, 7), [Step.NW])
+    game.submit_strand(cone)
+    game.use_hint()
+    game.submit_many([off, cone])
+
+    log = game.event_log
+    assert len(log) == 4
+    assert list(log.events()) == [
+        (EVENT_SUBMIT, 0, 0, pack_steps(cone.steps)),
+        (EVENT_HINT, 0, 0, 0),
+        (EVENT_SUBMIT, -2, 7, pack_steps(off.steps)),
+        (EVENT_SUBMIT, 0, 0, pack_steps(cone.steps)),
+    ]
+
+    copy = EventLog.from_bytes(log.to_bytes())
+    assert (copy.digest, copy.hint_threshold) == (game.spec.digest, 1)
+    assert list(copy.events()) == list(log.events())
+    with pytest.raises(ValueError):
+        EventLog.from_bytes(b"STSS" + log.to_bytes()[4:])
+
+
+def test_replay_matches_original(capsys: pytest.CaptureFixture[str]) -> None:
+    rng = random.Random(20)
+    originals = [record_random_session(read_board_spec(path), 1500, rng,
+                                       hint_rate=0.02)
+                 for path in ["boards/cs-142.txt", "boards/fore.txt"]]
+
+    logs = [EventLog.from_bytes(game.event_log.to_bytes())
+            for game in originals]
+    for game, log in zip(originals, logs):
+        replayed = replay(log)
+        assert replayed.to_bytes() == game.to_bytes()
+        assert replayed.found_strands() == game.found_strands()
+        assert list(replayed.event_log.events()) == list(log.events())
+
+    stats = replay_many(logs)
+    assert (stats.games, stats.events) == (2, sum(len(log) for log in logs))
+    assert stats.events_per_second > 0
+
+    # quiet games never announce hints
+    assert capsys.readouterr().out == ""
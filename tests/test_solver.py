@@ -0,0 +1,36 @@
+import importlib
+import sys
+from types import ModuleType
+from typing import Iterator
+
+import pytest
+
+
+@pytest.fixture
+def solverbench(monkeypatch: pytest.MonkeyPatch) -> Iterator[ModuleType]:
+    # the searches never touch spacy, which is only used for theme
+    # scores, so a stand-in module is enough to import the solver
+    spacy = ModuleType("spacy")
+    setattr(spacy, "Language", object)
+    setattr(spacy, "load", lambda name: None)
+    monkeypatch.setitem(sys.modules, "spacy", spacy)
+
+    yield importlib.import_module("solverbench")
+
+    # don't leave a solver bound to the stand-in behind
+    for name in ("solver", "solverbench"):
+        sys.modules.pop(name, None)
+
+
+@pytest.mark.parametrize("board", ["cs-142", "directions", "fore",
+                                   "what-talent", "the-movies"])
+def test_all_words_matches_recursive(solverbench: ModuleType,
+                                     board: str) -> None:
+    solver = solverbench.Solver(f"boards/{board}.txt")
+    words = solver.all_words()
+    expected = solverbench.all_words_recursive(solver)
+
+    # same words, same first paths, found in the same order
+    assert words == expected
+    assert list(words) == list(expected)
+    assert words
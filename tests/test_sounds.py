@@ -0,0 +1,49 @@
+from pathlib import Path
+from typing import Iterator
+
+import pygame
+import pytest
+
+from sounds import NUM_CHANNELS, SoundBank
+
+
+@pytest.fixture(autouse=True)
+def dummy_mixer(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    # no sound card needed
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    yield
+    pygame.mixer.quit()
+
+
+def test_sound_bank_loads_in_background() -> None:
+    bank = SoundBank(background=True)
+    # the last file decoded, so get() has to wait for all of them
+    last = bank.get("scratch_005")
+    assert bank.wait(0)
+    assert len(bank.sounds) == 9
+    assert bank.sounds["scratch_005"] is last
+    assert isinstance(bank.get("click_005"), pygame.mixer.Sound)
+
+
+def test_sound_bank_unknown_name(tmp_path: Path) -> None:
+    bank = SoundBank(background=False)
+    with pytest.raises(KeyError):
+        bank.get("no_such_sound")
+
+    empty = SoundBank(str(tmp_path), background=True)
+    assert empty.wait(5)
+    with pytest.raises(KeyError):
+        empty.get("click_005")
+
+
+def test_sound_bank_play_picks_channel() -> None:
+    bank = SoundBank(background=False)
+    click = bank.get("click_005")
+    bank.play("click_005")
+    channels = [pygame.mixer.Channel(i) for i in range(NUM_CHANNELS)]
+    assert [ch.get_sound() is click for ch in channels].count(True) == 1
+
+    # with every channel busy, play still finds one to cut off
+    for _ in range(NUM_CHANNELS + 2):
+        bank.play("jingles_STEEL02")
+    assert all(ch.get_busy() for ch in channels)
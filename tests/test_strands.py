@@ -1,9 +1,26 @@
 import pytest
 import os
+import random
+import subprocess
+import sys
 
-from strands import Pos, Strand, Board, StrandsGame
+from strands import Pos, Strand, Board, StrandsGame, pack_steps, unpack_steps
 from base import Step, PosBase, StrandBase, BoardBase, StrandsGameBase
 from fakes import StrandFake, BoardFake, StrandsGameFake 
+from audio import AudioSink
+from paths import CODE_STEPS
+
+
+class RecordingSink(AudioSink):
+    """
+    Audio sink that records the names of the sounds played.
+    """
+
+    def __init__(self) -> None:
+        self.played: list[str] = []
+
+    def play(self, name: str) -> None:
+        self.played.append(name)
 
 
 def test_inheritance() -> None:
@@ -140,6 +157,13 @@ TWO 3 5 w w
         assert game.board().num_cols() == 5
         assert len(game.answers()) == 4
 
+def test_load_game_from_readlines() -> None:
+    with open("boards/cs-142.txt", encoding="utf-8") as f:
+        game = StrandsGame(f.readlines())
+    spec = StrandsGame("boards/cs-142.txt").spec
+    assert game.spec[1:] == spec[1:]
+    assert len(game.answers()) == 4
+
 def test_load_game_cs_142_invalid() -> None:
     bad_variants = [
         """"CS 142"
@@ -419,3 +443,319 @@ def test_play_game_directions_hints_1() -> None:
     word, is_theme = game.submit_strand(Strand(Pos(3, 1), [Step.E, Step.NE, Step.S]))  # tire
     assert not is_theme
     assert game.use_hint() != "No hint yet"
+
+def test_dictionary_loads_lazily() -> None:
+    game = StrandsGame("boards/cs-142.txt")
+    timings: list[float] = []
+    game.dictionary_load_hook = timings.append
+
+    # theme words never need the dictionary
+    assert game.submit_strand(Strand(Pos(0, 3), [Step.W, Step.W, Step.W])) == ("cmsc", True)
+    assert game.dictionary_load_time is None
+    assert timings == []
+
+    assert game.submit_strand(Strand(Pos(0, 0), [Step.S, Step.S, Step.E])) == ("cone", False)
+    assert game.dictionary_load_time is not None
+    assert timings == [game.dictionary_load_time]
+
+def test_dictionary_warm_in_background() -> None:
+    game = StrandsGame("boards/directions.txt")
+    timings: list[float] = []
+    game.dictionary_load_hook = timings.append
+
+    thread = game.warm_dictionary()
+    assert thread is not None
+    thread.join()
+    assert len(timings) == 1
+    assert "shed" in game.board_words
+
+    # already loaded, so no second report
+    game.warm_dictionary(background=False)
+    assert len(timings) == 1
+
+def test_found_index_bookkeeping() -> None:
+    game = StrandsGame("boards/cs-142.txt", 0)
+    answers = game.answers()
+    assert game.found_strands() == []
+    assert not game.is_found(0)
+
+    game.submit_strand(Strand(Pos(2, 4), [Step.W, Step.W]))  # two
+    game.submit_strand(Strand(Pos(0, 0), [Step.S, Step.S, Step.E]))  # cone
+    game.submit_strand(Strand(Pos(0, 3), [Step.W, Step.W, Step.W]))  # cmsc
+    assert game.submit_strand(Strand(Pos(2, 4), [Step.W, Step.W])) == "Already found"
+
+    assert game.found_strands() == [answers[3][1], answers[0][1]]
+    assert game.found_mask == 0b1001
+    assert game.use_hint() == (1, False)
+    assert game.active_hint() == (1, False)
+    assert not game.game_over()
+
+def test_overlapping_answer_cells() -> None:
+    game = StrandsGame("boards/cs-142.txt")
+
+    two = Strand(Pos(2, 4), [Step.W, Step.W])
+    owt = Strand(Pos(2, 2), [Step.E, Step.E])
+    assert game.overlapping_answer(two) == 3
+    assert game.overlapping_answer(owt) == 3
+    assert game.board().cell_mask(owt) == game.answer_masks[3]
+
+    # same word as an answer, but through a different t
+    forty_alt = Strand(Pos(1, 1), [Step.E, Step.E, Step.SE, Step.N])
+    assert game.overlapping_answer(forty_alt) is None
+    assert game.overlapping_answer(Strand(Pos(2, 4), [Step.E])) is None
+
+def test_headless_game_skips_pygame() -> None:
+    code = (
+        "import sys\n"
+        "from strands import StrandsGame, Strand, Pos\n"
+        "from base import Step\n"
+        "game = StrandsGame('boards/cs-142.txt')\n"
+        "game.sound_mode = True\n"
+        "game.submit_strand(Strand(Pos(0, 0), [Step.S]))\n"
+        "assert 'pygame' not in sys.modules\n"
+    )
+    env = dict(os.environ, PYTHONPATH="src")
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+def test_game_plays_through_audio_sink() -> None:
+    sink = RecordingSink()
+    game = StrandsGame("boards/cs-142.txt", audio=sink)
+    game.submit_strand(Strand(Pos(0, 0), [Step.S]))
+    assert sink.played == []
+
+    game.sound_mode = True
+    game.submit_strand(Strand(Pos(0, 0), [Step.S]))
+    game.submit_strand(Strand(Pos(0, 3), [Step.W, Step.W, Step.W]))
+    assert sink.played == ["error_008", "confirmation_001"]
+
+def test_pos_hashable_immutable() -> None:
+    assert Pos(1, 2) == Pos(1, 2)
+    assert Pos(0, 0).take_step(Step.SE) == Pos(1, 1)
+    assert {Pos(1, 2), Pos(1, 2), Pos(2, 1)} == {Pos(1, 2), Pos(2, 1)}
+    assert {Pos(3, 4): "x"}[Pos(3, 4)] == "x"
+    with pytest.raises(AttributeError):
+        Pos(1, 2).r = 5
+
+def test_board_cell_table() -> None:
+    game = StrandsGame("boards/cs-142.txt")
+    board = game.board()
+    assert isinstance(board, Board)
+    assert board.pos_at(2, 3) == Pos(2, 3)
+    assert board.pos_at(1, 2) is board.cells[7]
+    assert all(n is board.cells[0] for n in board.find_neighbors(Pos(0, 1))
+               if n == Pos(0, 0))
+    assert board.find_neighbors(Pos(0, 0)) == {Pos(0, 1), Pos(1, 0), Pos(1, 1)}
+    assert len(board.find_neighbors(Pos(1, 2))) == 8
+    with pytest.raises(ValueError):
+        board.pos_at(3, 0)
+
+    # strands built on the board walk its shared positions
+    forty = pack_steps([Step.E, Step.E, Step.NE, Step.S])
+    strand = Strand.from_packed(1, 1, forty, board)
+    assert all(p is board.pos_at(p.r, p.c) for p in strand.positions())
+    assert strand == Strand.from_packed(1, 1, forty)
+    assert all(p is board.pos_at(p.r, p.c)
+               for _, answer in game.answers() for p in answer.positions())
+    off = Strand.from_packed(0, 0, pack_steps([Step.N]), board)
+    assert off.positions() == [Pos(0, 0), Pos(-1, 0)]
+    assert board.shared_positions(0, 0, [Step.N]) is None
+
+def test_strand_packed_hash_and_cache() -> None:
+    steps = [Step.E, Step.E, Step.NE, Step.S]
+    strand = Strand(Pos(1, 1), steps)
+    assert strand.packed_steps() == pack_steps(steps)
+    assert unpack_steps(strand.packed_steps()) == steps
+    assert pack_steps([]) == 1
+
+    same = Strand.from_packed(1, 1, strand.packed_steps())
+    assert same == strand and same.steps == steps
+    assert hash(same) == hash(strand)
+    assert len({strand, same, Strand(Pos(1, 1), steps[:-1])}) == 2
+
+    assert strand.positions() == strand.positions()
+    assert strand.positions() is not strand.positions()
+    assert strand.cell_mask(5) == sum(1 << (p.r * 5 + p.c) for p in strand.positions())
+
+def test_board_flat_cells() -> None:
+    letters = [["c", "s", "m", "c", "t"],
+               ["o", "f", "o", "r", "y"],
+               ["n", "e", "o", "w", "t"]]
+    board = Board(letters)
+    assert board.flat_letters == "csmctoforyneowt"
+    assert board.num_cells() == 15
+    assert board.cell_index(Pos(2, 1)) == 11
+    assert board.evaluate_cells([5, 10, 11]) == "one"
+
+    # the step codes and the positions follow the one index table
+    for i, nbrs in enumerate(board.cell_neighbors):
+        assert {board.cells[j] for j in nbrs} == \
+            board.find_neighbors(board.cells[i])
+        for j, code in zip(nbrs, board.cell_steps[i]):
+            assert board.cells[i].take_step(CODE_STEPS[code]) == \
+                board.cells[j]
+    assert board.cell_neighbors[0] == (1, 5, 6)
+
+    strand = Strand(Pos(0, 3), [Step.S, Step.S, Step.W])
+    assert board.strand_cells(strand) == [3, 8, 13, 12]
+    assert board.evaluate_strand(strand) == "crwo"
+    with pytest.raises(ValueError):
+        board.strand_cells(Strand(Pos(2, 4), [Step.S]))
+    with pytest.raises(ValueError):
+        board.cell_index(Pos(0, 5))
+
+
+def _old_checks(strand: StrandBase) -> tuple[bool, bool]:
+    """
+    Set-based cyclic and folded checks, as originally written.
+    """
+    pos_lst = [(p.r, p.c) for p in strand.positions()]
+    cyclic = len(pos_lst) != len(set(pos_lst))
+    connections = set(zip(pos_lst, pos_lst[1:]))
+    folded = False
+    for st, ed in connections:
+        if st[0] != ed[0] and st[1] != ed[1]:
+            d_1 = (st[0], ed[1])
+            d_2 = (ed[0], st[1])
+            if (d_1, d_2) in connections or (d_2, d_1) in connections:
+                folded = True
+
+    return cyclic, folded
+
+
+def test_bitmask_checks_match_sets() -> None:
+    rng = random.Random(142)
+    board = Board([["a"] * 6 for _ in range(6)])
+    strands = []
+    for _ in range(3000):
+        walk = rng.choices(list(Step), k=rng.randrange(8))
+        strands.append(Strand(Pos(rng.randrange(-1, 6), rng.randrange(6)),
+                              walk))
+
+    for strand in strands:
+        assert (strand.is_cyclic(), strand.is_folded()) == _old_checks(strand)
+
+    on_board = [st for st in strands
+                if all(0 <= p.r < 6 and 0 <= p.c < 6 for p in st.positions())]
+    assert board.valid_strands(on_board) == \
+        [st for st in on_board if _old_checks(st) == (False, False)]
+    assert any(st.is_folded() for st in on_board)
+    assert any(st.is_cyclic() for st in on_board)
+
+
+def _session_state(game: StrandsGame) -> tuple:
+    return (game.hint_thresh, game.shown_hint_msg, game.show_mode,
+            game.hint_state, game.hint_word, game.found_mask,
+            game.found_order, game.tot_game_guesses, game.new_game_guesses,
+            game.found_strands(), game.event_log.hint_threshold,
+            list(game.event_log.events()))
+
+
+def test_snapshot_round_trip() -> None:
+    game = StrandsGame("boards/cs-142.txt", hint_threshold=2)
+    blank = StrandsGame.from_bytes(game.to_bytes())
+    assert _session_state(blank) == _session_state(game)
+
+    assert game.submit_strand(Strand(Pos(2, 4), [Step.W, Step.W])) == ("two", True)
+    assert game.submit_strand(Strand(Pos(0, 0), [Step.S, Step.S, Step.E])) == ("cone", False)
+    assert game.submit_strand(Strand(Pos(1, 1), [Step.E, Step.E, Step.NE])) == ("fort", False)
+    assert game.submit_strand(Strand(Pos(2, 3), [Step.NW, Step.E, Step.NW])) == ("worm", False)
+    assert game.use_hint() == (0, False)
+    data = game.to_bytes()
+    assert len(data) < 64 + len(game.event_log.to_bytes())
+
+    restored = StrandsGame.from_bytes(data)
+    assert _session_state(restored) == _session_state(game)
+    assert restored.found_strands()[0] is restored.answers()[3][1]
+    assert restored.to_bytes() == data
+
+    # the restored session carries on like the original
+    for g in (game, restored):
+        assert g.submit_strand(Strand(Pos(0, 0), [Step.S, Step.S, Step.E])) == "Already found"
+        assert g.submit_strand(Strand(Pos(0, 3), [Step.W, Step.W, Step.W])) == ("cmsc", True)
+        assert g.use_hint() == "No hint yet"
+    assert _session_state(restored) == _session_state(game)
+
+
+def test_snapshot_checks_board_and_version() -> None:
+    game = StrandsGame("boards/cs-142.txt")
+    data = game.to_bytes()
+    with pytest.raises(ValueError):
+        StrandsGame.from_bytes(data, StrandsGame("boards/directions.txt").spec)
+    with pytest.raises(ValueError):
+        StrandsGame.from_bytes(data[:4] + b"\x09" + data[5:])
+    assert StrandsGame.from_bytes(data, game.spec).spec is game.spec
+
+
+def _random_guesses(game: StrandsGame, count: int,
+                    seed: int) -> list[StrandBase]:
+    """
+    Random walks over and off the board, mixed with the answers.
+    """
+    rng = random.Random(seed)
+    board = game.board()
+    guesses: list[StrandBase] = []
+    for _ in range(count):
+        if rng.random() < 0.05:
+            guesses.append(rng.choice(game.answers())[1])
+            continue
+        start = Pos(rng.randrange(-1, board.num_rows()),
+                    rng.randrange(board.num_cols()))
+        guesses.append(Strand(start, rng.choices(list(Step),
+                                                 k=rng.randrange(6))))
+
+    return guesses
+
+
+@pytest.mark.parametrize("count", [300, 3000])
+def test_submit_many_matches_sequential(count: int) -> None:
+    sequential = StrandsGame("boards/cs-142.txt", hint_threshold=2)
+    batched = StrandsGame("boards/cs-142.txt", hint_threshold=2)
+    guesses = _random_guesses(sequential, count, count)
+    # a few fixed dictionary words, twice each
+    words = [Strand(Pos(0, 0), [Step.S, Step.S, Step.E]),
+             Strand(Pos(1, 1), [Step.E, Step.E, Step.NE])]
+    guesses = words + guesses + words
+
+    expected = [sequential.submit_strand(strand) for strand in guesses]
+    assert batched.submit_many(guesses) == expected
+    assert _session_state(batched) == _session_state(sequential)
+    assert {"Not a theme word", "Too short", "Not in word list",
+            "Already found"} <= {r for r in expected if isinstance(r, str)}
+    assert ("cone", False) in expected
+
+
+def test_submit_many_plays_no_sounds() -> None:
+    sink = RecordingSink()
+    game = StrandsGame("boards/cs-142.txt", audio=sink)
+    game.sound_mode = True
+    results = game.submit_many([Strand(Pos(2, 4), [Step.W, Step.W]),
+                                Strand(Pos(2, 4), [Step.W])])
+    assert results == [("two", True), "Too short"]
+    assert sink.played == []
+
+
+def test_guess_cache_counts_and_bounds() -> None:
+    game = StrandsGame("boards/cs-142.txt")
+    cone = Strand(Pos(0, 0), [Step.S, Step.S, Step.E])
+    short = Strand(Pos(0, 0), [Step.S])
+    two = Strand(Pos(2, 4), [Step.W, Step.W])
+
+    assert game.submit_strand(short) == "Too short"
+    assert game.submit_strand(Strand(Pos(0, 0), [Step.S])) == "Too short"
+    assert (game.guess_cache.hits, game.guess_cache.misses) == (1, 1)
+
+    # cached classifications still see the found state
+    assert game.submit_strand(cone) == ("cone", False)
+    assert game.submit_strand(cone) == "Already found"
+    assert game.submit_strand(two) == ("two", True)
+    assert game.submit_strand(two) == "Already found"
+    assert game.submit_strand(Strand(Pos(5, 5), [])) == "Not a theme word"
+    assert game.submit_strand(Strand(Pos(5, 5), [])) == "Not a theme word"
+    assert (game.guess_cache.hits, game.guess_cache.misses) == (4, 4)
+
+    game.guess_cache.maxsize = 2
+    for guess in _random_guesses(game, 200, 7):
+        game.submit_strand(guess)
+    assert len(game.guess_cache) <= 2
+    game.guess_cache.clear()
+    assert len(game.guess_cache) == game.guess_cache.hits == 0
@@ -0,0 +1,76 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from base import Step
+from dictwords import current_word_index
+from paths import pack_steps
+from strands import Strand, StrandsGame
+from wordindex import WordIndex, load_word_index
+
+
+def test_word_index_paths() -> None:
+    game = StrandsGame("boards/cs-142.txt")
+    index = game.word_index()
+    assert index.digest == game.spec.digest
+    assert set(index) == game.dictionary_words()
+    assert list(index) == sorted(index)
+
+    forty = pack_steps([Step.E, Step.E, Step.NE, Step.S])
+    assert (1, 1, forty) in index.where("forty")
+    assert len(index.where("forty")) == 4
+    assert index.where("zebra") == ()
+
+    # every path spells its word without revisiting a cell
+    board = game.game_board
+    for word, paths in index.items():
+        assert len(set(paths)) == len(paths)
+        for r, c, packed in paths:
+            strand = Strand.from_packed(r, c, packed)
+            assert board.evaluate_strand(strand) == word
+            assert not strand.is_cyclic()
+
+
+def test_word_index_round_trip(tmp_path: Path) -> None:
+    index = StrandsGame("boards/fore.txt").word_index()
+    path = str(tmp_path / "fore-words.idx")
+    index.write(path)
+    copy = load_word_index(path)
+    assert copy.digest == index.digest
+    assert dict(copy) == dict(index)
+    assert copy.num_paths() == index.num_paths() >= len(index)
+
+    with pytest.raises(ValueError):
+        WordIndex.from_bytes(b"STEV" + index.to_bytes()[4:])
+
+
+def test_dict_enhancement_writes_index(tmp_path: Path) -> None:
+    game = StrandsGame("boards/cs-142.txt")
+    outfile = str(tmp_path / "cs-142-with-words.txt")
+    index_file = str(tmp_path / "cs-142-words.idx")
+    count = game.dict_enhancement(outfile, index_file)
+
+    index = load_word_index(index_file)
+    assert count == len(index)
+    with open(outfile, encoding="utf-8") as f:
+        words = f.read().split("Relevant Dictionary Words:\n")[1]
+    assert words.split() == list(index)
+
+
+def test_current_word_index_rebuilds_stale(tmp_path: Path) -> None:
+    game_file = tmp_path / "cs-142.txt"
+    shutil.copy("boards/cs-142.txt", game_file)
+    out_dir = str(tmp_path)
+    index = current_word_index(str(game_file), out_dir)
+    assert index.where("forty")
+    index_file = tmp_path / "cs-142-words.idx"
+    stamp = index_file.stat().st_mtime_ns
+    assert current_word_index(str(game_file), out_dir) == index
+    assert index_file.stat().st_mtime_ns == stamp
+
+    # after an edit, the saved index no longer matches the board
+    game_file.write_text(game_file.read_text().replace("CS 142", "CS 143"))
+    fresh = current_word_index(str(game_file), out_dir)
+    assert fresh.digest != index.digest
+    assert load_word_index(str(index_file)).digest == fresh.digest